@@ -28,7 +28,7 @@ class ProsumerDataLoader:
         Load electricity demand profiles for prosumer buildings.
         
         Args:
-            file_path: Path to load profiles CSV file
+            file_path: Path to load profiles CSV or Parquet file
             num_buildings: Number of buildings
             time_horizon: Number of time steps
             
@@ -36,8 +36,8 @@ class ProsumerDataLoader:
             Load profiles array [buildings x time_steps] in kWh
         """
         if file_path and Path(file_path).exists():
-            df = pd.read_csv(file_path)
-            return df.values[:num_buildings, :time_horizon]
+            df = self._read_profile_table(file_path)
+            return self._fit_profiles(df.to_numpy(), num_buildings, time_horizon)
         else:
             # Generate synthetic load profiles if no file provided
             return self._generate_synthetic_load_profiles(num_buildings, time_horizon)
@@ -50,7 +50,7 @@ class ProsumerDataLoader:
         Load PV generation profiles for prosumer buildings.
         
         Args:
-            file_path: Path to PV profiles CSV file
+            file_path: Path to PV profiles CSV or Parquet file
             num_buildings: Number of buildings
             time_horizon: Number of time steps
             
@@ -58,12 +58,61 @@ class ProsumerDataLoader:
             PV generation profiles array [buildings x time_steps] in kWh
         """
         if file_path and Path(file_path).exists():
-            df = pd.read_csv(file_path)
-            return df.values[:num_buildings, :time_horizon]
+            df = self._read_profile_table(file_path)
+            return self._fit_profiles(df.to_numpy(), num_buildings, time_horizon)
         else:
             # Generate synthetic PV profiles if no file provided
             return self._generate_synthetic_pv_profiles(num_buildings, time_horizon)
     
+    @staticmethod
+    def _read_profile_table(file_path: str) -> pd.DataFrame:
+        """
+        Read a profile table, picking the reader from the file extension.
+        
+        Args:
+            file_path: Path to a CSV or Parquet file
+            
+        Returns:
+            Profile table as a DataFrame
+        """
+        if Path(file_path).suffix == '.parquet':
+            return pd.read_parquet(file_path)
+        return pd.read_csv(file_path)
+    
+    @staticmethod
+    def _fit_profiles(values: np.ndarray, 
+                      num_buildings: int, 
+                      time_horizon: int) -> np.ndarray:
+        """
+        Fit a profile array to the simulation size.
+        
+        Finer-resolution data whose step count is a whole multiple of the
+        horizon is block-averaged in one reshape (e.g. 1-min -> 15-min).
+        Coarser data is linearly interpolated onto the horizon (e.g.
+        hourly -> 15-min) for all buildings at once; anything else is
+        truncated to the first time_horizon steps.
+        
+        Args:
+            values: Profile array [buildings x time_steps]
+            num_buildings: Number of buildings
+            time_horizon: Number of time steps
+            
+        Returns:
+            Profile array [num_buildings x time_horizon]
+        """
+        values = np.asarray(values, dtype=float)[:num_buildings]
+        steps = values.shape[1]
+        if steps > time_horizon and steps % time_horizon == 0:
+            factor = steps // time_horizon
+            return values.reshape(values.shape[0], time_horizon, factor).mean(axis=2)
+        if 1 < steps < time_horizon:
+            # Position of each target step on the source grid, spanning the same period
+            position = np.linspace(0, steps - 1, time_horizon)
+            lower = np.minimum(position.astype(int), steps - 2)
+            weight = position - lower
+            return values[:, lower] * (1 - weight) + values[:, lower + 1] * weight
+        return values[:, :time_horizon]
+    
     def load_battery_specifications(self, 
                                   file_path: Optional[str] = None,
                                   num_buildings: int = 10) -> Dict:
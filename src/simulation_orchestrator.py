@@ -1,7 +1,12 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Callable, Dict, List, Tuple, Optional, Any
+import os
+import copy
 import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 import json
 
@@ -13,16 +18,53 @@ from .models.surrogate_model import TariffSurrogateModel
 from .analysis.fairness_analyzer import FairnessAnalyzer
 
 
+# Scenario pool workers each hold one orchestrator built from the parent's inputs
+_worker_orchestrator = None
+
+# Spawned workers re-import the solver stack and unpickle the profiles, so the pool
+# is kept small by default and only used for runs with enough scenarios to repay it
+DEFAULT_MAX_WORKERS = 4
+MIN_POOL_JOBS = 8
+
+
+def _read_only(value):
+    """View of a cached input that callers cannot modify in place"""
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, dict):
+        return {key: _read_only(item) for key, item in value.items()}
+    # Inputs read from JSON files hold plain lists
+    return copy.deepcopy(value)
+
+
+def _init_scenario_worker(state):
+    global _worker_orchestrator
+    num_buildings, time_horizon, *inputs = state
+    _worker_orchestrator = SimulationOrchestrator(num_buildings, time_horizon)
+    (_worker_orchestrator.load_profiles, _worker_orchestrator.pv_profiles,
+     _worker_orchestrator.battery_specs, _worker_orchestrator.load_flexibility) = inputs
+    _worker_orchestrator.is_initialized = True
+
+
+def _run_scenario_job(job):
+    return _worker_orchestrator.run_single_scenario(*job)
+
+
 class SimulationOrchestrator:
     
     def __init__(self, 
                  num_buildings: int = 10,
                  time_horizon: int = 96,
-                 data_dir: str = "data"):
+                 data_dir: str = "data",
+                 max_workers: Optional[int] = None):
         
         self.num_buildings = num_buildings
         self.time_horizon = time_horizon
         self.data_dir = Path(data_dir)
+        # Scenario fan-out width; None uses up to DEFAULT_MAX_WORKERS cores, 1 runs in-process
+        self.max_workers = max_workers
         
         self.data_loader = ProsumerDataLoader(str(self.data_dir / "input"))
         self.tariff_manager = TariffManager()
@@ -34,26 +76,69 @@ class SimulationOrchestrator:
         self.results = {}
         self.is_initialized = False
         
-    def initialize(self):
+        # Inputs and size-dependent components are only rebuilt when
+        # (num_buildings, time_horizon) changes; tariffs are always refreshed
+        self._input_cache = {}
+        self._components_key = (num_buildings, time_horizon)
+        self._scenario_rng_state = None
+        
+    def _load_inputs(self) -> Tuple:
+        """
+        Load (or reuse) the inputs for the current size.
+        
+        Returns:
+            (load_profiles, pv_profiles, battery_specs, load_flexibility, rng_state).
+            The inputs are read-only views of the cached values; rng_state is the
+            numpy RNG state the synthetic generators left behind, which seeds
+            scenario sampling so cached and fresh loads sample alike.
+        """
+        key = (self.num_buildings, self.time_horizon)
+        if key not in self._input_cache:
+            load_profiles = self.data_loader.load_load_profiles(
+                num_buildings=self.num_buildings,
+                time_horizon=self.time_horizon
+            )
+            
+            pv_profiles = self.data_loader.load_pv_profiles(
+                num_buildings=self.num_buildings,
+                time_horizon=self.time_horizon
+            )
+            
+            battery_specs = self.data_loader.load_battery_specifications(
+                num_buildings=self.num_buildings
+            )
+            
+            load_flexibility = self.data_loader.load_load_flexibility(
+                num_buildings=self.num_buildings,
+                time_horizon=self.time_horizon
+            )
+            
+            if len(self._input_cache) >= 8:
+                self._input_cache.pop(next(iter(self._input_cache)))
+            self._input_cache[key] = (load_profiles, pv_profiles, battery_specs,
+                                      load_flexibility, np.random.get_state())
         
-        self.load_profiles = self.data_loader.load_load_profiles(
-            num_buildings=self.num_buildings,
-            time_horizon=self.time_horizon
-        )
+        *inputs, rng_state = self._input_cache[key]
+        return tuple(_read_only(value) for value in inputs) + (rng_state,)
+    
+    def _rebuild_components(self):
         
-        self.pv_profiles = self.data_loader.load_pv_profiles(
-            num_buildings=self.num_buildings,
-            time_horizon=self.time_horizon
-        )
+        key = (self.num_buildings, self.time_horizon)
+        if key == self._components_key:
+            return
         
-        self.battery_specs = self.data_loader.load_battery_specifications(
-            num_buildings=self.num_buildings
-        )
+        self.optimizer = ProsumerCommunityOptimizer(self.num_buildings, self.time_horizon)
+        self.p2p_trading = P2PTradingMechanism(self.num_buildings)
+        self.surrogate_model = TariffSurrogateModel(self.time_horizon, self.num_buildings)
+        self.fairness_analyzer = FairnessAnalyzer(self.num_buildings)
+        self._components_key = key
         
-        self.load_flexibility = self.data_loader.load_load_flexibility(
-            num_buildings=self.num_buildings,
-            time_horizon=self.time_horizon
-        )
+    def initialize(self):
+        
+        (self.load_profiles, self.pv_profiles, self.battery_specs,
+         self.load_flexibility, self._scenario_rng_state) = self._load_inputs()
+        
+        self._rebuild_components()
         
         self.tariff_manager.create_default_tariffs()
         
@@ -155,42 +240,79 @@ class SimulationOrchestrator:
         
         return metrics
     
+    def _run_scenario_jobs(self,
+                           jobs: List[Tuple],
+                           progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        
+        # Each job is run_single_scenario's positional arguments, ending with the scenario name
+        results = {}
+        workers = min(self.max_workers or DEFAULT_MAX_WORKERS, os.cpu_count() or 1, len(jobs))
+        if workers > 1 and len(jobs) >= MIN_POOL_JOBS:
+            state = (self.num_buildings, self.time_horizon, self.load_profiles,
+                     self.pv_profiles, self.battery_specs, self.load_flexibility)
+            futures = {}
+            try:
+                # Spawned, not forked: the caller may be a threaded web server, and a
+                # fork would copy locks other threads hold into the workers
+                with ProcessPoolExecutor(max_workers=workers,
+                                         mp_context=multiprocessing.get_context("spawn"),
+                                         initializer=_init_scenario_worker,
+                                         initargs=(state,)) as executor:
+                    futures = {executor.submit(_run_scenario_job, job): job[-1] for job in jobs}
+                    for future in as_completed(futures):
+                        results[futures[future]] = future.result()
+                        if progress_callback:
+                            progress_callback(len(results), len(jobs))
+            except (OSError, BrokenProcessPool):
+                # Process pools can be unavailable (sandboxes, frozen apps) or break
+                # mid-run; keep every job that finished and run the rest in-process
+                for future, name in futures.items():
+                    if name not in results and future.done() and not future.cancelled() \
+                            and future.exception() is None:
+                        results[name] = future.result()
+        
+        for job in jobs:
+            if job[-1] not in results:
+                results[job[-1]] = self.run_single_scenario(*job)
+                if progress_callback:
+                    progress_callback(len(results), len(jobs))
+        # Same ordering as the serial loop
+        return {job[-1]: results[job[-1]] for job in jobs}
+    
     def benchmark_tariff_scenarios(self, 
                                  num_scenarios: int = 20,
-                                 include_p2p_comparison: bool = True) -> Dict[str, Any]:
+                                 include_p2p_comparison: bool = True,
+                                 progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
         
         if not self.is_initialized:
             self.initialize()
         
-        scenario_results = {}
-        
+        # Scenario sampling draws from its own generator, so the global RNG is untouched
+        rng = np.random.RandomState()
+        if self._scenario_rng_state is not None:
+            rng.set_state(self._scenario_rng_state)
         tariff_scenarios = self.tariff_manager.create_tariff_scenarios(
             time_horizon=self.time_horizon,
-            num_scenarios=num_scenarios
+            num_scenarios=num_scenarios,
+            rng=rng
         )
         
+        jobs = []
         for scenario_name, import_prices in tariff_scenarios.items():
             export_prices = self.tariff_manager.get_export_prices(import_prices)
             community_prices = self.tariff_manager.get_community_prices(import_prices, export_prices)
             
             if include_p2p_comparison:
-                with_p2p = self.run_single_scenario(
-                    import_prices, export_prices, community_prices,
-                    with_p2p=True, scenario_name=f"{scenario_name}_with_p2p"
-                )
-                scenario_results[f"{scenario_name}_with_p2p"] = with_p2p
-                
-                without_p2p = self.run_single_scenario(
-                    import_prices, export_prices, export_prices,
-                    with_p2p=False, scenario_name=f"{scenario_name}_without_p2p"
-                )
-                scenario_results[f"{scenario_name}_without_p2p"] = without_p2p
+                jobs.append((import_prices, export_prices, community_prices,
+                             True, f"{scenario_name}_with_p2p"))
+                jobs.append((import_prices, export_prices, export_prices,
+                             False, f"{scenario_name}_without_p2p"))
             else:
-                result = self.run_single_scenario(
-                    import_prices, export_prices, community_prices,
-                    with_p2p=True, scenario_name=scenario_name
-                )
-                scenario_results[scenario_name] = result
+                jobs.append((import_prices, export_prices, community_prices,
+                             True, scenario_name))
+        
+        # Scenarios are independent solves, so they fan out across processes
+        scenario_results = self._run_scenario_jobs(jobs, progress_callback)
         
         successful_results = {k: v for k, v in scenario_results.items() if v['status'] == 'success'}
         
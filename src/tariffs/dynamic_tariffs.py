@@ -62,18 +62,16 @@ class TimeOfUseTariff(BaseTariff):
         """Get ToU prices for time horizon."""
         # Assume 15-minute intervals (96 per day)
         intervals_per_hour = 4
-        prices = np.zeros(time_horizon)
         
-        for t in range(time_horizon):
-            # Calculate hour of day (0-23)
-            hour = (t // intervals_per_hour) % 24
-            
-            if hour in self.off_peak_hours:
-                prices[t] = self.off_peak_price
-            elif hour in self.mid_peak_hours:
-                prices[t] = self.mid_peak_price
-            else:  # on_peak_hours
-                prices[t] = self.on_peak_price
+        # Hour of day (0-23) for every time step
+        hour = (np.arange(time_horizon) // intervals_per_hour) % 24
+        
+        # Off-peak takes precedence over mid-peak; all other hours are on-peak
+        prices = np.select(
+            [np.isin(hour, self.off_peak_hours), np.isin(hour, self.mid_peak_hours)],
+            [self.off_peak_price, self.mid_peak_price],
+            default=self.on_peak_price
+        ).astype(float)
         
         return prices
 
@@ -116,14 +114,14 @@ class CriticalPeakPricingTariff(BaseTariff):
         hours_per_day = 24
         intervals_per_day = intervals_per_hour * hours_per_day
         
-        for t in range(time_horizon):
-            # Calculate day of week and hour
-            day = (start_day + (t // intervals_per_day)) % 7
-            hour = (t // intervals_per_hour) % hours_per_day
-            
-            # Apply critical pricing if it's an event day and critical hour
-            if day in self.event_days and hour in self.critical_hours:
-                prices[t] = self.critical_price
+        # Day of week and hour for every time step
+        steps = np.arange(time_horizon)
+        day = (start_day + steps // intervals_per_day) % 7
+        hour = (steps // intervals_per_hour) % hours_per_day
+        
+        # Apply critical pricing on event days during critical hours
+        critical_mask = np.isin(day, self.event_days) & np.isin(hour, self.critical_hours)
+        prices[critical_mask] = self.critical_price
         
         return prices
 
@@ -283,18 +281,22 @@ class TariffManager:
     
     def create_tariff_scenarios(self, 
                                time_horizon: int = 96,
-                               num_scenarios: int = 10) -> Dict:
+                               num_scenarios: int = 10,
+                               rng: Optional[np.random.RandomState] = None) -> Dict:
         """
         Create multiple tariff scenarios for benchmarking.
         
         Args:
             time_horizon: Number of time steps
             num_scenarios: Number of scenarios to generate
+            rng: Random generator for the variations (defaults to numpy's global one)
             
         Returns:
             Dictionary mapping scenario names to price arrays
         """
         scenarios = {}
+        if rng is None:
+            rng = np.random
         
         # Ensure default tariffs exist
         if not self.tariffs:
@@ -309,11 +311,11 @@ class TariffManager:
             scenario_name = f"variation_{i+1}"
             
             # Randomly select base tariff and modify
-            base_tariff = np.random.choice(list(self.tariffs.keys()))
+            base_tariff = rng.choice(list(self.tariffs.keys()))
             base_prices = self.tariffs[base_tariff].get_prices(time_horizon, seed=i)
             
             # Apply random scaling
-            scale_factor = 0.8 + 0.4 * np.random.rand()  # 0.8 to 1.2
+            scale_factor = 0.8 + 0.4 * rng.rand()  # 0.8 to 1.2
             scenarios[scenario_name] = base_prices * scale_factor
         
         return scenarios
@@ -0,0 +1,274 @@
+// Clientside callbacks for the single page app (served from assets/ by Dash).
+// Card selection only toggles classNames and progress arrives as Server-Sent
+// Events, so both run in the browser without a callback round-trip.
+
+const COUNTRY_CARD_CLASS = "country-card w-100 p-2";
+const TARIFF_CARD_CLASS = "tariff-card h-100 w-100 p-3";
+const OPTION_CARD_CLASS = "option-card h-100 w-100 p-3";
+
+const DEFAULT_COUNTRY = "italy";
+const DEFAULT_TARIFF = "tou";
+const DEFAULT_OPTIONS = ["p2p"];
+
+// Cards use pattern-matching ids ({type, id}); the ALL input lists every card
+// in layout order, which is also the order of the ALL className output
+function triggeredCardId() {
+    const triggered = window.dash_clientside.callback_context.triggered;
+    if (!triggered || !triggered.length) {
+        return null;
+    }
+    const propId = triggered[0].prop_id;
+    try {
+        return JSON.parse(propId.slice(0, propId.lastIndexOf("."))).id;
+    } catch (e) {
+        return null;
+    }
+}
+
+function cardIds() {
+    return window.dash_clientside.callback_context.inputs_list[0].map(input => input.id.id);
+}
+
+function selectedClass(baseClass, isSelected) {
+    return isSelected ? baseClass + " selected" : baseClass;
+}
+
+const TARIFF_NAMES = {
+    tou: "Time-of-Use",
+    cpp: "Critical Peak Pricing",
+    rtp: "Real-Time Pricing",
+    edr: "Emergency Demand Response"
+};
+const COUNTRY_NAMES = {
+    italy: "🇮🇹 Italy",
+    germany: "🇩🇪 Germany",
+    spain: "🇪🇸 Spain",
+    sweden: "🇸🇪 Sweden",
+    france: "🇫🇷 France",
+    custom: "🔧 Custom"
+};
+
+// Status badge colour per run state (see statusState)
+const STATUS_COLORS = {
+    running: "primary",
+    done: "success",
+    error: "danger",
+    idle: "secondary"
+};
+
+function statusState(status) {
+    if (status.running) {
+        return "running";
+    }
+    if (status.progress === 100) {
+        return "done";
+    }
+    return status.message.includes("Error") ? "error" : "idle";
+}
+
+// Uploads are sniffed from their first 8 KiB before being sent to the server
+const UPLOAD_SNIFF_BYTES = 8192;
+
+function uploadError(contents, filename) {
+    const name = (filename || "").toLowerCase();
+    const extension = name.slice(name.lastIndexOf("."));
+    // base64 packs 3 bytes into 4 characters
+    const start = contents.indexOf(",") + 1;
+    let head;
+    try {
+        head = atob(contents.slice(start, start + Math.ceil(UPLOAD_SNIFF_BYTES / 3) * 4));
+    } catch (e) {
+        return "Could not read " + filename;
+    }
+
+    if (extension === ".csv") {
+        const lines = head.split(/\r?\n/).filter(line => line.trim().length);
+        if (lines.length < 2) {
+            return filename + " has no data rows";
+        }
+        // Quoted fields may contain commas, so only compare simple rows
+        if (!lines[0].includes('"') && !lines[1].includes('"') &&
+                lines[0].split(",").length !== lines[1].split(",").length) {
+            return filename + ": header and first row have different column counts";
+        }
+    } else if (extension === ".json") {
+        const first = head.trimStart().charAt(0);
+        if (first !== "[" && first !== "{") {
+            return filename + " is not a JSON array or object";
+        }
+    } else if (extension === ".xlsx") {
+        if (!head.startsWith("PK")) {
+            return filename + " is not a valid .xlsx workbook";
+        }
+    } else if (extension === ".xls") {
+        if (!head.startsWith("\xD0\xCF\x11\xE0")) {
+            return filename + " is not a valid .xls workbook";
+        }
+    } else {
+        return "Unsupported file type: " + filename;
+    }
+    return null;
+}
+
+function uploadErrorAlert(message) {
+    return {
+        namespace: "dash_html_components",
+        type: "Div",
+        props: {
+            className: "alert alert-danger small mb-0",
+            children: [
+                {namespace: "dash_html_components", type: "I", props: {className: "fas fa-times-circle me-2"}},
+                message
+            ]
+        }
+    };
+}
+
+// Results filter changes are forwarded only after the dropdown settles, and
+// only when they differ from the last forwarded value (the Store's default)
+const FILTER_DEBOUNCE_MS = 200;
+let filterToken = 0;
+let forwardedFilter = "all";
+
+// A stream EventSource has given up on is reopened after this delay
+const PROGRESS_RETRY_MS = 2000;
+let progressSource = null;
+let progressWanted = false;
+
+function openProgressStream() {
+    progressSource = new EventSource("/progress/stream");
+    progressSource.onmessage = event => {
+        const status = JSON.parse(event.data);
+        window.dash_clientside.set_props("simulation-status", {data: status});
+        if (!status.running) {
+            closeProgressStream();
+        }
+    };
+    progressSource.onerror = () => {
+        // EventSource retries a dropped connection on its own; once it has given
+        // up (CLOSED), a fresh stream is opened, whose first event is the current
+        // status, so a run that ended meanwhile is still reported
+        if (progressSource && progressSource.readyState === EventSource.CLOSED) {
+            progressSource = null;
+            setTimeout(() => {
+                if (progressWanted && !progressSource) {
+                    openProgressStream();
+                }
+            }, PROGRESS_RETRY_MS);
+        }
+    };
+}
+
+function closeProgressStream() {
+    progressWanted = false;
+    if (progressSource) {
+        progressSource.close();
+        progressSource = null;
+    }
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    clientside: {
+        select_country: function() {
+            const ids = cardIds();
+            const clicked = triggeredCardId();
+            const selected = ids.includes(clicked) ? clicked : DEFAULT_COUNTRY;
+            return [selected, ids.map(c => selectedClass(COUNTRY_CARD_CLASS, c === selected))];
+        },
+
+        select_tariff: function() {
+            const ids = cardIds();
+            const clicked = triggeredCardId();
+            const selected = ids.includes(clicked) ? clicked : DEFAULT_TARIFF;
+            return [selected, ids.map(t => selectedClass(TARIFF_CARD_CLASS, t === selected))];
+        },
+
+        toggle_options: function(nClicks, currentOptions) {
+            const ids = cardIds();
+            const clicked = triggeredCardId();
+            let selected = currentOptions ? currentOptions.slice() : [];
+            if (!clicked) {
+                selected = DEFAULT_OPTIONS.slice();
+            } else {
+                const index = selected.indexOf(clicked);
+                if (index >= 0) {
+                    selected.splice(index, 1);
+                } else if (ids.includes(clicked)) {
+                    selected.push(clicked);
+                }
+            }
+            return [selected, ids.map(o => selectedClass(OPTION_CARD_CLASS, selected.includes(o)))];
+        },
+
+        update_country_pricing: function(country, presets) {
+            // Each preset is the full output list: info card, four prices, four disabled flags
+            return presets[country] || presets[DEFAULT_COUNTRY];
+        },
+
+        update_tariff_info: function(tariffType, country, offPeak, onPeak) {
+            if (!tariffType) {
+                return "No tariff selected";
+            }
+            const tariffName = TARIFF_NAMES[tariffType] || tariffType;
+            const countryName = COUNTRY_NAMES[country] || country;
+            const priceInfo = (offPeak && onPeak)
+                ? ` | ${offPeak.toFixed(3)}-${onPeak.toFixed(3)} €/kWh`
+                : "";
+            return `${tariffName} - ${countryName}${priceInfo}`;
+        },
+
+        update_status_display: function(status) {
+            const no_update = window.dash_clientside.no_update;
+            if (!status) {
+                return [no_update, no_update, no_update, no_update, no_update, no_update];
+            }
+            const text = status.running ? `${status.message} (${status.progress}%)` : status.message;
+            const color = STATUS_COLORS[statusState(status)];
+            // A fresh token asks the server to publish the results once the run has stopped
+            const finished = status.running ? no_update : Date.now();
+            return [text, color, status.progress, status.running, !status.running, finished];
+        },
+
+        toggle_collapse: function(nClicks, isOpen) {
+            return nClicks ? !isOpen : window.dash_clientside.no_update;
+        },
+
+        validate_upload: function(contents, filename) {
+            const no_update = window.dash_clientside.no_update;
+            if (!contents) {
+                return [no_update, no_update];
+            }
+            const error = uploadError(contents, filename);
+            if (error) {
+                return [no_update, uploadErrorAlert(error)];
+            }
+            // A fresh token re-triggers the server callback even for the same file
+            return [Date.now(), no_update];
+        },
+
+        debounce_filter: function(value) {
+            const token = ++filterToken;
+            return new Promise(resolve => setTimeout(() => {
+                // A newer selection supersedes this one, and settling back on the
+                // forwarded value would only rebuild the same table
+                if (token !== filterToken || value === forwardedFilter) {
+                    resolve(window.dash_clientside.no_update);
+                    return;
+                }
+                forwardedFilter = value;
+                resolve(value);
+            }, FILTER_DEBOUNCE_MS));
+        },
+
+        stream_progress: function(active) {
+            // The server only sends an event when the status changes
+            if (active && !progressSource) {
+                progressWanted = true;
+                openProgressStream();
+            } else if (!active) {
+                closeProgressStream();
+            }
+            return window.dash_clientside.no_update;
+        }
+    }
+});
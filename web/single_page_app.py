@@ -3,233 +3,211 @@ import sys
 import json
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, wraps
 from pathlib import Path
+from types import MappingProxyType
 import base64
+import hashlib
 import io
+import logging
+import pickle
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 import dash
-from dash import dcc, html, Input, Output, State, callback_context, dash_table
+from dash import dcc, html, Input, Output, State, ALL, MATCH, ClientsideFunction, callback_context, dash_table
 import dash_bootstrap_components as dbc
-import plotly.express as px
+import flask
 import plotly.graph_objects as go
-import pandas as pd
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
+from flask.json.provider import DefaultJSONProvider
 import numpy as np
+import orjson
 import uuid
 
-from src.simulation_orchestrator import SimulationOrchestrator
-
-
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP, dbc.icons.FONT_AWESOME])
-
-# Add custom CSS for tariff cards
-app.index_string = '''
-<!DOCTYPE html>
-<html>
-    <head>
-        {%metas%}
-        <title>{%title%}</title>
-        {%favicon%}
-        {%css%}
-        <style>
-            .tariff-card {
-                transition: all 0.3s ease;
-                border: 2px solid transparent;
-                cursor: pointer;
-            }
-            .tariff-card:hover {
-                transform: translateY(-5px);
-                box-shadow: 0 8px 25px rgba(0,0,0,0.15);
-                border-color: #007bff;
-            }
-            .tariff-card.selected {
-                border-color: #28a745;
-                background-color: #f8fff8;
-                box-shadow: 0 5px 15px rgba(40, 167, 69, 0.3);
-            }
-            .tariff-card.selected .card-body {
-                background-color: transparent;
-            }
-            .option-card {
-                transition: all 0.3s ease;
-                border: 2px solid transparent;
-                cursor: pointer;
-            }
-            .option-card:hover {
-                transform: translateY(-3px);
-                box-shadow: 0 6px 20px rgba(0,0,0,0.1);
-                border-color: #007bff;
-            }
-            .option-card.selected {
-                border-color: #28a745;
-                background-color: #f8fff8 !important;
-                box-shadow: 0 4px 12px rgba(40, 167, 69, 0.2);
-            }
-            .country-card {
-                transition: all 0.3s ease;
-                border: 2px solid transparent;
-                cursor: pointer;
-            }
-            .country-card:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-                border-color: #007bff;
-            }
-            .country-card.selected {
-                border-color: #007bff;
-                background-color: #f0f8ff !important;
-                box-shadow: 0 3px 10px rgba(0, 123, 255, 0.2);
-            }
-            .analytics-tabs .nav-tabs {
-                border: none;
-                background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
-                padding: 0.75rem;
-                border-radius: 0.5rem;
-                margin-bottom: 1.5rem;
-            }
-            .analytics-tabs .nav-link {
-                border: none;
-                border-radius: 0.375rem;
-                margin: 0 0.25rem;
-                padding: 0.75rem 1.25rem;
-                transition: all 0.3s ease;
-                background: transparent;
-                position: relative;
-                overflow: hidden;
-            }
-            .analytics-tabs .nav-link:hover {
-                background: rgba(255, 255, 255, 0.7);
-                transform: translateY(-1px);
-                box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-            }
-            .analytics-tabs .nav-link.active {
-                background: white;
-                color: inherit !important;
-            }
-            
-            /* Enhanced upload area styles */
-            .upload-area:hover .border-2 {
-                border-color: #0056b3 !important;
-                background-color: #e6f3ff !important;
-                transform: translateY(-2px);
-                box-shadow: 0 6px 20px rgba(0,123,255,0.15);
-            }
-            
-            .upload-area:hover .fa-cloud-upload-alt {
-                color: #0056b3 !important;
-                transform: scale(1.1);
-            }
-            
-            .upload-area:hover .text-primary {
-                color: #0056b3 !important;
-            }
-            
-            .upload-success {
-                border-color: #28a745 !important;
-                background-color: #f0f8f0 !important;
-            }
-            
-            .upload-error {
-                border-color: #dc3545 !important;
-                background-color: #fff5f5 !important;
-            }
-            
-            .file-item {
-                transition: all 0.3s ease;
-                border-radius: 8px;
-                padding: 12px;
-                margin-bottom: 8px;
-                background: #f8f9fa;
-                border-left: 4px solid #007bff;
-            }
-            
-            .file-item:hover {
-                background: #e9ecef;
-                transform: translateX(4px);
-            }
-            
-            .file-success {
-                border-left-color: #28a745;
-                background: #f0f8f0;
-            }
-            
-            .file-error {
-                border-left-color: #dc3545;
-                background: #fff5f5;
-            }
-            
-            .progress-bar {
-                transition: width 0.3s ease;
-                height: 4px;
-                border-radius: 2px;
-            }
-                box-shadow: 0 4px 12px rgba(0, 0, 0, 0.15);
-                transform: translateY(-2px);
-            }
-            .analytics-content {
-                min-height: 400px;
-                background: #fefefe;
-                border-radius: 0.5rem;
-                padding: 1.5rem;
-                box-shadow: inset 0 1px 3px rgba(0, 0, 0, 0.05);
-            }
-        </style>
-        <script>
-            document.addEventListener('DOMContentLoaded', function() {
-                // Ensure card clicks are properly handled
-                window.dash_clientside = Object.assign({}, window.dash_clientside, {
-                    clientside: {
-                        handle_card_clicks: function() {
-                            // This is handled by the Python callback
-                            return window.dash_clientside.no_update;
-                        }
-                    }
-                });
-            });
-        </script>
-    </head>
-    <body>
-        {%app_entry%}
-        <footer>
-            {%config%}
-            {%scripts%}
-            {%renderer%}
-        </footer>
-    </body>
-</html>
-'''
-
-orchestrator = SimulationOrchestrator()
+try:
+    import pyarrow  # noqa: F401 - enables Parquet output for uploaded profiles
+    import pyarrow.csv as pa_csv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    from flask_compress import Compress
+    HAS_COMPRESS = True
+except ImportError:
+    HAS_COMPRESS = False
+
+try:
+    import python_calamine  # noqa: F401 - Rust Excel reader, much faster than openpyxl
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
+
+logger = logging.getLogger(__name__)
+
+# Dash serializes layouts and callback responses through plotly's JSON engine
+pio.json.config.default_engine = "orjson"
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj, default=self.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+class PreserializedLayoutDash(dash.Dash):
+    """Dash app that serializes its static layout once and serves it with an ETag"""
+    
+    _layout_json = None
+    _layout_etag = None
+    
+    def serve_layout(self):
+        if self._layout_json is None:
+            # Only the public layout property, which may hold a layout function
+            layout = self.layout
+            if callable(layout):
+                layout = layout()
+            layout_json = to_json_plotly(layout).encode("utf-8")
+            self._layout_etag = hashlib.md5(layout_json).hexdigest()
+            self._layout_json = layout_json
+        
+        response = flask.Response(self._layout_json, mimetype="application/json")
+        response.set_etag(self._layout_etag)
+        # Answers If-None-Match revalidations with an empty 304
+        return response.make_conditional(flask.request)
+
+
+# update_title=None keeps the tab title from flickering to "Updating..." on every callback
+app = PreserializedLayoutDash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP, dbc.icons.FONT_AWESOME],
+                              update_title=None)
+app.server.json = OrjsonProvider(app.server)
+
+# Layout and callback JSON is highly repetitive; compress anything over 1 KB
+if HAS_COMPRESS:
+    app.server.config.update(
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_MIN_SIZE=1024,
+        COMPRESS_LEVEL=5
+    )
+    Compress(app.server)
+
+# Custom CSS and clientside callbacks are served from web/assets/
+
+_orchestrator = None
+_orchestrator_lock = threading.Lock()
+
+
+def get_orchestrator():
+    """Create the simulation orchestrator on first use"""
+    global _orchestrator
+    with _orchestrator_lock:
+        if _orchestrator is None:
+            from src.simulation_orchestrator import SimulationOrchestrator
+            _orchestrator = SimulationOrchestrator()
+    return _orchestrator
+
+
+class SimulationCache:
+    """Bounded in-process store for simulation results, addressed by run id"""
+    
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def put(self, results):
+        """Store a results dict and return the run id that addresses it"""
+        run_id = uuid.uuid4().hex
+        with self._lock:
+            self._results[run_id] = dict(results, run_id=run_id)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+        return run_id
+    
+    def get(self, run_id):
+        """Return the results stored under run_id, or None if evicted"""
+        with self._lock:
+            results = self._results.get(run_id)
+            if results is not None:
+                # Runs still being viewed should outlive ones nobody reads
+                self._results.move_to_end(run_id)
+            return results
+
+
+SIM_CACHE = SimulationCache()
+
+
+def resolve_results(store_data):
+    """Look up the results referenced by the simulation-data store"""
+    if not store_data or 'run_id' not in store_data:
+        return None
+    return SIM_CACHE.get(store_data['run_id'])
+
+
 simulation_results = {}
+simulation_run_id = None
+# Replaced wholesale, never mutated (see _update_status): readers on other
+# threads always see a consistent snapshot and can keep it without copying
 simulation_status = {"running": False, "progress": 0, "message": "Ready"}
 uploaded_data = {"load_profiles": None, "pv_profiles": None, "status": "No files uploaded"}
 
+def _loads_json(raw):
+    """Parse JSON bytes with orjson, falling back to json for NaN/Infinity"""
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Results written by json.dump may contain NaN/Infinity, which orjson rejects
+        return json.loads(raw)
+
+
+@lru_cache(maxsize=2)
+def _read_results_file(path, mtime_ns, size):
+    """Parse a results file; keyed on its mtime and size so it is only re-read when it changes"""
+    return _loads_json(Path(path).read_bytes())
+
+
 def load_existing_results():
     """Load existing simulation results from output directory"""
-    import os
-    import json
-    
     output_dir = "data/output"
-    result_files = ["benchmark_results.json", "example_results.json"]
+    result_files = ("benchmark_results.json", "example_results.json")
+    
+    # One directory scan instead of an exists() check per candidate file
+    try:
+        with os.scandir(output_dir) as it:
+            entries = {entry.name: entry for entry in it if entry.name in result_files}
+    except FileNotFoundError:
+        return {}
     
     for file_name in result_files:
-        file_path = os.path.join(output_dir, file_name)
-        if os.path.exists(file_path):
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
+        entry = entries.get(file_name)
+        if entry is None:
+            continue
+        try:
+            stat = entry.stat()
+            data = _read_results_file(entry.path, stat.st_mtime_ns, stat.st_size)
+            
+            # Transform data structure from nested format to expected format
+            if 'benchmark' in data and 'scenario_results' in data['benchmark']:
+                return data['benchmark']  # Return the benchmark data directly
+            elif 'scenario_results' in data:
+                return data  # Already in expected format
                 
-                # Transform data structure from nested format to expected format
-                if 'benchmark' in data and 'scenario_results' in data['benchmark']:
-                    return data['benchmark']  # Return the benchmark data directly
-                elif 'scenario_results' in data:
-                    return data  # Already in expected format
-                    
-            except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
-                print(f"Error loading {file_name}: {e}")
-                continue
+        except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
+            print(f"Error loading {file_name}: {e}")
+            continue
     
     return {}
 
@@ -237,6 +215,7 @@ def load_existing_results():
 existing_results = load_existing_results()
 if existing_results:
     simulation_results.update(existing_results)
+    simulation_run_id = SIM_CACHE.put(simulation_results)
     print(f"Loaded existing results with {len(existing_results.get('scenario_results', {})) if existing_results else 0} scenarios")
 
 # Country-specific pricing data (€/kWh) - Based on 2023-2024 residential tariffs
@@ -298,40 +277,119 @@ COUNTRY_PRICES = {
     }
 }
 
+# Flat price table (off_peak, on_peak, export_ratio, community_spread) per country
+PRICE_FIELDS = ("off_peak", "on_peak", "export_ratio", "community_spread")
+COUNTRY_IDX = {country: i for i, country in enumerate(COUNTRY_PRICES)}
+_PRICE_MATRIX = np.array(
+    [[pricing[field] for field in PRICE_FIELDS] for pricing in COUNTRY_PRICES.values()],
+    dtype=np.float64
+)
+
+# The pricing reference data is read-only at runtime
+COUNTRY_PRICES = MappingProxyType({
+    country: MappingProxyType(pricing) for country, pricing in COUNTRY_PRICES.items()
+})
+
+
+def decoded_upload_size(contents):
+    """Byte size of a base64 data-URL payload, computed from its length alone"""
+    body_length = len(contents) - contents.index(',') - 1
+    padding = 2 if contents.endswith('==') else 1 if contents.endswith('=') else 0
+    return body_length * 3 // 4 - padding
+
+
+# Recently parsed uploads, (payload digest, filename) -> (df, message), so
+# re-uploading the same file skips the decode and parse. Frames are only read
+# downstream, so cached ones are shared as-is
+PARSED_UPLOAD_CACHE_SIZE = 8
+_parsed_uploads = OrderedDict()
+_parsed_uploads_lock = threading.Lock()
+
+
+def _detached_upload(result):
+    """Copy of a cached (df, message) parse result that cannot write through to the cache"""
+    import pandas as pd
+    df, message = result
+    # pandas 3 always copies on write, so a shallow copy is enough there; older
+    # pandas shares the column arrays between shallow copies
+    copy_on_write = int(pd.__version__.split('.')[0]) >= 3
+    return df.copy(deep=not copy_on_write), message
+
 
 def parse_uploaded_file(contents, filename):
     """Parse uploaded file and return data"""
+    import pandas as pd
+    
     try:
-        content_type, content_string = contents.split(',')
-        decoded = base64.b64decode(content_string)
+        if not filename.endswith(('.csv', '.xlsx', '.xls', '.json')):
+            return None, f"Unsupported file type: {filename}"
         
+        payload = contents.encode('ascii')
+        key = (hashlib.blake2b(payload, digest_size=16).digest(), filename)
+        with _parsed_uploads_lock:
+            cached = _parsed_uploads.get(key)
+            if cached is not None:
+                _parsed_uploads.move_to_end(key)
+                return _detached_upload(cached)
+        
+        # Decode straight from a view of the payload; no sliced str copy
+        buffer = io.BytesIO(base64.b64decode(memoryview(payload)[contents.index(',') + 1:]))
+        del payload
+        
+        # Hand the raw bytes to the parsers to avoid an intermediate str copy
         if filename.endswith('.csv'):
-            df = pd.read_csv(io.StringIO(decoded.decode('utf-8')))
+            if HAS_PYARROW:
+                # Multithreaded native parser; 8 MB blocks suit multi-MB profile files
+                table = pa_csv.read_csv(buffer, read_options=pa_csv.ReadOptions(block_size=8 << 20))
+                buffer.close()
+                # Release each Arrow column as soon as it has been converted
+                df = table.to_pandas(self_destruct=True, split_blocks=True)
+                del table
+            else:
+                df = pd.read_csv(buffer)
         elif filename.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(io.BytesIO(decoded))
-        elif filename.endswith('.json'):
-            data = json.loads(decoded.decode('utf-8'))
-            df = pd.DataFrame(data)
+            df = pd.read_excel(buffer, engine=EXCEL_ENGINE)
         else:
-            return None, f"Unsupported file type: {filename}"
+            df = pd.DataFrame(orjson.loads(buffer.getbuffer()))
+        # Drop the decoded bytes before the dtype pass below allocates again
+        buffer.close()
         
-        return df, f"Successfully loaded {filename} ({df.shape[0]} rows, {df.shape[1]} columns)"
+        # Energy profiles don't need double precision; float32 halves memory
+        float64_cols = df.select_dtypes(include='float64').columns
+        if len(float64_cols):
+            df = df.astype({col: np.float32 for col in float64_cols})
+        
+        result = df, f"Successfully loaded {filename} ({df.shape[0]} rows, {df.shape[1]} columns)"
+        with _parsed_uploads_lock:
+            _parsed_uploads[key] = result
+            while len(_parsed_uploads) > PARSED_UPLOAD_CACHE_SIZE:
+                _parsed_uploads.popitem(last=False)
+        return _detached_upload(result)
     
     except Exception as e:
         return None, f"Error parsing {filename}: {str(e)}"
 
 
 def save_uploaded_data_to_framework(df, data_type):
-    """Save uploaded data to the framework data directory"""
+    """Save uploaded data to the framework data directory
+    
+    The file is an archive copy of the upload only. Runs use the in-memory
+    uploaded_data, and the orchestrator's loaders are not pointed at data/input files.
+    """
     try:
         data_dir = Path("data/input")
         data_dir.mkdir(parents=True, exist_ok=True)
         
-        if data_type == "load_profiles":
-            filepath = data_dir / "load_profiles.csv"
-            df.to_csv(filepath, index=False)
-        elif data_type == "pv_profiles":
-            filepath = data_dir / "pv_profiles.csv"
+        if data_type not in ("load_profiles", "pv_profiles"):
+            return False, f"Unknown data type: {data_type}"
+        
+        # Parquet (zstd) is typed and compressed; fall back to CSV without pyarrow
+        if HAS_PYARROW:
+            filepath = data_dir / f"{data_type}.parquet"
+            # Float columns are dense, so dictionary encoding only adds overhead
+            df.to_parquet(filepath, engine='pyarrow', compression='zstd', use_dictionary=False, index=False)
+        else:
+            filepath = data_dir / f"{data_type}.csv"
             df.to_csv(filepath, index=False)
         
         return True, str(filepath)
@@ -339,851 +397,902 @@ def save_uploaded_data_to_framework(df, data_type):
         return False, str(e)
 
 
-app.layout = dbc.Container([
-    dcc.Store(id='simulation-data'),
-    dcc.Interval(id='interval-component', interval=2000, n_intervals=0),
-    
-    # Header
-    dbc.Row([
-        dbc.Col([
-            html.H1([
-                html.I(className="fas fa-bolt me-2"),
-                "Dynamic Tariff Benchmarking Framework"
-            ], className="text-center mb-2"),
-            html.P("Optimize electricity costs and fairness in prosumer communities", 
-                   className="text-center text-muted mb-4")
+def _results_fingerprint(simulation_data):
+    """Stable hash of a results payload, used as a cache key"""
+    if 'run_id' in simulation_data:
+        # Results from SIM_CACHE are immutable per run, so the id is the key
+        return simulation_data['run_id']
+    payload = orjson.dumps(simulation_data, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return hashlib.md5(payload).hexdigest()
+
+
+def memoize_results(maxsize=32):
+    """Memoize a function of (simulation_data, *args) keyed on the results fingerprint"""
+    def decorator(func):
+        cache = OrderedDict()
+        lock = threading.Lock()
+        
+        @wraps(func)
+        def wrapper(simulation_data, *args):
+            key = (_results_fingerprint(simulation_data), args)
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+            
+            value = func(simulation_data, *args)
+            with lock:
+                cache[key] = value
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return value
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+# Largest accepted upload (matches the limit shown in the upload area)
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+# Rows per page of the results table; pages are sliced on the server
+RESULTS_PAGE_SIZE = 25
+
+# Star glyphs for the results table's performance column, indexed by star count
+_STAR_GLYPHS = np.array(['★' * stars for stars in range(6)])
+
+# Display columns sorted by the numeric column they are rendered from
+_RESULTS_SORT_COLUMNS = MappingProxyType({'performance': 'score'})
+
+# Traces with at least this many points are rendered with WebGL (scattergl)
+SCATTERGL_MIN_ROWS = 1000
+
+
+def _scatter(x, y, **kwargs):
+    """Build a scatter trace, switching to WebGL for large series"""
+    trace_cls = go.Scattergl if len(x) >= SCATTERGL_MIN_ROWS else go.Scatter
+    return trace_cls(x=x, y=y, **kwargs)
+
+
+# Trace colours for the P2P / grid-only split, shared by every analytics chart
+_P2P_COLOR_MAP = MappingProxyType({'P2P Trading': '#28a745', 'Grid Only': '#dc3545'})
+
+# Scenario scatters draw at most this many points; larger runs add a density layer
+SCATTER_MAX_POINTS = 200
+# Large runs only chart this many of the cheapest and of the most expensive scenarios
+COST_RANKING_EDGE = 50
+
+
+def _scatter_sample(keep_mask, limit=SCATTER_MAX_POINTS):
+    """Indices to plot: every keep_mask point plus a seeded sample of the rest, up to limit"""
+    if keep_mask.size <= limit:
+        return np.arange(keep_mask.size)
+    keep = np.flatnonzero(keep_mask)
+    rest = np.flatnonzero(~keep_mask)
+    room = min(max(limit - keep.size, 0), rest.size)
+    sample = np.random.default_rng(0).choice(rest, size=room, replace=False)
+    # Keep the original order so trace and legend order don't change
+    return np.sort(np.concatenate((keep, sample)))
+
+
+@lru_cache(maxsize=512)
+def fa_icon(name, extra=""):
+    """Shared FontAwesome solid icon; components are never mutated, so reuse is safe"""
+    return html.I(className=f"fas fa-{name} {extra}".strip())
+
+
+def create_country_info_card(country):
+    """Price summary alert for a country preset"""
+    pricing = COUNTRY_PRICES[country]
+    off_peak, on_peak = _PRICE_MATRIX[COUNTRY_IDX[country], :2].tolist()
+    return dbc.Alert([
+        html.H6(f"{pricing['name']} Electricity Prices", className="mb-2"),
+        html.P(pricing['notes'], className="mb-2 small"),
+        html.Div([
+            dbc.Badge(f"Off-Peak: {off_peak:.3f} {pricing['currency']}/kWh", color="success", className="me-2"),
+            dbc.Badge(f"On-Peak: {on_peak:.3f} {pricing['currency']}/kWh", color="warning")
         ])
-    ]),
-    
-    # Main content in two columns
-    dbc.Row([
-        # Left column - Configuration
-        dbc.Col([
-            dbc.Card([
-                dbc.CardHeader([
-                    html.H4([html.I(className="fas fa-cog me-2"), "Configuration"], className="mb-0")
-                ]),
-                dbc.CardBody([
-                    # Basic settings
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Label("Buildings"),
-                            dbc.Input(id="num-buildings", type="number", value=10, min=2, max=20)
-                        ], width=6),
-                        dbc.Col([
-                            dbc.Label("Time Steps"),
-                            dbc.Input(id="time-horizon", type="number", value=96, min=24, max=288)
-                        ], width=6)
-                    ], className="mb-3"),
+    ], color="info", className="small py-2")
+
+
+# The presets are static, so each country's card is built once at import
+COUNTRY_INFO_CARDS = {country: create_country_info_card(country) for country in COUNTRY_PRICES}
+
+
+def _country_pricing_outputs(country):
+    """Country pricing outputs: info card, four prices, four disabled flags"""
+    locked = country != "custom"  # inputs are only editable for the custom profile
+    return (COUNTRY_INFO_CARDS[country], *_PRICE_MATRIX[COUNTRY_IDX[country]].tolist(), *(locked,) * 4)
+
+
+# Shipped to the browser once in the layout; picking a country is then a lookup there
+COUNTRY_PRICING_OUTPUTS = {country: _country_pricing_outputs(country) for country in COUNTRY_PRICES}
+
+
+# Country selector cards: (id, flag, name, note)
+COUNTRY_CARDS = [
+    ("italy", "🇮🇹", "Italy", "ARERA regulated"),
+    ("germany", "🇩🇪", "Germany", "EEG surcharge"),
+    ("spain", "🇪🇸", "Spain", "PVPC structure"),
+    ("sweden", "🇸🇪", "Sweden", "Nord Pool"),
+    ("france", "🇫🇷", "France", "Tarif Bleu"),
+    ("custom", "🔧", "Custom", "User-defined")
+]
+
+# Tariff selector cards: (id, icon, title, description, badge, badge color, bullet points)
+TARIFF_CARDS = [
+    ("tou", "fas fa-clock text-primary", "Time-of-Use (ToU)",
+     "Fixed pricing periods with predictable peak/off-peak rates", "Stable", "success",
+     ["Off-peak: Night & weekend", "Peak: Weekday evenings", "Best for: Load shifting"]),
+    ("cpp", "fas fa-exclamation-triangle text-warning", "Critical Peak Pricing",
+     "Extreme price spikes during critical system events", "Event-based", "warning",
+     ["Base: ToU structure", "Events: Up to €0.50/kWh", "Best for: Emergency response"]),
+    ("rtp", "fas fa-chart-line text-info", "Real-Time Pricing",
+     "Variable hourly rates following market patterns", "Dynamic", "info",
+     ["Prices: Change hourly", "Pattern: Market-driven", "Best for: Flexible systems"]),
+    ("edr", "fas fa-shield-alt text-danger", "Emergency Demand Response",
+     "Extreme crisis pricing for grid emergency situations", "Crisis", "danger",
+     ["Base: ToU structure", "Emergency: Up to €1.00/kWh", "Best for: Stress testing"])
+]
+
+
+def _country_card(cid, flag, name, note, selected=False):
+    """Build a selectable country card"""
+    class_name = "country-card w-100 p-2" + (" selected" if selected else "")
+    return dbc.Col([
+        dbc.Button([
+            html.Div([
+                html.H4(flag, className="mb-1"),
+                html.H6(name, className="mb-1 text-dark"),
+                html.P(note, className="small text-muted mb-0")
+            ], className="text-center")
+        ], id={"type": "country-card", "id": cid}, color="light", outline=True, className=class_name)
+    ], width=4, className="mb-2")
+
+
+def _tariff_card(tid, icon, title, description, badge, badge_color, bullets, selected=False):
+    """Build a selectable tariff card"""
+    class_name = "tariff-card h-100 w-100 p-3" + (" selected" if selected else "")
+    # The last bullet ("Best for: ...") is highlighted
+    bullet_classes = ["small text-muted"] * (len(bullets) - 1) + ["small text-primary"]
+    return dbc.Col([
+        dbc.Button([
+            html.Div([
+                html.I(className=f"{icon} fa-2x mb-2"),
+                html.H6(title, className="card-title text-dark"),
+                html.P(description, className="card-text small text-muted"),
+                dbc.Badge(badge, color=badge_color, className="mb-2"),
+                html.Ul([
+                    html.Li(bullet, className=bullet_class)
+                    for bullet, bullet_class in zip(bullets, bullet_classes)
+                ], className="small mb-0 text-start")
+            ], className="text-center")
+        ], id={"type": "tariff-card", "id": tid}, color="light", outline=True, className=class_name)
+    ], width=6, className="mb-3")
+
+
+# Simulation options behind the option cards (hidden checklist keeps their state)
+_OPTIONS_ITEMS = (
+    {"label": "P2P Trading", "value": "p2p"},
+    {"label": "Surrogate Model", "value": "surrogate"},
+    {"label": "Sensitivity Analysis", "value": "sensitivity"}
+)
+
+
+# KPI summary cards: (value id, icon, color, initial value, label, caption)
+_SUMMARY_CARDS = [
+    dbc.Col([
+        dbc.Card([
+            dbc.CardBody([
+                html.Div([
+                    html.I(className=f"{icon} text-{color} fa-2x mb-2"),
+                    html.H3(value, id=value_id, className=f"text-{color} mb-1"),
+                    html.P(label, className="text-muted small mb-0"),
+                    html.P(caption, className="text-muted small mb-0")
+                ], className="text-center")
+            ])
+        ], className="shadow-sm border-0 h-100")
+    ], width=3)
+    for value_id, icon, color, value, label, caption in [
+        ("total-scenarios", "fas fa-list-ol", "primary", "0", "Scenarios", "Total evaluated"),
+        ("avg-cost", "fas fa-euro-sign", "success", "€0.00", "Avg Cost", "Per building"),
+        ("avg-fairness", "fas fa-balance-scale", "warning", "0.000", "Fairness", "Lower is better"),
+        ("p2p-savings", "fas fa-chart-line", "info", "0%", "P2P Savings", "vs Grid Only")
+    ]
+]
+
+# Dashboard guide cards: (icon, color, title, description)
+_GUIDE_CARDS = [
+    dbc.Col([
+        dbc.Card([
+            dbc.CardBody([
+                html.Div([
+                    html.I(className=f"{icon} fa-2x text-{color} mb-2"),
+                    html.H6(title, className=f"text-{color}"),
+                    html.P(description, className="small text-muted")
+                ], className="text-center")
+            ])
+        ], className=f"h-100 border-{color} border-2", style={"borderStyle": "dashed"})
+    ], width=4, className="mb-3")
+    for icon, color, title, description in [
+        ("fas fa-chart-pie", "primary", "Overview",
+         "High-level view of all scenarios with key trade-offs and summary statistics."),
+        ("fas fa-euro-sign", "success", "Cost Analysis",
+         "Deep dive into cost patterns, P2P savings, and economic performance."),
+        ("fas fa-balance-scale", "warning", "Fairness",
+         "Understand cost distribution equality across buildings in each scenario."),
+        ("fas fa-handshake", "info", "P2P Trading",
+         "Analyze impact and benefits of peer-to-peer energy trading."),
+        ("fas fa-bolt", "danger", "Energy Flow",
+         "Visualize energy generation, consumption, and sharing patterns."),
+        ("fas fa-trophy", "secondary", "Performance",
+         "Compare overall scenario performance using combined metrics.")
+    ]
+]
+
+# Analytics tabs: (label, tab id, active label color)
+_TAB_LABEL_STYLE = {"color": "#495057", "fontWeight": "500"}
+_ANALYTICS_TABS = [
+    dbc.Tab(label=label, tab_id=tab_id, label_style=_TAB_LABEL_STYLE,
+            active_label_style={"color": active_color, "fontWeight": "bold"})
+    for label, tab_id, active_color in [
+        ("📊 Overview", "overview-tab", "#007bff"),
+        ("💰 Cost Analysis", "cost-tab", "#28a745"),
+        ("⚖️ Fairness", "fairness-tab", "#ffc107"),
+        ("🔄 P2P Trading", "p2p-tab", "#17a2b8"),
+        ("⚡ Energy Flow", "energy-tab", "#dc3545"),
+        ("🏆 Performance", "performance-tab", "#6f42c1")
+    ]
+]
+
+
+# Results table columns and styling, shared by the layout and the re-rendered table
+_RESULTS_TABLE_COLUMNS = [
+    {"name": "🏆 Rank", "id": "rank", "type": "numeric"},
+    {"name": "📋 Scenario", "id": "scenario"},
+    {"name": "💰 Total Cost (€)", "id": "cost", "type": "numeric", "format": {"specifier": ".2f"}},
+    {"name": "⚖️ Fairness", "id": "fairness", "type": "numeric", "format": {"specifier": ".3f"}},
+    {"name": "🔄 P2P Trading", "id": "p2p"},
+    {"name": "📈 Savings (%)", "id": "savings", "type": "numeric", "format": {"specifier": ".1f"}},
+    {"name": "⭐ Performance", "id": "performance"}
+]
+
+_RESULTS_STYLE_CELL = {
+    'textAlign': 'left', 
+    'fontSize': '14px',
+    'padding': '12px',
+    # Fixed single-line rows keep the frozen header aligned with the body
+    'whiteSpace': 'nowrap',
+    'overflow': 'hidden',
+    'textOverflow': 'ellipsis',
+    'height': '40px',
+    'fontFamily': 'system-ui, -apple-system, sans-serif'
+}
+
+_RESULTS_STYLE_HEADER = {
+    'backgroundColor': '#f8f9fa',
+    'fontWeight': 'bold',
+    'fontSize': '14px',
+    'color': '#495057',
+    'border': '1px solid #dee2e6',
+    'textAlign': 'center'
+}
+
+_RESULTS_STYLE_DATA = {
+    'border': '1px solid #dee2e6',
+    'backgroundColor': '#ffffff'
+}
+
+# Gold, silver and bronze (background, text) for the top three ranks
+_RANK_MEDAL_COLORS = (('#ffd700', '#8B4513'), ('#C0C0C0', '#444444'), ('#CD7F32', '#ffffff'))
+
+_RESULTS_STYLE_DATA_CONDITIONAL = [
+    {
+        'if': {'filter_query': '{p2p} = ✅ Yes'},
+        'backgroundColor': '#e8f5e8',
+        'border': '1px solid #28a745'
+    }
+] + [
+    {
+        'if': {'column_id': 'rank', 'filter_query': f'{{rank}} = {rank}'},
+        'backgroundColor': background,
+        'fontWeight': 'bold',
+        'color': color
+    }
+    for rank, (background, color) in enumerate(_RANK_MEDAL_COLORS, start=1)
+]
+
+_RESULTS_STYLE_CELL_CONDITIONAL = [
+    {'if': {'column_id': 'rank'}, 'width': '80px', 'textAlign': 'center'},
+    {'if': {'column_id': 'scenario'}, 'width': '220px', 'textAlign': 'left'},
+    {'if': {'column_id': 'cost'}, 'width': '140px', 'textAlign': 'right'},
+    {'if': {'column_id': 'fairness'}, 'width': '120px', 'textAlign': 'right'},
+    {'if': {'column_id': 'p2p'}, 'width': '120px', 'textAlign': 'center'},
+    {'if': {'column_id': 'savings'}, 'width': '120px', 'textAlign': 'right'},
+    {'if': {'column_id': 'performance'}, 'width': '150px', 'textAlign': 'center'}
+]
+
+_RESULTS_STYLE_TABLE = {
+    'overflowX': 'auto',
+    'overflowY': 'auto',
+    'maxHeight': '600px',
+    'border': '1px solid #dee2e6',
+    'borderRadius': '0.375rem',
+    'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'
+}
+
+# The table is static (pages are filled in by page_results_table), so one
+# instance serves the initial layout and every re-render of the results tab
+_RESULTS_TABLE = dash_table.DataTable(
+    id="results-table",
+    columns=_RESULTS_TABLE_COLUMNS,
+    data=[],
+    page_action="custom",
+    page_current=0,
+    page_size=RESULTS_PAGE_SIZE,
+    sort_action="custom",
+    sort_mode="multi",
+    sort_by=[],
+    filter_action="custom",
+    filter_query="",
+    fixed_rows={'headers': True},
+    style_cell=_RESULTS_STYLE_CELL,
+    style_header=_RESULTS_STYLE_HEADER,
+    style_data=_RESULTS_STYLE_DATA,
+    style_data_conditional=_RESULTS_STYLE_DATA_CONDITIONAL,
+    style_cell_conditional=_RESULTS_STYLE_CELL_CONDITIONAL,
+    style_table=_RESULTS_STYLE_TABLE
+)
+
+# Shown above the table by page_results_table when no scenario matches the filters
+_RESULTS_NO_MATCH = html.Div([
+    dbc.Card([
+        dbc.CardBody([
+            html.Div([
+                fa_icon("filter", "fa-3x text-warning mb-3"),
+                html.H5("No Matching Scenarios", className="text-warning mb-3"),
+                html.P("No successful scenarios match the selected filters. Choose another filter to see results.",
+                       className="text-muted mb-0")
+            ], className="text-center py-4")
+        ])
+    ], className="border-warning mb-3")
+])
+
+# Contents of results-table-container while there are results to page through
+_RESULTS_VIEW = [html.Div(id="results-table-empty"), _RESULTS_TABLE]
+
+
+@lru_cache(maxsize=1)
+def build_layout():
+    """Build the page layout once and reuse it for every page load"""
+    return dbc.Container([
+        dcc.Store(id='simulation-data'),
+        # True while a simulation is running; the browser then listens on
+        # /progress/stream, which pushes each status change into simulation-status
+        dcc.Store(id='progress-stream', data=False),
+        dcc.Store(id='simulation-status'),
+        # Set by the browser whenever simulation-status reports no run in progress
+        dcc.Store(id='simulation-finished'),
+        dcc.Download(id='results-download'),
+    
+        # Header
+        dbc.Row([
+            dbc.Col([
+                html.H1([
+                    fa_icon("bolt", "me-2"),
+                    "Dynamic Tariff Benchmarking Framework"
+                ], className="text-center mb-2"),
+                html.P("Optimize electricity costs and fairness in prosumer communities", 
+                       className="text-center text-muted mb-4")
+            ])
+        ]),
+    
+        # Main content in two columns
+        dbc.Row([
+            # Left column - Configuration
+            dbc.Col([
+                dbc.Card([
+                    dbc.CardHeader([
+                        html.H4([fa_icon("cog", "me-2"), "Configuration"], className="mb-0")
+                    ]),
+                    dbc.CardBody([
+                        # Basic settings
+                        dbc.Row([
+                            dbc.Col([
+                                dbc.Label("Buildings"),
+                                dbc.Input(id="num-buildings", type="number", value=10, min=2, max=20)
+                            ], width=6),
+                            dbc.Col([
+                                dbc.Label("Time Steps"),
+                                dbc.Input(id="time-horizon", type="number", value=96, min=24, max=288)
+                            ], width=6)
+                        ], className="mb-3"),
                     
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Label("Scenarios"),
-                            dbc.Input(id="num-scenarios", type="number", value=15, min=5, max=50)
-                        ], width=6),
-                        dbc.Col([
-                            dbc.Label("Rapid Evals"),
-                            dbc.Input(id="rapid-eval", type="number", value=500, min=0, max=2000)
-                        ], width=6)
-                    ], className="mb-3"),
+                        dbc.Row([
+                            dbc.Col([
+                                dbc.Label("Scenarios"),
+                                dbc.Input(id="num-scenarios", type="number", value=15, min=5, max=50)
+                            ], width=6),
+                            dbc.Col([
+                                dbc.Label("Rapid Evals"),
+                                dbc.Input(id="rapid-eval", type="number", value=500, min=0, max=2000)
+                            ], width=6)
+                        ], className="mb-3"),
                     
-                    # Enhanced Country Selection
-                    dbc.Label([
-                        html.I(className="fas fa-globe-europe me-2"),
-                        "Country Selection"
-                    ], className="fw-bold"),
-                    html.Small("Approximate pricing for research purposes", className="text-muted d-block mb-2"),
+                        # Enhanced Country Selection
+                        dbc.Label([
+                            fa_icon("globe-europe", "me-2"),
+                            "Country Selection"
+                        ], className="fw-bold"),
+                        html.Small("Approximate pricing for research purposes", className="text-muted d-block mb-2"),
                     
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Button([
-                                html.Div([
-                                    html.H4("🇮🇹", className="mb-1"),
-                                    html.H6("Italy", className="mb-1 text-dark"),
-                                    html.P("ARERA regulated", className="small text-muted mb-0")
-                                ], className="text-center")
-                            ], id="italy-country", color="light", outline=True, className="country-card w-100 p-2 selected")
-                        ], width=4, className="mb-2"),
-                        dbc.Col([
-                            dbc.Button([
-                                html.Div([
-                                    html.H4("🇩🇪", className="mb-1"),
-                                    html.H6("Germany", className="mb-1 text-dark"),
-                                    html.P("EEG surcharge", className="small text-muted mb-0")
-                                ], className="text-center")
-                            ], id="germany-country", color="light", outline=True, className="country-card w-100 p-2")
-                        ], width=4, className="mb-2"),
-                        dbc.Col([
-                            dbc.Button([
-                                html.Div([
-                                    html.H4("🇪🇸", className="mb-1"),
-                                    html.H6("Spain", className="mb-1 text-dark"),
-                                    html.P("PVPC structure", className="small text-muted mb-0")
-                                ], className="text-center")
-                            ], id="spain-country", color="light", outline=True, className="country-card w-100 p-2")
-                        ], width=4, className="mb-2"),
-                        dbc.Col([
-                            dbc.Button([
-                                html.Div([
-                                    html.H4("🇸🇪", className="mb-1"),
-                                    html.H6("Sweden", className="mb-1 text-dark"),
-                                    html.P("Nord Pool", className="small text-muted mb-0")
-                                ], className="text-center")
-                            ], id="sweden-country", color="light", outline=True, className="country-card w-100 p-2")
-                        ], width=4, className="mb-2"),
-                        dbc.Col([
-                            dbc.Button([
-                                html.Div([
-                                    html.H4("🇫🇷", className="mb-1"),
-                                    html.H6("France", className="mb-1 text-dark"),
-                                    html.P("Tarif Bleu", className="small text-muted mb-0")
-                                ], className="text-center")
-                            ], id="france-country", color="light", outline=True, className="country-card w-100 p-2")
-                        ], width=4, className="mb-2"),
-                        dbc.Col([
-                            dbc.Button([
-                                html.Div([
-                                    html.H4("🔧", className="mb-1"),
-                                    html.H6("Custom", className="mb-1 text-dark"),
-                                    html.P("User-defined", className="small text-muted mb-0")
-                                ], className="text-center")
-                            ], id="custom-country", color="light", outline=True, className="country-card w-100 p-2")
-                        ], width=4, className="mb-2")
-                    ], className="mb-3"),
+                        dbc.Row([
+                            _country_card(*card, selected=(card[0] == "italy")) for card in COUNTRY_CARDS
+                        ], className="mb-3"),
                     
-                    # Hidden dropdown for compatibility
-                    dcc.Dropdown([
-                        {"label": "🇮🇹 Italy", "value": "italy"},
-                        {"label": "🇩🇪 Germany", "value": "germany"},
-                        {"label": "🇪🇸 Spain", "value": "spain"},
-                        {"label": "🇸🇪 Sweden", "value": "sweden"},
-                        {"label": "🇫🇷 France", "value": "france"},
-                        {"label": "🔧 Custom", "value": "custom"}
-                    ], value="italy", id="country-selector", style={"display": "none"}),
+                        # Selected country, written by the country cards
+                        dcc.Store(id="country-selector", data="italy"),
+                        dcc.Store(id="country-pricing-presets", data=COUNTRY_PRICING_OUTPUTS),
                     
-                    # Enhanced Tariff Selection
-                    dbc.Label([
-                        html.I(className="fas fa-bolt me-2"),
-                        "Tariff Type Selection"
-                    ], className="fw-bold"),
-                    html.Small("Choose the electricity pricing structure for your analysis", className="text-muted d-block mb-2"),
+                        # Enhanced Tariff Selection
+                        dbc.Label([
+                            fa_icon("bolt", "me-2"),
+                            "Tariff Type Selection"
+                        ], className="fw-bold"),
+                        html.Small("Choose the electricity pricing structure for your analysis", className="text-muted d-block mb-2"),
                     
-                    # Tariff cards with visual selection
-                    html.Div([
+                        # Tariff cards with visual selection
+                        html.Div([
+                            dbc.Row([
+                                _tariff_card(*card, selected=(card[0] == "tou")) for card in TARIFF_CARDS
+                            ])
+                        ], className="mb-3"),
+                    
+                        # Selected tariff, written by the tariff cards
+                        dcc.Store(id="tariff-type", data="tou"),
+                    
+                        # Selected tariff display with detailed info
+                        dbc.Card([
+                            dbc.CardHeader([
+                                fa_icon("check-circle", "text-success me-2"),
+                                html.Strong("Selected Tariff")
+                            ]),
+                            dbc.CardBody([
+                                html.H6("Time-of-Use (ToU)", id="selected-tariff-display", className="mb-2"),
+                                html.P("Fixed pricing periods with predictable peak/off-peak rates", id="selected-tariff-description", className="text-muted mb-3"),
+                                html.Div(id="tariff-details", children=[
+                                    # Default ToU details
+                                    dbc.Row([
+                                        dbc.Col([
+                                            html.H6("📅 Time Periods", className="text-primary"),
+                                            html.Ul([
+                                                html.Li("Off-peak: 00:00-07:00, 23:00-24:00"),
+                                                html.Li("Mid-peak: 07:00-17:00, 20:00-23:00"), 
+                                                html.Li("On-peak: 17:00-20:00")
+                                            ], className="small")
+                                        ], width=6),
+                                        dbc.Col([
+                                            html.H6("💡 Use Cases", className="text-info"),
+                                            html.Ul([
+                                                html.Li("Residential prosumer communities"),
+                                                html.Li("Battery storage optimization"),
+                                                html.Li("Predictable load shifting")
+                                            ], className="small")
+                                        ], width=6)
+                                    ])
+                                ])
+                            ])
+                        ], className="mb-3"),
+                    
+                        # Country pricing info
+                        html.Div(id="country-pricing-info", className="mb-3"),
+                    
+                        # Price Configuration
                         dbc.Row([
                             dbc.Col([
-                                dbc.Button([
-                                    html.Div([
-                                        html.I(className="fas fa-clock text-primary fa-2x mb-2"),
-                                        html.H6("Time-of-Use (ToU)", className="card-title text-dark"),
-                                        html.P("Fixed pricing periods with predictable peak/off-peak rates", className="card-text small text-muted"),
-                                        dbc.Badge("Stable", color="success", className="mb-2"),
-                                        html.Ul([
-                                            html.Li("Off-peak: Night & weekend", className="small text-muted"),
-                                            html.Li("Peak: Weekday evenings", className="small text-muted"),
-                                            html.Li("Best for: Load shifting", className="small text-primary")
-                                        ], className="small mb-0 text-start")
-                                    ], className="text-center")
-                                ], id="tou-card", color="light", outline=True, className="tariff-card h-100 w-100 selected p-3")
-                            ], width=6, className="mb-3"),
-                            
+                                dbc.Label("Off-Peak (€/kWh)", size="sm"),
+                                dbc.Input(id="off-peak-price", type="number", value=0.09, step=0.01, size="sm")
+                            ], width=6),
+                            dbc.Col([
+                                dbc.Label("On-Peak (€/kWh)", size="sm"),
+                                dbc.Input(id="on-peak-price", type="number", value=0.28, step=0.01, size="sm")
+                            ], width=6)
+                        ], className="mb-2"),
+                    
+                        dbc.Row([
+                            dbc.Col([
+                                dbc.Label("Export Ratio", size="sm"),
+                                dbc.Input(id="export-ratio", type="number", value=0.45, step=0.1, min=0, max=1, size="sm")
+                            ], width=6),
+                            dbc.Col([
+                                dbc.Label("Community Spread", size="sm"),
+                                dbc.Input(id="community-spread", type="number", value=0.55, step=0.1, min=0, max=1, size="sm")
+                            ], width=6)
+                        ], className="mb-3"),
+                    
+                        # Enhanced Analysis Options
+                        dbc.Label([
+                            fa_icon("cogs", "me-2"),
+                            "Analysis Options"
+                        ], className="fw-bold mb-2"),
+                        html.Small("Select analysis features to include in your simulation", className="text-muted d-block mb-3"),
+                    
+                        dbc.Row([
                             dbc.Col([
                                 dbc.Button([
                                     html.Div([
-                                        html.I(className="fas fa-exclamation-triangle text-warning fa-2x mb-2"),
-                                        html.H6("Critical Peak Pricing", className="card-title text-dark"),
-                                        html.P("Extreme price spikes during critical system events", className="card-text small text-muted"),
-                                        dbc.Badge("Event-based", color="warning", className="mb-2"),
-                                        html.Ul([
-                                            html.Li("Base: ToU structure", className="small text-muted"),
-                                            html.Li("Events: Up to €0.50/kWh", className="small text-muted"),
-                                            html.Li("Best for: Emergency response", className="small text-primary")
-                                        ], className="small mb-0 text-start")
+                                        fa_icon("handshake", "text-success fa-2x mb-2"),
+                                        html.H6("P2P Trading", className="mb-1 text-dark"),
+                                        html.P("Community energy sharing", className="small text-muted mb-0")
                                     ], className="text-center")
-                                ], id="cpp-card", color="light", outline=True, className="tariff-card h-100 w-100 p-3")
-                            ], width=6, className="mb-3"),
-                            
+                                ], id={"type": "option-card", "id": "p2p"}, color="light", outline=True, className="option-card h-100 w-100 p-3 selected")
+                            ], width=4),
                             dbc.Col([
                                 dbc.Button([
                                     html.Div([
-                                        html.I(className="fas fa-chart-line text-info fa-2x mb-2"),
-                                        html.H6("Real-Time Pricing", className="card-title text-dark"),
-                                        html.P("Variable hourly rates following market patterns", className="card-text small text-muted"),
-                                        dbc.Badge("Dynamic", color="info", className="mb-2"),
-                                        html.Ul([
-                                            html.Li("Prices: Change hourly", className="small text-muted"),
-                                            html.Li("Pattern: Market-driven", className="small text-muted"),
-                                            html.Li("Best for: Flexible systems", className="small text-primary")
-                                        ], className="small mb-0 text-start")
+                                        fa_icon("brain", "text-info fa-2x mb-2"),
+                                        html.H6("Surrogate Model", className="mb-1 text-dark"),
+                                        html.P("ML-based rapid evaluation", className="small text-muted mb-0")
                                     ], className="text-center")
-                                ], id="rtp-card", color="light", outline=True, className="tariff-card h-100 w-100 p-3")
-                            ], width=6, className="mb-3"),
-                            
+                                ], id={"type": "option-card", "id": "surrogate"}, color="light", outline=True, className="option-card h-100 w-100 p-3")
+                            ], width=4),
                             dbc.Col([
                                 dbc.Button([
                                     html.Div([
-                                        html.I(className="fas fa-shield-alt text-danger fa-2x mb-2"),
-                                        html.H6("Emergency Demand Response", className="card-title text-dark"),
-                                        html.P("Extreme crisis pricing for grid emergency situations", className="card-text small text-muted"),
-                                        dbc.Badge("Crisis", color="danger", className="mb-2"),
-                                        html.Ul([
-                                            html.Li("Base: ToU structure", className="small text-muted"),
-                                            html.Li("Emergency: Up to €1.00/kWh", className="small text-muted"),
-                                            html.Li("Best for: Stress testing", className="small text-primary")
-                                        ], className="small mb-0 text-start")
+                                        fa_icon("chart-bar", "text-warning fa-2x mb-2"),
+                                        html.H6("Sensitivity Analysis", className="mb-1 text-dark"),
+                                        html.P("Parameter sensitivity", className="small text-muted mb-0")
                                     ], className="text-center")
-                                ], id="edr-card", color="light", outline=True, className="tariff-card h-100 w-100 p-3")
-                            ], width=6, className="mb-3")
-                        ])
-                    ], className="mb-3"),
+                                ], id={"type": "option-card", "id": "sensitivity"}, color="light", outline=True, className="option-card h-100 w-100 p-3")
+                            ], width=4)
+                        ], className="mb-3"),
                     
-                    # Hidden dropdown for compatibility
-                    dcc.Dropdown([
-                        {"label": "Time-of-Use (ToU)", "value": "tou"},
-                        {"label": "Critical Peak Pricing (CPP)", "value": "cpp"},
-                        {"label": "Real-Time Pricing (RTP)", "value": "rtp"},
-                        {"label": "Emergency Demand Response (EDR)", "value": "edr"}
-                    ], value="tou", id="tariff-type", style={"display": "none"}),
+                        # Hidden checklist for compatibility
+                        dbc.Checklist(_OPTIONS_ITEMS, value=["p2p"], id="options", style={"display": "none"}),
                     
-                    # Selected tariff display with detailed info
-                    dbc.Card([
-                        dbc.CardHeader([
-                            html.I(className="fas fa-check-circle text-success me-2"),
-                            html.Strong("Selected Tariff")
-                        ]),
-                        dbc.CardBody([
-                            html.H6("Time-of-Use (ToU)", id="selected-tariff-display", className="mb-2"),
-                            html.P("Fixed pricing periods with predictable peak/off-peak rates", id="selected-tariff-description", className="text-muted mb-3"),
-                            html.Div(id="tariff-details", children=[
-                                # Default ToU details
-                                dbc.Row([
-                                    dbc.Col([
-                                        html.H6("📅 Time Periods", className="text-primary"),
-                                        html.Ul([
-                                            html.Li("Off-peak: 00:00-07:00, 23:00-24:00"),
-                                            html.Li("Mid-peak: 07:00-17:00, 20:00-23:00"), 
-                                            html.Li("On-peak: 17:00-20:00")
-                                        ], className="small")
-                                    ], width=6),
-                                    dbc.Col([
-                                        html.H6("💡 Use Cases", className="text-info"),
-                                        html.Ul([
-                                            html.Li("Residential prosumer communities"),
-                                            html.Li("Battery storage optimization"),
-                                            html.Li("Predictable load shifting")
-                                        ], className="small")
-                                    ], width=6)
-                                ])
-                            ])
-                        ])
-                    ], className="mb-3"),
+                        # Enhanced File upload section
+                        html.Hr(),
+                        dbc.Label([
+                            fa_icon("cloud-upload-alt", "me-2"),
+                            "Data Upload"
+                        ], className="fw-bold"),
+                        dbc.Badge("Optional", color="secondary", className="ms-2 mb-2"),
+                        html.Small("Upload custom load profiles or PV generation data to enhance simulation accuracy", className="text-muted d-block mb-3"),
                     
-                    # Country pricing info
-                    html.Div(id="country-pricing-info", className="mb-3"),
+                        # Enhanced drag-and-drop upload area
+                        dcc.Upload(
+                            id='upload-data',
+                            children=html.Div([
+                                dbc.Card([
+                                    dbc.CardBody([
+                                        html.Div([
+                                            fa_icon("cloud-upload-alt", "fa-3x text-primary mb-3"),
+                                            html.H5("Drag & Drop Files Here", className="text-primary mb-2"),
+                                            html.P("or click to browse files", className="text-muted mb-3"),
+                                            dbc.Row([
+                                                dbc.Col([
+                                                    dbc.Badge("📊 CSV", color="info", className="me-1")
+                                                ], width="auto"),
+                                                dbc.Col([
+                                                    dbc.Badge("📈 Excel", color="success", className="me-1")
+                                                ], width="auto"),
+                                                dbc.Col([
+                                                    dbc.Badge("📄 JSON", color="warning", className="me-1")
+                                                ], width="auto")
+                                            ], justify="center", className="mb-3"),
+                                            html.Small("Max file size: 50MB | Supported formats: .csv, .xlsx, .json", className="text-muted")
+                                        ], className="text-center py-3")
+                                    ])
+                                ], className="border-2 border-primary", style={"borderStyle": "dashed", "backgroundColor": "#f8f9ff"})
+                            ]),
+                            style={
+                                'borderRadius': '8px',
+                                'cursor': 'pointer',
+                                'transition': 'all 0.3s ease'
+                            },
+                            accept='.csv,.xlsx,.xls,.json',
+                            # Reject oversize files in the browser before they are
+                            # base64-encoded into a callback payload
+                            max_size=MAX_UPLOAD_BYTES,
+                            className="upload-area mb-3"
+                        ),
                     
-                    # Price Configuration
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Label("Off-Peak (€/kWh)", size="sm"),
-                            dbc.Input(id="off-peak-price", type="number", value=0.09, step=0.01, size="sm")
-                        ], width=6),
-                        dbc.Col([
-                            dbc.Label("On-Peak (€/kWh)", size="sm"),
-                            dbc.Input(id="on-peak-price", type="number", value=0.28, step=0.01, size="sm")
-                        ], width=6)
-                    ], className="mb-2"),
+                        # Enhanced format help section
+                        dbc.Row([
+                            dbc.Col([
+                                dbc.Button([
+                                    fa_icon("info-circle", "me-2"),
+                                    "Format Guide"
+                                ], id={"type": "collapse-toggle", "id": "upload-help"}, color="info", size="sm", outline=True, className="w-100")
+                            ], width=6),
+                            dbc.Col([
+                                dbc.Button([
+                                    fa_icon("download", "me-2"),
+                                    "Sample Files"
+                                ], color="outline-secondary", size="sm", className="w-100", disabled=True)
+                            ], width=6)
+                        ], className="mb-3"),
                     
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Label("Export Ratio", size="sm"),
-                            dbc.Input(id="export-ratio", type="number", value=0.45, step=0.1, min=0, max=1, size="sm")
-                        ], width=6),
-                        dbc.Col([
-                            dbc.Label("Community Spread", size="sm"),
-                            dbc.Input(id="community-spread", type="number", value=0.55, step=0.1, min=0, max=1, size="sm")
-                        ], width=6)
-                    ], className="mb-3"),
-                    
-                    # Enhanced Analysis Options
-                    dbc.Label([
-                        html.I(className="fas fa-cogs me-2"),
-                        "Analysis Options"
-                    ], className="fw-bold mb-2"),
-                    html.Small("Select analysis features to include in your simulation", className="text-muted d-block mb-3"),
-                    
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Button([
-                                html.Div([
-                                    html.I(className="fas fa-handshake text-success fa-2x mb-2"),
-                                    html.H6("P2P Trading", className="mb-1 text-dark"),
-                                    html.P("Community energy sharing", className="small text-muted mb-0")
-                                ], className="text-center")
-                            ], id="p2p-option", color="light", outline=True, className="option-card h-100 w-100 p-3 selected")
-                        ], width=4),
-                        dbc.Col([
-                            dbc.Button([
-                                html.Div([
-                                    html.I(className="fas fa-brain text-info fa-2x mb-2"),
-                                    html.H6("Surrogate Model", className="mb-1 text-dark"),
-                                    html.P("ML-based rapid evaluation", className="small text-muted mb-0")
-                                ], className="text-center")
-                            ], id="surrogate-option", color="light", outline=True, className="option-card h-100 w-100 p-3")
-                        ], width=4),
-                        dbc.Col([
-                            dbc.Button([
-                                html.Div([
-                                    html.I(className="fas fa-chart-bar text-warning fa-2x mb-2"),
-                                    html.H6("Sensitivity Analysis", className="mb-1 text-dark"),
-                                    html.P("Parameter sensitivity", className="small text-muted mb-0")
-                                ], className="text-center")
-                            ], id="sensitivity-option", color="light", outline=True, className="option-card h-100 w-100 p-3")
-                        ], width=4)
-                    ], className="mb-3"),
-                    
-                    # Hidden checklist for compatibility
-                    dbc.Checklist([
-                        {"label": "P2P Trading", "value": "p2p"},
-                        {"label": "Surrogate Model", "value": "surrogate"},
-                        {"label": "Sensitivity Analysis", "value": "sensitivity"}
-                    ], value=["p2p"], id="options", style={"display": "none"}),
-                    
-                    # Enhanced File upload section
-                    html.Hr(),
-                    dbc.Label([
-                        html.I(className="fas fa-cloud-upload-alt me-2"),
-                        "Data Upload"
-                    ], className="fw-bold"),
-                    dbc.Badge("Optional", color="secondary", className="ms-2 mb-2"),
-                    html.Small("Upload custom load profiles or PV generation data to enhance simulation accuracy", className="text-muted d-block mb-3"),
-                    
-                    # Enhanced drag-and-drop upload area
-                    dcc.Upload(
-                        id='upload-data',
-                        children=html.Div([
+                        dbc.Collapse([
                             dbc.Card([
                                 dbc.CardBody([
-                                    html.Div([
-                                        html.I(className="fas fa-cloud-upload-alt fa-3x text-primary mb-3"),
-                                        html.H5("Drag & Drop Files Here", className="text-primary mb-2"),
-                                        html.P("or click to browse files", className="text-muted mb-3"),
-                                        dbc.Row([
-                                            dbc.Col([
-                                                dbc.Badge("📊 CSV", color="info", className="me-1")
-                                            ], width="auto"),
-                                            dbc.Col([
-                                                dbc.Badge("📈 Excel", color="success", className="me-1")
-                                            ], width="auto"),
-                                            dbc.Col([
-                                                dbc.Badge("📄 JSON", color="warning", className="me-1")
-                                            ], width="auto")
-                                        ], justify="center", className="mb-3"),
-                                        html.Small("Max file size: 50MB | Supported formats: .csv, .xlsx, .json", className="text-muted")
-                                    ], className="text-center py-3")
+                                    html.H6([
+                                        fa_icon("file-alt", "me-2 text-info"),
+                                        "File Format Requirements"
+                                    ], className="mb-3"),
+                                    dbc.Row([
+                                        dbc.Col([
+                                            html.Div([
+                                                html.H6("📊 Data Structure", className="text-primary mb-2"),
+                                                html.Ul([
+                                                    html.Li("Rows = Time steps (hourly/15-min intervals)"),
+                                                    html.Li("Columns = Buildings (Building_1, Building_2, etc.)"),
+                                                    html.Li("First row should contain column headers"),
+                                                    html.Li("Data values should be numeric (kWh)")
+                                                ], className="small")
+                                            ])
+                                        ], width=6),
+                                        dbc.Col([
+                                            html.Div([
+                                                html.H6("🏷️ File Naming", className="text-success mb-2"),
+                                                html.Ul([
+                                                    html.Li([html.Strong("Load data:"), " Include 'load', 'demand', or 'consumption'"]),
+                                                    html.Li([html.Strong("PV data:"), " Include 'pv', 'solar', or 'generation'"]),
+                                                    html.Li([html.Strong("Examples:"), " load_profiles.csv, pv_generation.xlsx"])
+                                                ], className="small")
+                                            ])
+                                        ], width=6)
+                                    ]),
+                                    dbc.Alert([
+                                        fa_icon("magic", "me-2"),
+                                        "Data will be automatically resized and validated to match your simulation settings."
+                                    ], color="info", className="small mt-3 mb-0")
                                 ])
-                            ], className="border-2 border-primary", style={"borderStyle": "dashed", "backgroundColor": "#f8f9ff"})
-                        ]),
-                        style={
-                            'borderRadius': '8px',
-                            'cursor': 'pointer',
-                            'transition': 'all 0.3s ease'
-                        },
-                        accept='.csv,.xlsx,.xls,.json',
-                        className="upload-area mb-3"
-                    ),
-                    
-                    # Enhanced format help section
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Button([
-                                html.I(className="fas fa-info-circle me-2"),
-                                "Format Guide"
-                            ], id="help-toggle", color="info", size="sm", outline=True, className="w-100")
-                        ], width=6),
-                        dbc.Col([
-                            dbc.Button([
-                                html.I(className="fas fa-download me-2"),
-                                "Sample Files"
-                            ], color="outline-secondary", size="sm", className="w-100", disabled=True)
-                        ], width=6)
-                    ], className="mb-3"),
+                            ], className="border-0 bg-light")
+                        ], id={"type": "collapse", "id": "upload-help"}, is_open=False),
                     
-                    dbc.Collapse([
-                        dbc.Card([
-                            dbc.CardBody([
-                                html.H6([
-                                    html.I(className="fas fa-file-alt me-2 text-info"),
-                                    "File Format Requirements"
-                                ], className="mb-3"),
-                                dbc.Row([
-                                    dbc.Col([
-                                        html.Div([
-                                            html.H6("📊 Data Structure", className="text-primary mb-2"),
-                                            html.Ul([
-                                                html.Li("Rows = Time steps (hourly/15-min intervals)"),
-                                                html.Li("Columns = Buildings (Building_1, Building_2, etc.)"),
-                                                html.Li("First row should contain column headers"),
-                                                html.Li("Data values should be numeric (kWh)")
-                                            ], className="small")
-                                        ])
-                                    ], width=6),
-                                    dbc.Col([
-                                        html.Div([
-                                            html.H6("🏷️ File Naming", className="text-success mb-2"),
-                                            html.Ul([
-                                                html.Li([html.Strong("Load data:"), " Include 'load', 'demand', or 'consumption'"]),
-                                                html.Li([html.Strong("PV data:"), " Include 'pv', 'solar', or 'generation'"]),
-                                                html.Li([html.Strong("Examples:"), " load_profiles.csv, pv_generation.xlsx"])
-                                            ], className="small")
-                                        ])
-                                    ], width=6)
-                                ]),
-                                dbc.Alert([
-                                    html.I(className="fas fa-magic me-2"),
-                                    "Data will be automatically resized and validated to match your simulation settings."
-                                ], color="info", className="small mt-3 mb-0")
-                            ])
-                        ], className="border-0 bg-light")
-                    ], id="upload-help", is_open=False),
-                    
-                    # Enhanced upload status area
-                    html.Div(id='upload-status', className="mb-3"),
+                        # Enhanced upload status area
+                        html.Div(id='upload-status', className="mb-3"),
+                        # Set by the browser once an upload passes the clientside sniff checks
+                        dcc.Store(id='upload-validated'),
+                        # Excel files are parsed in the background; poll until the job finishes
+                        dcc.Store(id='upload-job'),
+                        dcc.Interval(id='upload-interval', interval=500, n_intervals=0, disabled=True),
                     
-                    # Enhanced Control buttons
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Button([
-                                html.I(className="fas fa-play me-2"),
-                                "Start Simulation"
-                            ], id="start-btn", color="success", size="lg", className="w-100 shadow-sm")
-                        ], width=8),
-                        dbc.Col([
-                            dbc.Button([
-                                html.I(className="fas fa-stop me-2"),
-                                "Stop"
-                            ], id="stop-btn", color="danger", size="lg", disabled=True, className="w-100 shadow-sm")
-                        ], width=4)
-                    ], className="mb-3"),
+                        # Enhanced Control buttons
+                        dbc.Row([
+                            dbc.Col([
+                                dbc.Button([
+                                    fa_icon("play", "me-2"),
+                                    "Start Simulation"
+                                ], id="start-btn", color="success", size="lg", className="w-100 shadow-sm")
+                            ], width=8),
+                            dbc.Col([
+                                dbc.Button([
+                                    fa_icon("stop", "me-2"),
+                                    "Stop"
+                                ], id="stop-btn", color="danger", size="lg", disabled=True, className="w-100 shadow-sm")
+                            ], width=4)
+                        ], className="mb-3"),
                     
-                    # Status
-                    html.Div(id="status-display"),
-                    dbc.Progress(id="progress-bar", value=0, className="mb-2"),
+                        # Status
+                        dbc.Badge("Ready", id="status-display", color="secondary", className="w-100 p-2"),
+                        dbc.Progress(id="progress-bar", value=0, className="mb-2"),
                     
-                    # Enhanced Quick actions
-                    html.Hr(),
-                    dbc.Row([
-                        dbc.Col([
-                            dbc.Button([
-                                html.I(className="fas fa-download me-2"),
-                                "Download Results"
-                            ], id="download-btn", color="success", className="w-100 shadow-sm", disabled=True)
-                        ], width=6, className="mb-2"),
-                        dbc.Col([
-                            dbc.Button([
-                                html.I(className="fas fa-redo me-2"),
-                                "Reset"
-                            ], id="reset-btn", color="outline-secondary", className="w-100 shadow-sm")
-                        ], width=6, className="mb-2")
-                    ], className="mb-3"),
+                        # Enhanced Quick actions
+                        html.Hr(),
+                        dbc.Row([
+                            dbc.Col([
+                                dbc.Button([
+                                    fa_icon("download", "me-2"),
+                                    "Download Results"
+                                ], id="download-btn", color="success", className="w-100 shadow-sm", disabled=True)
+                            ], width=6, className="mb-2"),
+                            dbc.Col([
+                                dbc.Button([
+                                    fa_icon("redo", "me-2"),
+                                    "Reset"
+                                ], id="reset-btn", color="outline-secondary", className="w-100 shadow-sm")
+                            ], width=6, className="mb-2")
+                        ], className="mb-3"),
                     
-                    # Data sources disclaimer
-                    dbc.Collapse([
-                        dbc.Alert([
-                            html.H6("Data Sources & Disclaimer", className="mb-2"),
-                            html.P("Pricing data are research approximations based on:", className="small mb-1"),
-                            html.Ul([
-                                html.Li("🇮🇹 ARERA regulated tariffs structure", className="small"),
-                                html.Li("🇩🇪 Average residential tariffs + EEG surcharge", className="small"),
-                                html.Li("🇪🇸 PVPC time-of-use structure", className="small"),
-                                html.Li("🇸🇪 Nord Pool market + grid components", className="small"),
-                                html.Li("🇫🇷 EDF Tarif Bleu regulated rates", className="small")
-                            ], className="mb-2"),
-                            html.P("⚠️ For research purposes only. Use real tariff data for commercial applications.", 
-                                   className="small text-warning mb-0")
-                        ], color="light", className="small py-2")
-                    ], id="sources-info", is_open=False),
+                        # Data sources disclaimer
+                        dbc.Collapse([
+                            dbc.Alert([
+                                html.H6("Data Sources & Disclaimer", className="mb-2"),
+                                html.P("Pricing data are research approximations based on:", className="small mb-1"),
+                                html.Ul([
+                                    html.Li("🇮🇹 ARERA regulated tariffs structure", className="small"),
+                                    html.Li("🇩🇪 Average residential tariffs + EEG surcharge", className="small"),
+                                    html.Li("🇪🇸 PVPC time-of-use structure", className="small"),
+                                    html.Li("🇸🇪 Nord Pool market + grid components", className="small"),
+                                    html.Li("🇫🇷 EDF Tarif Bleu regulated rates", className="small")
+                                ], className="mb-2"),
+                                html.P("⚠️ For research purposes only. Use real tariff data for commercial applications.", 
+                                       className="small text-warning mb-0")
+                            ], color="light", className="small py-2")
+                        ], id={"type": "collapse", "id": "sources-info"}, is_open=False),
                     
-                    dbc.Button([
-                        html.I(className="fas fa-database me-2"),
-                        "Data Sources"
-                    ], id="sources-toggle", color="info", size="sm", outline=True)
+                        dbc.Button([
+                            fa_icon("database", "me-2"),
+                            "Data Sources"
+                        ], id={"type": "collapse-toggle", "id": "sources-info"}, color="info", size="sm", outline=True)
+                    ])
                 ])
-            ])
-        ], width=4),
+            ], width=4),
         
-        # Right column - Results and Analysis
-        dbc.Col([
-            # Enhanced Results summary cards
-            dbc.Row([
-                dbc.Col([
-                    dbc.Card([
-                        dbc.CardBody([
-                            html.Div([
-                                html.I(className="fas fa-list-ol text-primary fa-2x mb-2"),
-                                html.H3("0", id="total-scenarios", className="text-primary mb-1"),
-                                html.P("Scenarios", className="text-muted small mb-0"),
-                                html.P("Total evaluated", className="text-muted small mb-0")
-                            ], className="text-center")
-                        ])
-                    ], className="shadow-sm border-0 h-100")
-                ], width=3),
-                dbc.Col([
-                    dbc.Card([
-                        dbc.CardBody([
-                            html.Div([
-                                html.I(className="fas fa-euro-sign text-success fa-2x mb-2"),
-                                html.H3("€0.00", id="avg-cost", className="text-success mb-1"),
-                                html.P("Avg Cost", className="text-muted small mb-0"),
-                                html.P("Per building", className="text-muted small mb-0")
-                            ], className="text-center")
-                        ])
-                    ], className="shadow-sm border-0 h-100")
-                ], width=3),
-                dbc.Col([
-                    dbc.Card([
-                        dbc.CardBody([
-                            html.Div([
-                                html.I(className="fas fa-balance-scale text-warning fa-2x mb-2"),
-                                html.H3("0.000", id="avg-fairness", className="text-warning mb-1"),
-                                html.P("Fairness", className="text-muted small mb-0"),
-                                html.P("Lower is better", className="text-muted small mb-0")
-                            ], className="text-center")
-                        ])
-                    ], className="shadow-sm border-0 h-100")
-                ], width=3),
-                dbc.Col([
-                    dbc.Card([
-                        dbc.CardBody([
-                            html.Div([
-                                html.I(className="fas fa-chart-line text-info fa-2x mb-2"),
-                                html.H3("0%", id="p2p-savings", className="text-info mb-1"),
-                                html.P("P2P Savings", className="text-muted small mb-0"),
-                                html.P("vs Grid Only", className="text-muted small mb-0")
-                            ], className="text-center")
-                        ])
-                    ], className="shadow-sm border-0 h-100")
-                ], width=3)
-            ], className="mb-4"),
+            # Right column - Results and Analysis
+            dbc.Col([
+                # Enhanced Results summary cards
+                dbc.Row(_SUMMARY_CARDS, className="mb-4"),
             
-            # Enhanced Advanced Analytics Dashboard
-            dbc.Card([
-                dbc.CardHeader([
-                    dbc.Row([
-                        dbc.Col([
-                            html.Div([
-                                html.H4([
-                                    html.I(className="fas fa-chart-line me-3 text-primary"),
-                                    "Advanced Analytics Dashboard"
-                                ], className="mb-2"),
-                                html.P([
-                                    html.I(className="fas fa-info-circle me-2 text-muted"),
-                                    "Comprehensive analysis of simulation results with interactive visualizations"
-                                ], className="text-muted mb-2 small"),
-                                dbc.Badge(id="selected-tariffs-info", color="light", className="px-3 py-1")
-                            ])
-                        ], width=8),
-                        dbc.Col([
-                            html.Div([
-                                dbc.Button([
-                                    html.I(className="fas fa-compass me-2"),
-                                    "Guide"
-                                ], id="dashboard-guide-toggle", color="primary", size="sm", outline=True, className="mb-2"),
+                # Enhanced Advanced Analytics Dashboard
+                dbc.Card([
+                    dbc.CardHeader([
+                        dbc.Row([
+                            dbc.Col([
                                 html.Div([
-                                    html.I(className="fas fa-circle text-success me-1"),
-                                    html.Small("Ready for analysis", className="text-muted")
-                                ], className="d-flex align-items-center")
-                            ], className="text-end")
-                        ], width=4)
-                    ])
-                ], className="bg-light border-0"),
-                dbc.CardBody([
-                    # Enhanced Dashboard Guide
-                    dbc.Collapse([
-                        dbc.Card([
-                            dbc.CardBody([
+                                    html.H4([
+                                        fa_icon("chart-line", "me-3 text-primary"),
+                                        "Advanced Analytics Dashboard"
+                                    ], className="mb-2"),
+                                    html.P([
+                                        fa_icon("info-circle", "me-2 text-muted"),
+                                        "Comprehensive analysis of simulation results with interactive visualizations"
+                                    ], className="text-muted mb-2 small"),
+                                    dbc.Badge(id="selected-tariffs-info", color="light", className="px-3 py-1")
+                                ])
+                            ], width=8),
+                            dbc.Col([
                                 html.Div([
-                                    html.H5([
-                                        html.I(className="fas fa-graduation-cap me-2 text-primary"),
-                                        "Dashboard Guide"
-                                    ], className="mb-4 text-center"),
-                                    
-                                    dbc.Row([
-                                        dbc.Col([
-                                            dbc.Card([
-                                                dbc.CardBody([
-                                                    html.Div([
-                                                        html.I(className="fas fa-chart-pie fa-2x text-primary mb-2"),
-                                                        html.H6("Overview", className="text-primary"),
-                                                        html.P("High-level view of all scenarios with key trade-offs and summary statistics.", className="small text-muted")
-                                                    ], className="text-center")
-                                                ])
-                                            ], className="h-100 border-primary border-2", style={"borderStyle": "dashed"})
-                                        ], width=4, className="mb-3"),
-                                        dbc.Col([
-                                            dbc.Card([
-                                                dbc.CardBody([
-                                                    html.Div([
-                                                        html.I(className="fas fa-euro-sign fa-2x text-success mb-2"),
-                                                        html.H6("Cost Analysis", className="text-success"),
-                                                        html.P("Deep dive into cost patterns, P2P savings, and economic performance.", className="small text-muted")
-                                                    ], className="text-center")
-                                                ])
-                                            ], className="h-100 border-success border-2", style={"borderStyle": "dashed"})
-                                        ], width=4, className="mb-3"),
-                                        dbc.Col([
-                                            dbc.Card([
-                                                dbc.CardBody([
-                                                    html.Div([
-                                                        html.I(className="fas fa-balance-scale fa-2x text-warning mb-2"),
-                                                        html.H6("Fairness", className="text-warning"),
-                                                        html.P("Understand cost distribution equality across buildings in each scenario.", className="small text-muted")
-                                                    ], className="text-center")
-                                                ])
-                                            ], className="h-100 border-warning border-2", style={"borderStyle": "dashed"})
-                                        ], width=4, className="mb-3")
-                                    ]),
+                                    dbc.Button([
+                                        fa_icon("compass", "me-2"),
+                                        "Guide"
+                                    ], id={"type": "collapse-toggle", "id": "dashboard-guide"}, color="primary", size="sm", outline=True, className="mb-2"),
+                                    html.Div([
+                                        fa_icon("circle", "text-success me-1"),
+                                        html.Small("Ready for analysis", className="text-muted")
+                                    ], className="d-flex align-items-center")
+                                ], className="text-end")
+                            ], width=4)
+                        ])
+                    ], className="bg-light border-0"),
+                    dbc.CardBody([
+                        # Enhanced Dashboard Guide
+                        dbc.Collapse([
+                            dbc.Card([
+                                dbc.CardBody([
+                                    html.Div([
+                                        html.H5([
+                                            fa_icon("graduation-cap", "me-2 text-primary"),
+                                            "Dashboard Guide"
+                                        ], className="mb-4 text-center"),
                                     
-                                    dbc.Row([
-                                        dbc.Col([
-                                            dbc.Card([
-                                                dbc.CardBody([
-                                                    html.Div([
-                                                        html.I(className="fas fa-handshake fa-2x text-info mb-2"),
-                                                        html.H6("P2P Trading", className="text-info"),
-                                                        html.P("Analyze impact and benefits of peer-to-peer energy trading.", className="small text-muted")
-                                                    ], className="text-center")
-                                                ])
-                                            ], className="h-100 border-info border-2", style={"borderStyle": "dashed"})
-                                        ], width=4, className="mb-3"),
-                                        dbc.Col([
-                                            dbc.Card([
-                                                dbc.CardBody([
-                                                    html.Div([
-                                                        html.I(className="fas fa-bolt fa-2x text-danger mb-2"),
-                                                        html.H6("Energy Flow", className="text-danger"),
-                                                        html.P("Visualize energy generation, consumption, and sharing patterns.", className="small text-muted")
-                                                    ], className="text-center")
-                                                ])
-                                            ], className="h-100 border-danger border-2", style={"borderStyle": "dashed"})
-                                        ], width=4, className="mb-3"),
-                                        dbc.Col([
-                                            dbc.Card([
-                                                dbc.CardBody([
-                                                    html.Div([
-                                                        html.I(className="fas fa-trophy fa-2x text-secondary mb-2"),
-                                                        html.H6("Performance", className="text-secondary"),
-                                                        html.P("Compare overall scenario performance using combined metrics.", className="small text-muted")
-                                                    ], className="text-center")
-                                                ])
-                                            ], className="h-100 border-secondary border-2", style={"borderStyle": "dashed"})
-                                        ], width=4, className="mb-3")
+                                        dbc.Row(_GUIDE_CARDS[:3]),
+                                        dbc.Row(_GUIDE_CARDS[3:])
                                     ])
                                 ])
-                            ])
-                        ], className="border-0 shadow-sm bg-light")
-                    ], id="dashboard-guide", is_open=False),
+                            ], className="border-0 shadow-sm bg-light")
+                        ], id={"type": "collapse", "id": "dashboard-guide"}, is_open=False),
                     
-                    html.Div([
-                        dbc.Tabs([
-                            dbc.Tab(label="📊 Overview", tab_id="overview-tab", 
-                                   label_style={"color": "#495057", "fontWeight": "500"}, 
-                                   active_label_style={"color": "#007bff", "fontWeight": "bold"}),
-                            dbc.Tab(label="💰 Cost Analysis", tab_id="cost-tab",
-                                   label_style={"color": "#495057", "fontWeight": "500"}, 
-                                   active_label_style={"color": "#28a745", "fontWeight": "bold"}),
-                            dbc.Tab(label="⚖️ Fairness", tab_id="fairness-tab",
-                                   label_style={"color": "#495057", "fontWeight": "500"}, 
-                                   active_label_style={"color": "#ffc107", "fontWeight": "bold"}),
-                            dbc.Tab(label="🔄 P2P Trading", tab_id="p2p-tab",
-                                   label_style={"color": "#495057", "fontWeight": "500"}, 
-                                   active_label_style={"color": "#17a2b8", "fontWeight": "bold"}),
-                            dbc.Tab(label="⚡ Energy Flow", tab_id="energy-tab",
-                                   label_style={"color": "#495057", "fontWeight": "500"}, 
-                                   active_label_style={"color": "#dc3545", "fontWeight": "bold"}),
-                            dbc.Tab(label="🏆 Performance", tab_id="performance-tab",
-                                   label_style={"color": "#495057", "fontWeight": "500"}, 
-                                   active_label_style={"color": "#6f42c1", "fontWeight": "bold"})
-                        ], id="analytics-tabs", active_tab="overview-tab", className="analytics-tabs"),
-                    ], className="mb-3"),
+                        html.Div([
+                            dbc.Tabs(_ANALYTICS_TABS, id="analytics-tabs", active_tab="overview-tab", className="analytics-tabs"),
+                        ], className="mb-3"),
                     
-                    html.Div(id="analytics-content", className="analytics-content")
-                ])
-            ], className="shadow-sm mb-4"),
-            
-            # Results table with better explanations
-            dbc.Card([
-                dbc.CardHeader([
-                    dbc.Row([
-                        dbc.Col([
-                            html.H5("📊 Scenario Results", className="mb-0"),
-                            html.Small("Ranked by overall performance (lower cost + better fairness)", className="text-muted")
-                        ], width=8),
-                        dbc.Col([
-                            dbc.ButtonGroup([
-                                dbc.Button([
-                                    html.I(className="fas fa-refresh me-2"), 
-                                    "Refresh"
-                                ], id="refresh-results-btn", color="success", size="sm", outline=True),
-                                dbc.Button([
-                                    html.I(className="fas fa-info-circle me-2"), 
-                                    "Help"
-                                ], id="results-help-toggle", color="info", size="sm", outline=True)
-                            ])
-                        ], width=4, className="text-end")
+                        html.Div(id="analytics-content", className="analytics-content")
                     ])
-                ]),
-                dbc.CardBody([
-                    # Enhanced Help collapse
-                    dbc.Collapse([
-                        dbc.Card([
-                            dbc.CardBody([
-                                html.H6([
-                                    html.I(className="fas fa-question-circle me-2 text-info"),
-                                    "Understanding the Results"
-                                ], className="mb-3"),
-                                dbc.Row([
-                                    dbc.Col([
-                                        html.Div([
-                                            html.H6("📊 Key Metrics", className="text-primary mb-2"),
-                                            html.Ul([
-                                                html.Li([html.Strong("Rank:"), " Best scenarios ranked #1, #2, #3..."]),
-                                                html.Li([html.Strong("Total Cost:"), " Average electricity cost per building (€)"]),
-                                                html.Li([html.Strong("Fairness:"), " Cost equality across buildings (lower = more fair)"])
-                                            ], className="small")
-                                        ])
-                                    ], width=6),
-                                    dbc.Col([
-                                        html.Div([
-                                            html.H6("🎯 Performance", className="text-success mb-2"),
-                                            html.Ul([
-                                                html.Li([html.Strong("P2P Trading:"), " Energy sharing enabled/disabled"]),
-                                                html.Li([html.Strong("Savings:"), " Cost reduction vs baseline"]),
-                                                html.Li([html.Strong("Performance:"), " Combined score (★★★★★)"])
-                                            ], className="small")
-                                        ])
-                                    ], width=6)
-                                ]),
-                                dbc.Alert([
-                                    html.I(className="fas fa-lightbulb me-2"),
-                                    "Green rows indicate P2P trading scenarios with community energy sharing benefits."
-                                ], color="success", className="small mt-3 mb-0")
-                            ])
-                        ], className="border-0 bg-light")
-                    ], id="results-help", is_open=False),
+                ], className="shadow-sm mb-4"),
+            
+                # Results table with better explanations
+                dbc.Card([
+                    dbc.CardHeader([
+                        dbc.Row([
+                            dbc.Col([
+                                html.H5("📊 Scenario Results", className="mb-0"),
+                                html.Small("Ranked by overall performance (lower cost + better fairness)", className="text-muted")
+                            ], width=8),
+                            dbc.Col([
+                                dbc.ButtonGroup([
+                                    dbc.Button([
+                                        fa_icon("refresh", "me-2"), 
+                                        "Refresh"
+                                    ], id="refresh-results-btn", color="success", size="sm", outline=True),
+                                    dbc.Button([
+                                        fa_icon("info-circle", "me-2"), 
+                                        "Help"
+                                    ], id={"type": "collapse-toggle", "id": "results-help"}, color="info", size="sm", outline=True)
+                                ])
+                            ], width=4, className="text-end")
+                        ])
+                    ]),
+                    dbc.CardBody([
+                        # Enhanced Help collapse
+                        dbc.Collapse([
+                            dbc.Card([
+                                dbc.CardBody([
+                                    html.H6([
+                                        fa_icon("question-circle", "me-2 text-info"),
+                                        "Understanding the Results"
+                                    ], className="mb-3"),
+                                    dbc.Row([
+                                        dbc.Col([
+                                            html.Div([
+                                                html.H6("📊 Key Metrics", className="text-primary mb-2"),
+                                                html.Ul([
+                                                    html.Li([html.Strong("Rank:"), " Best scenarios ranked #1, #2, #3..."]),
+                                                    html.Li([html.Strong("Total Cost:"), " Average electricity cost per building (€)"]),
+                                                    html.Li([html.Strong("Fairness:"), " Cost equality across buildings (lower = more fair)"])
+                                                ], className="small")
+                                            ])
+                                        ], width=6),
+                                        dbc.Col([
+                                            html.Div([
+                                                html.H6("🎯 Performance", className="text-success mb-2"),
+                                                html.Ul([
+                                                    html.Li([html.Strong("P2P Trading:"), " Energy sharing enabled/disabled"]),
+                                                    html.Li([html.Strong("Savings:"), " Cost reduction vs baseline"]),
+                                                    html.Li([html.Strong("Performance:"), " Combined score (★★★★★)"])
+                                                ], className="small")
+                                            ])
+                                        ], width=6)
+                                    ]),
+                                    dbc.Alert([
+                                        fa_icon("lightbulb", "me-2"),
+                                        "Green rows indicate P2P trading scenarios with community energy sharing benefits."
+                                    ], color="success", className="small mt-3 mb-0")
+                                ])
+                            ], className="border-0 bg-light")
+                        ], id={"type": "collapse", "id": "results-help"}, is_open=False),
                     
-                    # Results filter section
-                    dbc.Row([
-                        dbc.Col([
-                            html.Label("Filter Results:", className="small fw-bold mb-2"),
-                            dcc.Dropdown(
-                                id="results-filter",
-                                options=[
-                                    {"label": "📊 All Scenarios (Both P2P & Non-P2P)", "value": "all"},
-                                    {"label": "✅ P2P Trading Only", "value": "p2p_only"},
-                                    {"label": "❌ No P2P Trading", "value": "no_p2p"},
-                                    {"label": "🔄 P2P vs Non-P2P Comparison", "value": "comparison"}
-                                ],
-                                value="all",
-                                clearable=False,
-                                className="mb-3"
-                            )
-                        ], width=6),
-                        dbc.Col([
-                            html.Div([
-                                html.Small("Showing scenarios from your 15 base configurations", className="text-muted"),
-                                html.Br(),
-                                html.Small("Each tested with and without P2P trading", className="text-muted")
-                            ], className="mt-4")
-                        ], width=6)
-                    ], className="mb-3"),
+                        # Results filter section
+                        dbc.Row([
+                            dbc.Col([
+                                html.Label("Filter Results:", className="small fw-bold mb-2"),
+                                dcc.Dropdown(
+                                    id="results-filter",
+                                    options=[
+                                        {"label": "📊 All Scenarios (Both P2P & Non-P2P)", "value": "all"},
+                                        {"label": "✅ P2P Trading Only", "value": "p2p_only"},
+                                        {"label": "❌ No P2P Trading", "value": "no_p2p"},
+                                        {"label": "🔄 P2P vs Non-P2P Comparison", "value": "comparison"}
+                                    ],
+                                    value="all",
+                                    clearable=False,
+                                    className="mb-3"
+                                ),
+                                # Debounced copy of the dropdown value that the table callbacks listen to
+                                dcc.Store(id="results-filter-debounced", data="all")
+                            ], width=6),
+                            dbc.Col([
+                                html.Div([
+                                    html.Small("Showing scenarios from your 15 base configurations", className="text-muted"),
+                                    html.Br(),
+                                    html.Small("Each tested with and without P2P trading", className="text-muted")
+                                ], className="mt-4")
+                            ], width=6)
+                        ], className="mb-3"),
                     
-                    # Results content with conditional rendering
-                    html.Div(id="results-table-container", children=[
-                        dash_table.DataTable(
-                            id="results-table",
-                            columns=[
-                                {"name": "🏆 Rank", "id": "rank", "type": "numeric"},
-                                {"name": "📋 Scenario", "id": "scenario"},
-                                {"name": "💰 Total Cost (€)", "id": "cost", "type": "numeric", "format": {"specifier": ".2f"}},
-                                {"name": "⚖️ Fairness", "id": "fairness", "type": "numeric", "format": {"specifier": ".3f"}},
-                                {"name": "🔄 P2P Trading", "id": "p2p"},
-                                {"name": "📈 Savings (%)", "id": "savings", "type": "numeric", "format": {"specifier": ".1f"}},
-                                {"name": "⭐ Performance", "id": "performance"}
-                            ],
-                            data=[],
-                            sort_action="native",
-                            filter_action="native",
-                            style_cell={
-                                'textAlign': 'left', 
-                                'fontSize': '14px',
-                                'padding': '12px',
-                                'whiteSpace': 'normal',
-                                'height': 'auto',
-                                'fontFamily': 'system-ui, -apple-system, sans-serif'
-                            },
-                            style_header={
-                                'backgroundColor': '#f8f9fa',
-                                'fontWeight': 'bold',
-                                'fontSize': '14px',
-                                'color': '#495057',
-                                'border': '1px solid #dee2e6',
-                                'textAlign': 'center'
-                            },
-                            style_data={
-                                'border': '1px solid #dee2e6',
-                                'backgroundColor': '#ffffff'
-                            },
-                            style_data_conditional=[
-                                {
-                                    'if': {'filter_query': '{p2p} = ✅ Yes'},
-                                    'backgroundColor': '#e8f5e8',
-                                    'border': '1px solid #28a745'
-                                },
-                                {
-                                    'if': {'column_id': 'rank', 'filter_query': '{rank} = 1'},
-                                    'backgroundColor': '#ffd700',
-                                    'fontWeight': 'bold',
-                                    'color': '#8B4513'
-                                },
-                                {
-                                    'if': {'column_id': 'rank', 'filter_query': '{rank} = 2'},
-                                    'backgroundColor': '#C0C0C0',
-                                    'fontWeight': 'bold',
-                                    'color': '#444444'
-                                },
-                                {
-                                    'if': {'column_id': 'rank', 'filter_query': '{rank} = 3'},
-                                    'backgroundColor': '#CD7F32',
-                                    'fontWeight': 'bold',
-                                    'color': '#ffffff'
-                                }
-                            ],
-                            style_cell_conditional=[
-                                {'if': {'column_id': 'rank'}, 'width': '80px', 'textAlign': 'center'},
-                                {'if': {'column_id': 'scenario'}, 'width': '220px', 'textAlign': 'left'},
-                                {'if': {'column_id': 'cost'}, 'width': '140px', 'textAlign': 'right'},
-                                {'if': {'column_id': 'fairness'}, 'width': '120px', 'textAlign': 'right'},
-                                {'if': {'column_id': 'p2p'}, 'width': '120px', 'textAlign': 'center'},
-                                {'if': {'column_id': 'savings'}, 'width': '120px', 'textAlign': 'right'},
-                                {'if': {'column_id': 'performance'}, 'width': '150px', 'textAlign': 'center'}
-                            ],
-                            page_size=15,
-                            style_table={
-                                'overflowX': 'auto',
-                                'border': '1px solid #dee2e6',
-                                'borderRadius': '0.375rem',
-                                'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'
-                            }
-                        )
+                        # Results content with conditional rendering
+                        html.Div(id="results-table-container", children=_RESULTS_VIEW)
                     ])
                 ])
-            ])
-        ], width=8)
-    ])
-], fluid=True, className="py-4")
+            ], width=8)
+        ])
+    ], fluid=True, className="py-4")
 
 
-@app.callback(
+# Assign the built tree rather than the factory: the layout is static, and a
+# function layout makes Dash embed a second copy in every index page for
+# callback validation. Building it at import also lets a preloading server
+# (gunicorn --preload) share it with its workers.
+app.layout = build_layout()
+
+
+
+
+# Country presets are looked up in the browser from country-pricing-presets
+app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="update_country_pricing"),
     [Output("country-pricing-info", "children"),
      Output("off-peak-price", "value"),
      Output("on-peak-price", "value"),
@@ -1193,401 +1302,212 @@ app.layout = dbc.Container([
      Output("on-peak-price", "disabled"),
      Output("export-ratio", "disabled"),
      Output("community-spread", "disabled")],
-    [Input("country-selector", "value")]
+    [Input("country-selector", "data")],
+    [State("country-pricing-presets", "data")]
 )
-def update_country_pricing(country):
-    if not country or country not in COUNTRY_PRICES:
-        country = "italy"
-    
-    pricing = COUNTRY_PRICES[country]
-    is_custom = country == "custom"
-    
-    # Create pricing info display
-    info_card = dbc.Alert([
-        html.H6(f"{pricing['name']} Electricity Prices", className="mb-2"),
-        html.P(pricing['notes'], className="mb-2 small"),
-        html.Div([
-            dbc.Badge(f"Off-Peak: {pricing['off_peak']:.3f} {pricing['currency']}/kWh", color="success", className="me-2"),
-            dbc.Badge(f"On-Peak: {pricing['on_peak']:.3f} {pricing['currency']}/kWh", color="warning")
-        ])
-    ], color="info", className="small py-2")
-    
-    return (info_card,
-            pricing['off_peak'],
-            pricing['on_peak'], 
-            pricing['export_ratio'],
-            pricing['community_spread'],
-            not is_custom,  # disabled when not custom
-            not is_custom,
-            not is_custom,
-            not is_custom)
 
 
-# Tariff card selection callbacks
+# Tariff card selection (classNames are toggled clientside)
+app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="select_tariff"),
+    [Output("tariff-type", "data"),
+     Output({"type": "tariff-card", "id": ALL}, "className")],
+    [Input({"type": "tariff-card", "id": ALL}, "n_clicks")],
+    prevent_initial_call=True
+)
+
+
+# Tariff id -> (display name, description)
+TARIFF_INFO = {
+    "tou": ("Time-of-Use (ToU)", "Fixed pricing periods with predictable peak/off-peak rates"),
+    "cpp": ("Critical Peak Pricing (CPP)", "Extreme price spikes during critical system events"),
+    "rtp": ("Real-Time Pricing (RTP)", "Variable hourly rates following market patterns"),
+    "edr": ("Emergency Demand Response (EDR)", "Extreme crisis pricing for grid emergency situations")
+}
+
+# Tariff id -> two detail columns of (heading, heading class, bullets)
+_TARIFF_DETAIL_COLUMNS = {
+    "tou": [
+        ("📅 Time Periods", "text-primary", ["Off-peak: 00:00-07:00, 23:00-24:00",
+                                             "Mid-peak: 07:00-17:00, 20:00-23:00",
+                                             "On-peak: 17:00-20:00"]),
+        ("💡 Use Cases", "text-info", ["Residential prosumer communities",
+                                       "Battery storage optimization",
+                                       "Predictable load shifting"])
+    ],
+    "cpp": [
+        ("⚠️ Event Structure", "text-warning", ["Base: ToU pricing structure",
+                                                "Critical events: Tue-Thu, 5-8 PM",
+                                                "Critical price: Up to €0.50/kWh"]),
+        ("🎯 Applications", "text-info", ["Emergency demand response",
+                                          "Grid stability testing",
+                                          "High-flexibility systems"])
+    ],
+    "rtp": [
+        ("📈 Price Dynamics", "text-info", ["Hourly price updates",
+                                            "Market-driven volatility",
+                                            "Daily pattern variations"]),
+        ("⚡ Best For", "text-success", ["Smart home automation",
+                                        "Flexible industrial loads",
+                                        "Advanced energy management"])
+    ],
+    "edr": [
+        ("🚨 Emergency Events", "text-danger", ["Base: ToU structure",
+                                               "Emergency: €1.00/kWh",
+                                               "Probability: 5% per day"]),
+        ("🔬 Research Value", "text-primary", ["Extreme scenario testing",
+                                               "System resilience analysis",
+                                               "Crisis response modeling"])
+    ]
+}
+
+
+def create_tariff_details(tariff_type):
+    """Two-column details row shown under the selected tariff"""
+    return dbc.Row([
+        dbc.Col([
+            html.H6(heading, className=heading_class),
+            html.Ul([html.Li(bullet) for bullet in bullets], className="small")
+        ], width=6)
+        for heading, heading_class, bullets in _TARIFF_DETAIL_COLUMNS[tariff_type]
+    ])
+
+
+# Only four tariffs exist, so their detail trees are built once at import
+TARIFF_DETAILS = {tariff_type: create_tariff_details(tariff_type) for tariff_type in _TARIFF_DETAIL_COLUMNS}
+
+
 @app.callback(
-    [Output("tariff-type", "value"),
-     Output("selected-tariff-display", "children"),
+    [Output("selected-tariff-display", "children"),
      Output("selected-tariff-description", "children"),
-     Output("tariff-details", "children"),
-     Output("tou-card", "className"),
-     Output("cpp-card", "className"),
-     Output("rtp-card", "className"),
-     Output("edr-card", "className")],
-    [Input("tou-card", "n_clicks"),
-     Input("cpp-card", "n_clicks"),
-     Input("rtp-card", "n_clicks"),
-     Input("edr-card", "n_clicks")],
+     Output("tariff-details", "children")],
+    [Input("tariff-type", "data")],
     prevent_initial_call=True
 )
-def update_tariff_selection(tou_clicks, cpp_clicks, rtp_clicks, edr_clicks):
-    def create_tariff_details(tariff_type):
-        if tariff_type == "tou":
-            return dbc.Row([
-                dbc.Col([
-                    html.H6("📅 Time Periods", className="text-primary"),
-                    html.Ul([
-                        html.Li("Off-peak: 00:00-07:00, 23:00-24:00"),
-                        html.Li("Mid-peak: 07:00-17:00, 20:00-23:00"), 
-                        html.Li("On-peak: 17:00-20:00")
-                    ], className="small")
-                ], width=6),
-                dbc.Col([
-                    html.H6("💡 Use Cases", className="text-info"),
-                    html.Ul([
-                        html.Li("Residential prosumer communities"),
-                        html.Li("Battery storage optimization"),
-                        html.Li("Predictable load shifting")
-                    ], className="small")
-                ], width=6)
-            ])
-        elif tariff_type == "cpp":
-            return dbc.Row([
-                dbc.Col([
-                    html.H6("⚠️ Event Structure", className="text-warning"),
-                    html.Ul([
-                        html.Li("Base: ToU pricing structure"),
-                        html.Li("Critical events: Tue-Thu, 5-8 PM"),
-                        html.Li("Critical price: Up to €0.50/kWh")
-                    ], className="small")
-                ], width=6),
-                dbc.Col([
-                    html.H6("🎯 Applications", className="text-info"),
-                    html.Ul([
-                        html.Li("Emergency demand response"),
-                        html.Li("Grid stability testing"),
-                        html.Li("High-flexibility systems")
-                    ], className="small")
-                ], width=6)
-            ])
-        elif tariff_type == "rtp":
-            return dbc.Row([
-                dbc.Col([
-                    html.H6("📈 Price Dynamics", className="text-info"),
-                    html.Ul([
-                        html.Li("Hourly price updates"),
-                        html.Li("Market-driven volatility"),
-                        html.Li("Daily pattern variations")
-                    ], className="small")
-                ], width=6),
-                dbc.Col([
-                    html.H6("⚡ Best For", className="text-success"),
-                    html.Ul([
-                        html.Li("Smart home automation"),
-                        html.Li("Flexible industrial loads"),
-                        html.Li("Advanced energy management")
-                    ], className="small")
-                ], width=6)
-            ])
-        elif tariff_type == "edr":
-            return dbc.Row([
-                dbc.Col([
-                    html.H6("🚨 Emergency Events", className="text-danger"),
-                    html.Ul([
-                        html.Li("Base: ToU structure"),
-                        html.Li("Emergency: €1.00/kWh"),
-                        html.Li("Probability: 5% per day")
-                    ], className="small")
-                ], width=6),
-                dbc.Col([
-                    html.H6("🔬 Research Value", className="text-primary"),
-                    html.Ul([
-                        html.Li("Extreme scenario testing"),
-                        html.Li("System resilience analysis"),
-                        html.Li("Crisis response modeling")
-                    ], className="small")
-                ], width=6)
-            ])
-    
-    # Check which card was clicked
-    ctx = callback_context
-    selected_tariff = "tou"  # Default
-    
-    if ctx.triggered:
-        trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        print(f"DEBUG: Card clicked - {trigger_id}")
-        
-        if trigger_id == "tou-card" and tou_clicks:
-            selected_tariff = "tou"
-        elif trigger_id == "cpp-card" and cpp_clicks:
-            selected_tariff = "cpp"
-        elif trigger_id == "rtp-card" and rtp_clicks:
-            selected_tariff = "rtp"
-        elif trigger_id == "edr-card" and edr_clicks:
-            selected_tariff = "edr"
-    
-    # Define tariff information
-    tariff_info = {
-        "tou": ("Time-of-Use (ToU)", "Fixed pricing periods with predictable peak/off-peak rates"),
-        "cpp": ("Critical Peak Pricing (CPP)", "Extreme price spikes during critical system events"),
-        "rtp": ("Real-Time Pricing (RTP)", "Variable hourly rates following market patterns"),
-        "edr": ("Emergency Demand Response (EDR)", "Extreme crisis pricing for grid emergency situations")
-    }
-    
-    display_name, description = tariff_info[selected_tariff]
-    details = create_tariff_details(selected_tariff)
+def update_tariff_selection(selected_tariff):
+    if selected_tariff not in TARIFF_INFO:
+        selected_tariff = "tou"
     
-    # Set button classes
-    tou_class = "tariff-card h-100 w-100 selected p-3" if selected_tariff == "tou" else "tariff-card h-100 w-100 p-3"
-    cpp_class = "tariff-card h-100 w-100 selected p-3" if selected_tariff == "cpp" else "tariff-card h-100 w-100 p-3"
-    rtp_class = "tariff-card h-100 w-100 selected p-3" if selected_tariff == "rtp" else "tariff-card h-100 w-100 p-3"
-    edr_class = "tariff-card h-100 w-100 selected p-3" if selected_tariff == "edr" else "tariff-card h-100 w-100 p-3"
-    
-    return selected_tariff, display_name, description, details, tou_class, cpp_class, rtp_class, edr_class
+    display_name, description = TARIFF_INFO[selected_tariff]
+    return display_name, description, TARIFF_DETAILS[selected_tariff]
 
 
-# Analysis options selection callback
-@app.callback(
+# Analysis options selection (classNames are toggled clientside)
+app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="toggle_options"),
     [Output("options", "value"),
-     Output("p2p-option", "className"),
-     Output("surrogate-option", "className"),
-     Output("sensitivity-option", "className")],
-    [Input("p2p-option", "n_clicks"),
-     Input("surrogate-option", "n_clicks"),
-     Input("sensitivity-option", "n_clicks")],
+     Output({"type": "option-card", "id": ALL}, "className")],
+    [Input({"type": "option-card", "id": ALL}, "n_clicks")],
     [State("options", "value")],
     prevent_initial_call=True
 )
-def update_analysis_options(p2p_clicks, surrogate_clicks, sensitivity_clicks, current_options):
-    ctx = callback_context
-    if not ctx.triggered:
-        # Default state
-        selected_options = ["p2p"]
-    else:
-        trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        selected_options = current_options.copy() if current_options else []
-        
-        if trigger_id == "p2p-option":
-            if "p2p" in selected_options:
-                selected_options.remove("p2p")
-            else:
-                selected_options.append("p2p")
-        elif trigger_id == "surrogate-option":
-            if "surrogate" in selected_options:
-                selected_options.remove("surrogate")
-            else:
-                selected_options.append("surrogate")
-        elif trigger_id == "sensitivity-option":
-            if "sensitivity" in selected_options:
-                selected_options.remove("sensitivity")
-            else:
-                selected_options.append("sensitivity")
-    
-    # Set button classes based on selection
-    p2p_class = "option-card h-100 w-100 p-3 selected" if "p2p" in selected_options else "option-card h-100 w-100 p-3"
-    surrogate_class = "option-card h-100 w-100 p-3 selected" if "surrogate" in selected_options else "option-card h-100 w-100 p-3"
-    sensitivity_class = "option-card h-100 w-100 p-3 selected" if "sensitivity" in selected_options else "option-card h-100 w-100 p-3"
-    
-    return selected_options, p2p_class, surrogate_class, sensitivity_class
 
 
-# Country selection callback
-@app.callback(
-    [Output("country-selector", "value"),
-     Output("italy-country", "className"),
-     Output("germany-country", "className"),
-     Output("spain-country", "className"),
-     Output("sweden-country", "className"),
-     Output("france-country", "className"),
-     Output("custom-country", "className")],
-    [Input("italy-country", "n_clicks"),
-     Input("germany-country", "n_clicks"),
-     Input("spain-country", "n_clicks"),
-     Input("sweden-country", "n_clicks"),
-     Input("france-country", "n_clicks"),
-     Input("custom-country", "n_clicks")],
+# Country selection (classNames are toggled clientside)
+app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="select_country"),
+    [Output("country-selector", "data"),
+     Output({"type": "country-card", "id": ALL}, "className")],
+    [Input({"type": "country-card", "id": ALL}, "n_clicks")],
     prevent_initial_call=True
 )
-def update_country_selection(italy_clicks, germany_clicks, spain_clicks, sweden_clicks, france_clicks, custom_clicks):
-    ctx = callback_context
-    selected_country = "italy"  # Default
-    
-    if ctx.triggered:
-        trigger_id = ctx.triggered[0]['prop_id'].split('.')[0]
-        
-        country_map = {
-            "italy-country": "italy",
-            "germany-country": "germany", 
-            "spain-country": "spain",
-            "sweden-country": "sweden",
-            "france-country": "france",
-            "custom-country": "custom"
-        }
-        
-        selected_country = country_map.get(trigger_id, "italy")
-    
-    # Set button classes
-    italy_class = "country-card w-100 p-2 selected" if selected_country == "italy" else "country-card w-100 p-2"
-    germany_class = "country-card w-100 p-2 selected" if selected_country == "germany" else "country-card w-100 p-2"
-    spain_class = "country-card w-100 p-2 selected" if selected_country == "spain" else "country-card w-100 p-2"
-    sweden_class = "country-card w-100 p-2 selected" if selected_country == "sweden" else "country-card w-100 p-2"
-    france_class = "country-card w-100 p-2 selected" if selected_country == "france" else "country-card w-100 p-2"
-    custom_class = "country-card w-100 p-2 selected" if selected_country == "custom" else "country-card w-100 p-2"
-    
-    return selected_country, italy_class, germany_class, spain_class, sweden_class, france_class, custom_class
 
 
-@app.callback(
+# Tariff summary line is pure string formatting, so it runs in the browser
+app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="update_tariff_info"),
     Output("selected-tariffs-info", "children"),
-    [Input("tariff-type", "value"),
-     Input("country-selector", "value"),
+    [Input("tariff-type", "data"),
+     Input("country-selector", "data"),
      Input("off-peak-price", "value"),
      Input("on-peak-price", "value")]
 )
-def update_tariff_info(tariff_type, country, off_peak, on_peak):
-    if not tariff_type:
-        return "No tariff selected"
-    
-    tariff_names = {
-        'tou': 'Time-of-Use',
-        'cpp': 'Critical Peak Pricing', 
-        'rtp': 'Real-Time Pricing',
-        'edr': 'Emergency Demand Response'
-    }
-    
-    country_names = {
-        'italy': '🇮🇹 Italy',
-        'germany': '🇩🇪 Germany',
-        'spain': '🇪🇸 Spain', 
-        'sweden': '🇸🇪 Sweden',
-        'france': '🇫🇷 France',
-        'custom': '🔧 Custom'
-    }
-    
-    tariff_name = tariff_names.get(tariff_type, tariff_type)
-    country_name = country_names.get(country, country)
-    price_info = f" | {off_peak or 0.08:.3f}-{on_peak or 0.25:.3f} €/kWh" if off_peak and on_peak else ""
-    
-    return f"{tariff_name} - {country_name}{price_info}"
-
 
-@app.callback(
-    Output("sources-info", "is_open"),
-    [Input("sources-toggle", "n_clicks")],
-    [State("sources-info", "is_open")]
-)
-def toggle_sources_info(n_clicks, is_open):
-    if n_clicks:
-        return not is_open
-    return is_open
 
-
-@app.callback(
-    Output("upload-help", "is_open"),
-    [Input("help-toggle", "n_clicks")],
-    [State("upload-help", "is_open")]
-)
-def toggle_upload_help(n_clicks, is_open):
-    if n_clicks:
-        return not is_open
-    return is_open
-
-
-@app.callback(
-    Output("results-help", "is_open"),
-    [Input("results-help-toggle", "n_clicks")],
-    [State("results-help", "is_open")]
+# Collapse toggles only flip a boolean, so they run in the browser
+app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="toggle_collapse"),
+    Output({"type": "collapse", "id": MATCH}, "is_open"),
+    [Input({"type": "collapse-toggle", "id": MATCH}, "n_clicks")],
+    [State({"type": "collapse", "id": MATCH}, "is_open")],
+    prevent_initial_call=True
 )
-def toggle_results_help(n_clicks, is_open):
-    if n_clicks:
-        return not is_open
-    return is_open
 
 
-@app.callback(
-    Output("dashboard-guide", "is_open"),
-    [Input("dashboard-guide-toggle", "n_clicks")],
-    [State("dashboard-guide", "is_open")]
-)
-def toggle_dashboard_guide(n_clicks, is_open):
-    if n_clicks:
-        return not is_open
-    return is_open
+# Filename keywords that classify an upload as load or PV profiles
+_LOAD_FILE_KEYWORDS = ('load', 'demand')
+_PV_FILE_KEYWORDS = ('pv', 'solar', 'generation')
 
 
-@app.callback(
-    Output('upload-status', 'children'),
-    [Input('upload-data', 'contents')],
-    [State('upload-data', 'filename')]
-)
-def update_upload_status(contents, filename):
-    if contents is None:
-        return html.Div([
-            dbc.Card([
-                dbc.CardBody([
-                    html.Div([
-                        html.I(className="fas fa-cloud-upload-alt text-muted", style={"fontSize": "24px"}),
-                        html.P("Ready to upload files", className="text-muted mb-0 mt-2")
-                    ], className="text-center py-2")
-                ])
-            ], className="border-light bg-light")
-        ])
+def ingest_uploaded_dataframe(df, filename, message):
+    """Save a parsed upload into the framework
     
+    Returns ((type, icon, color) badge, None), or (None, error) if the save failed.
+    """
     global uploaded_data
     
-    df, message = parse_uploaded_file(contents, filename)
+    # Determine file type and create appropriate feedback
+    name = filename.lower()
+    if any(keyword in name for keyword in _LOAD_FILE_KEYWORDS):
+        data_type, status = "load_profiles", f"Load profiles: {message}"
+        badge = ("Load Profiles", "fas fa-chart-line", "success")
+    elif any(keyword in name for keyword in _PV_FILE_KEYWORDS):
+        data_type, status = "pv_profiles", f"PV profiles: {message}"
+        badge = ("PV Generation", "fas fa-solar-panel", "success")
+    else:
+        # Default to load profiles if unclear
+        data_type, status = "load_profiles", f"Data (assumed load profiles): {message}"
+        badge = ("Load Profiles (Auto-detected)", "fas fa-info-circle", "info")
+    
+    success, filepath = save_uploaded_data_to_framework(df, data_type)
+    if not success:
+        return None, f"Could not save {filename}: {filepath}"
     
+    uploaded_data[data_type] = df
+    uploaded_data["status"] = status
+    return badge, None
+
+
+def process_upload(contents, filename):
+    """Parse and ingest an upload as (df, message, badge); df is None on failure"""
+    df, message = parse_uploaded_file(contents, filename)
+    if df is None:
+        return None, message, None
+    badge, error = ingest_uploaded_dataframe(df, filename, message)
+    if badge is None:
+        return None, error, None
+    return df, message, badge
+
+
+# Background upload jobs: job id -> {"result": None | (df, message, badge)}
+upload_jobs = {}
+upload_jobs_lock = threading.Lock()
+
+
+def run_upload_job(job_id, contents, filename):
+    """Parse and ingest an upload off the callback thread"""
+    # Every job must publish a result, or the upload poll never stops
+    try:
+        result = process_upload(contents, filename)
+    except Exception as e:
+        result = (None, f"Error processing {filename}: {e}", None)
+    with upload_jobs_lock:
+        upload_jobs[job_id] = {"result": result}
+
+
+def render_upload_result(df, message, filename, file_size, badge):
+    """Build the upload-status card for a parsed upload (or its error)"""
     if df is not None:
+        file_type, file_icon, file_color = badge
+        
         # Create enhanced success feedback with file preview
-        file_size = len(contents) if contents else 0
         file_size_str = f"{file_size / 1024:.1f} KB" if file_size < 1024*1024 else f"{file_size / (1024*1024):.1f} MB"
         
-        # Data statistics
-        data_stats = {
-            'rows': df.shape[0],
-            'columns': df.shape[1],
-            'total_values': df.shape[0] * df.shape[1],
-            'missing_values': df.isnull().sum().sum() if hasattr(df, 'isnull') else 0,
-            'numeric_columns': len([col for col in df.columns if df[col].dtype in ['int64', 'float64']]) if hasattr(df, 'columns') else df.shape[1]
-        }
-        
-        # Determine file type and create appropriate feedback
-        if 'load' in filename.lower() or 'demand' in filename.lower():
-            success, filepath = save_uploaded_data_to_framework(df, "load_profiles")
-            if success:
-                uploaded_data["load_profiles"] = df
-                uploaded_data["status"] = f"Load profiles: {message}"
-                file_type = "Load Profiles"
-                file_icon = "fas fa-chart-line"
-                file_color = "success"
-        
-        elif 'pv' in filename.lower() or 'solar' in filename.lower() or 'generation' in filename.lower():
-            success, filepath = save_uploaded_data_to_framework(df, "pv_profiles")
-            if success:
-                uploaded_data["pv_profiles"] = df
-                uploaded_data["status"] = f"PV profiles: {message}"
-                file_type = "PV Generation"
-                file_icon = "fas fa-solar-panel"
-                file_color = "success"
-        
-        else:
-            # Default to load profiles if unclear
-            success, filepath = save_uploaded_data_to_framework(df, "load_profiles")
-            if success:
-                uploaded_data["load_profiles"] = df
-                uploaded_data["status"] = f"Data (assumed load profiles): {message}"
-                file_type = "Load Profiles (Auto-detected)"
-                file_icon = "fas fa-info-circle"
-                file_color = "info"
+        # Data statistics (shape and dtype metadata only; no pass over the values)
+        rows, columns = df.shape
+        total_cells = rows * columns
+        # Uploads are downcast to float32, so match any numeric dtype
+        numeric_columns = df.select_dtypes(include='number').shape[1]
         
         # Create enhanced success card with file preview
         return html.Div([
@@ -1607,22 +1527,19 @@ def update_upload_status(contents, filename):
                         ], width=4, className="text-end")
                     ], className="mb-3"),
                     
-                    # Success progress bar
-                    dbc.Progress(value=100, color=file_color, className="mb-3", style={"height": "6px"}),
-                    
                     # Data preview stats
                     dbc.Row([
                         dbc.Col([
                             html.Div([
-                                html.I(className="fas fa-table me-2 text-primary"),
-                                html.Strong(f"{data_stats['rows']:,}"),
+                                fa_icon("table", "me-2 text-primary"),
+                                html.Strong(f"{rows:,}"),
                                 html.Small(" time steps", className="text-muted")
                             ], className="file-item file-success")
                         ], width=6),
                         dbc.Col([
                             html.Div([
-                                html.I(className="fas fa-building me-2 text-primary"),
-                                html.Strong(f"{data_stats['columns']:,}"),
+                                fa_icon("building", "me-2 text-primary"),
+                                html.Strong(f"{columns:,}"),
                                 html.Small(" buildings", className="text-muted")
                             ], className="file-item file-success")
                         ], width=6)
@@ -1632,14 +1549,14 @@ def update_upload_status(contents, filename):
                     dbc.Row([
                         dbc.Col([
                             html.Small([
-                                html.I(className="fas fa-check-circle text-success me-1"),
-                                f"{data_stats['numeric_columns']} numeric columns"
+                                fa_icon("check-circle", "text-success me-1"),
+                                f"{numeric_columns} numeric columns"
                             ], className="text-muted")
                         ], width=6),
                         dbc.Col([
                             html.Small([
-                                html.I(className="fas fa-database text-info me-1"),
-                                f"{data_stats['total_values']:,} data points"
+                                fa_icon("database", "text-info me-1"),
+                                f"{total_cells:,} data points"
                             ], className="text-muted")
                         ], width=6)
                     ])
@@ -1647,104 +1564,354 @@ def update_upload_status(contents, filename):
             ], className="border-success bg-light", style={"borderLeft": "4px solid #28a745"})
         ])
     
-    # Enhanced error feedback
-    return html.Div([
-        dbc.Card([
-            dbc.CardBody([
-                dbc.Row([
-                    dbc.Col([
-                        html.Div([
-                            html.I(className="fas fa-exclamation-triangle me-2", style={"fontSize": "20px"}),
-                            html.Strong(filename if filename else "Upload Error"),
-                            dbc.Badge("Failed", color="danger", className="ms-2")
-                        ])
-                    ], width=12)
-                ], className="mb-3"),
-                
-                # Error progress bar
-                dbc.Progress(value=100, color="danger", className="mb-3", style={"height": "6px"}),
-                
-                # Error message
-                html.Div([
-                    html.I(className="fas fa-times-circle text-danger me-2"),
-                    html.Span(message, className="text-danger"),
-                ], className="file-item file-error"),
-                
-                # Help text
-                html.Small([
-                    html.I(className="fas fa-lightbulb me-1"),
-                    "Ensure your file is in CSV, Excel, or JSON format with numeric data"
-                ], className="text-muted mt-2")
-            ])
-        ], className="border-danger bg-light", style={"borderLeft": "4px solid #dc3545"})
-    ])
+    # Enhanced error feedback
+    return html.Div([
+        dbc.Card([
+            dbc.CardBody([
+                dbc.Row([
+                    dbc.Col([
+                        html.Div([
+                            html.I(className="fas fa-exclamation-triangle me-2", style={"fontSize": "20px"}),
+                            html.Strong(filename if filename else "Upload Error"),
+                            dbc.Badge("Failed", color="danger", className="ms-2")
+                        ])
+                    ], width=12)
+                ], className="mb-3"),
+                
+                # Error message
+                html.Div([
+                    fa_icon("times-circle", "text-danger me-2"),
+                    html.Span(message, className="text-danger"),
+                ], className="file-item file-error"),
+                
+                # Help text
+                html.Small([
+                    fa_icon("lightbulb", "me-1"),
+                    "Ensure your file is in CSV, Excel, or JSON format with numeric data"
+                ], className="text-muted mt-2")
+            ])
+        ], className="border-danger bg-light", style={"borderLeft": "4px solid #dc3545"})
+    ])
+
+
+# Malformed files are rejected in the browser before their contents reach the server
+app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="validate_upload"),
+    [Output('upload-validated', 'data'),
+     Output('upload-status', 'children', allow_duplicate=True)],
+    [Input('upload-data', 'contents')],
+    [State('upload-data', 'filename')],
+    prevent_initial_call=True
+)
+
+
+@app.callback(
+    [Output('upload-status', 'children'),
+     Output('upload-job', 'data'),
+     Output('upload-interval', 'disabled')],
+    [Input('upload-validated', 'data'),
+     Input('upload-interval', 'n_intervals')],
+    [State('upload-data', 'contents'),
+     State('upload-data', 'filename'),
+     State('upload-job', 'data')]
+)
+def update_upload_status(validated, n_intervals, contents, filename, job):
+    trigger_id = callback_context.triggered_id
+    
+    if trigger_id == 'upload-interval':
+        if not job:
+            return dash.no_update, None, True
+        with upload_jobs_lock:
+            job_state = upload_jobs.get(job['job_id'])
+            if job_state is None or job_state['result'] is None:
+                return dash.no_update, dash.no_update, dash.no_update
+            del upload_jobs[job['job_id']]
+        df, message, badge = job_state['result']
+        return render_upload_result(df, message, job['filename'], job['file_size'], badge), None, True
+    
+    if contents is None:
+        return html.Div([
+            dbc.Card([
+                dbc.CardBody([
+                    html.Div([
+                        html.I(className="fas fa-cloud-upload-alt text-muted", style={"fontSize": "24px"}),
+                        html.P("Ready to upload files", className="text-muted mb-0 mt-2")
+                    ], className="text-center py-2")
+                ])
+            ], className="border-light bg-light")
+        ]), None, True
+    
+    file_size = decoded_upload_size(contents)
+    
+    # Excel parsing is slow and pure Python; hand it to a worker thread
+    if filename.endswith(('.xlsx', '.xls')):
+        job_id = uuid.uuid4().hex
+        with upload_jobs_lock:
+            upload_jobs[job_id] = {"result": None}
+        threading.Thread(target=run_upload_job, args=(job_id, contents, filename), daemon=True).start()
+        processing = html.Div([
+            dbc.Card([
+                dbc.CardBody([
+                    html.Div([
+                        dbc.Spinner(size="sm", color="primary", spinner_class_name="me-2"),
+                        html.Strong(filename),
+                        html.Small(" Processing spreadsheet...", className="text-muted ms-2")
+                    ])
+                ])
+            ], className="border-light bg-light")
+        ])
+        return processing, {'job_id': job_id, 'filename': filename, 'file_size': file_size}, False
+    
+    df, message, badge = process_upload(contents, filename)
+    return render_upload_result(df, message, filename, file_size, badge), None, True
+
+
+# Finished runs are pickled here, keyed by a hash of their config. The files
+# are shared by every server process and expire after SIMULATION_CACHE_TTL seconds.
+# The directory is anchored to the project root, since the launcher chdirs into web/
+SIMULATION_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "cache" / "simulations"
+SIMULATION_CACHE_TTL = 3600
+# Part of every cache key; bump it whenever the simulation code or the shape of
+# its results changes, so entries written by older code are never replayed
+SIMULATION_CACHE_VERSION = 1
+
+
+def simulation_config_key(config):
+    """Stable SHA-256 key for a simulation config dict and the cache version"""
+    payload = {"version": SIMULATION_CACHE_VERSION, "config": config}
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY)).hexdigest()
+
+
+def load_cached_simulation(config_key):
+    """Return the pickled results for config_key, or None on a miss or expiry"""
+    path = SIMULATION_CACHE_DIR / f"{config_key}.pkl"
+    try:
+        if time.time() - path.stat().st_mtime > SIMULATION_CACHE_TTL:
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # A truncated file or one pickled against classes that have since changed;
+        # drop it so the next identical run recomputes and rewrites it
+        logger.warning("Discarding unreadable simulation cache entry %s: %s", path.name, e)
+        path.unlink(missing_ok=True)
+        return None
+
+
+def store_cached_simulation(config_key, results):
+    """Pickle results for config_key (write-then-rename, so readers never see partial files)"""
+    SIMULATION_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = SIMULATION_CACHE_DIR / f"{config_key}.pkl"
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+# One simulation at a time; Stop sets the event, which is checked between stages
+SIM_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sim")
+sim_future = None
+sim_stop_event = threading.Event()
+# Held by Stop/Reset while setting the event and by the job while publishing its
+# results, so a Stop either lands before the publish (which is then skipped) or after it
+sim_publish_lock = threading.Lock()
+
+
+class SimulationStopped(Exception):
+    """Raised inside the simulation thread when the user presses Stop"""
+
+
+def _update_status(**changes):
+    """Publish a new simulation_status with the given fields changed"""
+    global simulation_status
+    # A stopped run keeps going until its next stage check; its progress must
+    # not overwrite the "Stopping..." status
+    if sim_stop_event.is_set():
+        return
+    simulation_status = {**simulation_status, **changes}
+
+
+def _publish_after_stop(final_status, clear_results):
+    """Done-callback for a stopped job: publish final_status once it has exited"""
+    def publish(future):
+        global simulation_status, simulation_results, simulation_run_id
+        if clear_results:
+            simulation_results = {}
+            simulation_run_id = None
+        simulation_status = final_status
+    return publish
+
+
+def _check_stopped():
+    if sim_stop_event.is_set():
+        raise SimulationStopped()
+
+
+def _publish_results(results, message):
+    """Publish a finished run, unless Stop was pressed since its last stage check"""
+    global simulation_status, simulation_results, simulation_run_id
+    with sim_publish_lock:
+        _check_stopped()
+        simulation_results = results
+        simulation_run_id = SIM_CACHE.put(results)
+        simulation_status = {"running": False, "progress": 100, "message": message}
+
+
+def compute_simulation_results(config):
+    """Run the orchestrator for config, reporting progress through simulation_status"""
+    orchestrator = get_orchestrator()
+    orchestrator.num_buildings = config['num_buildings']
+    orchestrator.time_horizon = config['time_horizon']
+    
+    # Check if we have uploaded data to use
+    if uploaded_data["load_profiles"] is not None:
+        _update_status(message="Using uploaded load profiles...")
+    
+    # Configure tariff manager with custom settings
+    orchestrator.tariff_manager.create_default_tariffs()
+    
+    # Update tariff prices based on user configuration
+    tariff_type = config['tariff_type']
+    country = config['country']
+    
+    if tariff_type == 'tou':
+        tou_tariff = orchestrator.tariff_manager.get_tariff('Time-of-Use')
+        if tou_tariff:
+            tou_tariff.off_peak_price = config['off_peak_price']
+            tou_tariff.on_peak_price = config['on_peak_price']
+    
+    orchestrator.initialize()
+    _check_stopped()
+    
+    country_name = COUNTRY_PRICES.get(country, {}).get('name', country)
+    _update_status(progress=30, message=f"Running {tariff_type.upper()} scenarios for {country_name}...")
+    
+    def scenario_progress(done, total):
+        _update_status(progress=30 + 40 * done // total)
+    
+    results = orchestrator.benchmark_tariff_scenarios(
+        num_scenarios=config['num_scenarios'],
+        include_p2p_comparison=config['include_p2p'],
+        progress_callback=scenario_progress
+    )
+    
+    _check_stopped()
+    
+    _update_status(progress=70, message="Processing results...")
+    
+    if config['train_surrogate']:
+        surrogate_results = orchestrator.train_surrogate_model()
+        results['surrogate'] = surrogate_results
+        _update_status(progress=85)
+        _check_stopped()
+    
+    if config['rapid_eval'] > 0:
+        rapid_results = orchestrator.rapid_scenario_evaluation(config['rapid_eval'])
+        results['rapid_evaluation'] = rapid_results
+        _update_status(progress=95)
+    
+    return results
 
 
 def run_simulation_thread(config):
-    global simulation_status, simulation_results
+    global simulation_status
     
     try:
-        simulation_status = {"running": True, "progress": 10, "message": "Initializing..."}
-        
-        orchestrator.num_buildings = config['num_buildings']
-        orchestrator.time_horizon = config['time_horizon']
-        
-        # Check if we have uploaded data to use
-        if uploaded_data["load_profiles"] is not None:
-            simulation_status["message"] = "Using uploaded load profiles..."
-        
-        # Configure tariff manager with custom settings
-        orchestrator.tariff_manager.create_default_tariffs()
-        
-        # Update tariff prices based on user configuration
-        tariff_type = config['tariff_type']
-        country = config['country']
+        _update_status(running=True, progress=10, message="Initializing...")
         
-        if tariff_type == 'tou':
-            tou_tariff = orchestrator.tariff_manager.get_tariff('Time-of-Use')
-            if tou_tariff:
-                tou_tariff.off_peak_price = config['off_peak_price']
-                tou_tariff.on_peak_price = config['on_peak_price']
+        # Identical configs replay from the disk cache; uploaded profiles bypass it
+        config_key = simulation_config_key(config)
+        use_cache = uploaded_data["load_profiles"] is None and uploaded_data["pv_profiles"] is None
+        cached_results = load_cached_simulation(config_key) if use_cache else None
+        if cached_results is not None:
+            _publish_results(cached_results, "Completed successfully! (cached)")
+            return
         
-        orchestrator.initialize()
+        results = compute_simulation_results(config)
+        _check_stopped()
         
-        simulation_status["progress"] = 30
-        country_name = COUNTRY_PRICES.get(country, {}).get('name', country)
-        simulation_status["message"] = f"Running {tariff_type.upper()} scenarios for {country_name}..."
-        
-        results = orchestrator.benchmark_tariff_scenarios(
-            num_scenarios=config['num_scenarios'],
-            include_p2p_comparison=config['include_p2p']
-        )
-        
-        simulation_status["progress"] = 70
-        simulation_status["message"] = "Processing results..."
-        
-        if config['train_surrogate']:
-            surrogate_results = orchestrator.train_surrogate_model()
-            results['surrogate'] = surrogate_results
-            simulation_status["progress"] = 85
-        
-        if config['rapid_eval'] > 0:
-            rapid_results = orchestrator.rapid_scenario_evaluation(config['rapid_eval'])
-            results['rapid_evaluation'] = rapid_results
-            simulation_status["progress"] = 95
+        if use_cache:
+            # The cache is an optimization; failing to write it must not lose the run
+            try:
+                store_cached_simulation(config_key, results)
+            except Exception as e:
+                logger.warning("Could not cache simulation results: %s", e)
         
-        simulation_results = results
-        simulation_status = {"running": False, "progress": 100, "message": "Completed successfully!"}
+        _publish_results(results, "Completed successfully!")
         
+    except SimulationStopped:
+        # The Stop handler publishes the stop once this job has exited
+        pass
     except Exception as e:
         simulation_status = {"running": False, "progress": 0, "message": f"Error: {str(e)}"}
 
 
-@app.callback(
+PROGRESS_STREAM_POLL = 0.25
+# A stream ends after PROGRESS_STREAM_MAX_AGE seconds and the browser's
+# EventSource reconnects, so a tab that was closed without a disconnect the
+# server could see frees its worker thread. Idle streams send a comment every
+# PROGRESS_STREAM_KEEPALIVE seconds, which fails fast on a dead connection
+PROGRESS_STREAM_MAX_AGE = 300
+PROGRESS_STREAM_KEEPALIVE = 15
+
+
+# Each open stream holds a server thread for its lifetime, so deployments need a
+# threaded or async worker (e.g. gunicorn --worker-class gthread or gevent);
+# with sync workers one open tab blocks a whole worker
+@app.server.route("/progress/stream")
+def simulation_progress_stream():
+    """Stream simulation status changes as Server-Sent Events until the run ends"""
+    def events():
+        last_status = None
+        started = last_sent = time.monotonic()
+        while True:
+            status = simulation_status
+            now = time.monotonic()
+            if status != last_status:
+                yield b"data: " + orjson.dumps(status) + b"\n\n"
+                last_status, last_sent = status, now
+            elif now - last_sent >= PROGRESS_STREAM_KEEPALIVE:
+                yield b": keepalive\n\n"
+                last_sent = now
+            if not status["running"] or now - started >= PROGRESS_STREAM_MAX_AGE:
+                return
+            time.sleep(PROGRESS_STREAM_POLL)
+    
+    return app.server.response_class(events(), mimetype="text/event-stream",
+                                     headers={"Cache-Control": "no-cache"})
+
+
+app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="stream_progress"),
+    Output("simulation-status", "data", allow_duplicate=True),
+    [Input("progress-stream", "data")],
+    prevent_initial_call=True
+)
+
+
+# Progress events only redraw the badge and progress bar, so they stay in the
+# browser; the server is called again only once the run has stopped
+app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="update_status_display"),
     [Output("status-display", "children"),
+     Output("status-display", "color"),
      Output("progress-bar", "value"),
      Output("start-btn", "disabled"),
      Output("stop-btn", "disabled"),
+     Output("simulation-finished", "data")],
+    [Input("simulation-status", "data")],
+    prevent_initial_call=True
+)
+
+
+@app.callback(
+    [Output("simulation-status", "data"),
      Output("download-btn", "disabled"),
-     Output("simulation-data", "data")],
-    [Input("interval-component", "n_intervals"),
+     Output("simulation-data", "data"),
+     Output("progress-stream", "data")],
+    [Input("simulation-finished", "data"),
      Input("start-btn", "n_clicks"),
      Input("stop-btn", "n_clicks"),
      Input("reset-btn", "n_clicks")],
@@ -1753,22 +1920,25 @@ def run_simulation_thread(config):
      State("num-scenarios", "value"),
      State("rapid-eval", "value"),
      State("options", "value"),
-     State("tariff-type", "value"),
-     State("country-selector", "value"),
+     State("tariff-type", "data"),
+     State("country-selector", "data"),
      State("off-peak-price", "value"),
      State("on-peak-price", "value"),
      State("export-ratio", "value"),
-     State("community-spread", "value")]
+     State("community-spread", "value"),
+     State("simulation-data", "data"),
+     State("progress-stream", "data")]
 )
-def update_simulation_control(n_intervals, start_clicks, stop_clicks, reset_clicks,
+def update_simulation_control(finished, start_clicks, stop_clicks, reset_clicks,
                             num_buildings, time_horizon, num_scenarios, rapid_eval, options,
-                            tariff_type, country, off_peak_price, on_peak_price, export_ratio, community_spread):
-    global simulation_status, simulation_results
+                            tariff_type, country, off_peak_price, on_peak_price, export_ratio, community_spread,
+                            current_store, streaming):
+    global simulation_status, simulation_results, simulation_run_id, sim_future
     
-    ctx = callback_context
-    trigger_id = ctx.triggered[0]['prop_id'].split('.')[0] if ctx.triggered else None
+    trigger_id = callback_context.triggered_id
     
-    if trigger_id == 'start-btn' and start_clicks and not simulation_status["running"]:
+    idle = sim_future is None or sim_future.done()
+    if trigger_id == 'start-btn' and start_clicks and idle and not simulation_status["running"]:
         config = {
             'num_buildings': num_buildings or 10,
             'time_horizon': time_horizon or 96,
@@ -1785,38 +1955,48 @@ def update_simulation_control(n_intervals, start_clicks, stop_clicks, reset_clic
             'community_spread': community_spread or 0.5
         }
         
-        thread = threading.Thread(target=run_simulation_thread, args=(config,), daemon=True)
-        thread.start()
-    
-    elif trigger_id == 'stop-btn':
-        simulation_status = {"running": False, "progress": 0, "message": "Stopped by user"}
-    
-    elif trigger_id == 'reset-btn':
-        simulation_status = {"running": False, "progress": 0, "message": "Ready"}
-        simulation_results = {}
-    
-    # Status display
-    if simulation_status["running"]:
-        status_color = "primary"
-        status_text = f"{simulation_status['message']} ({simulation_status['progress']}%)"
-    elif simulation_status["progress"] == 100:
-        status_color = "success"
-        status_text = simulation_status['message']
-    elif "Error" in simulation_status['message']:
-        status_color = "danger"
-        status_text = simulation_status['message']
-    else:
-        status_color = "secondary"
-        status_text = simulation_status['message']
-    
-    status_badge = dbc.Badge(status_text, color=status_color, className="w-100 p-2")
-    
-    return (status_badge,
-            simulation_status['progress'],
-            simulation_status['running'],
-            not simulation_status['running'],
+        # Mark as running before the job starts so polling is enabled right away
+        simulation_status = {"running": True, "progress": 0, "message": "Starting..."}
+        sim_stop_event.clear()
+        sim_future = SIM_EXECUTOR.submit(run_simulation_thread, config)
+    
+    elif trigger_id in ('stop-btn', 'reset-btn'):
+        reset = trigger_id == 'reset-btn'
+        final_status = {"running": False, "progress": 0, "message": "Ready" if reset else "Stopped by user"}
+        with sim_publish_lock:
+            sim_stop_event.set()
+            if sim_future is not None and not sim_future.cancel() and not sim_future.done():
+                # A running job only sees the stop at its next stage check. Until it has
+                # exited the UI stays running (Start disabled), and the job's done-callback
+                # publishes the final status; a reset also must not lose to its results
+                simulation_status = {"running": True, "progress": simulation_status["progress"],
+                                     "message": "Stopping..."}
+                sim_future.add_done_callback(_publish_after_stop(final_status, reset))
+            else:
+                simulation_status = final_status
+                if reset:
+                    simulation_results = {}
+                    simulation_run_id = None
+    
+    # Only the run id travels to the browser; callbacks resolve it via SIM_CACHE
+    store_data = {'run_id': simulation_run_id} if simulation_run_id else {}
+    if store_data == (current_store or {}):
+        store_data = dash.no_update
+    
+    # One snapshot of the status the worker may be replacing. The finished signal
+    # was raised by the browser's copy of it, so that copy is not sent back
+    status = simulation_status
+    status_data = dash.no_update if trigger_id == 'simulation-finished' else status
+    
+    # Only (re)open or close the progress stream when the running state flips
+    stream_active = status['running']
+    if stream_active == bool(streaming):
+        stream_active = dash.no_update
+    
+    return (status_data,
             len(simulation_results) == 0,
-            simulation_results)
+            store_data,
+            stream_active)
 
 
 @app.callback(
@@ -1827,26 +2007,140 @@ def update_simulation_control(n_intervals, start_clicks, stop_clicks, reset_clic
     [Input("simulation-data", "data")]
 )
 def update_summary_cards(simulation_data):
+    simulation_data = resolve_results(simulation_data)
     if not simulation_data or 'scenario_results' not in simulation_data:
         return "0", "€0.00", "0.000", "0%"
     
-    scenario_results = simulation_data['scenario_results']
-    successful = {k: v for k, v in scenario_results.items() if v.get('status') == 'success'}
+    return compute_kpis(simulation_data)
+
+
+def _results_to_soa(successful):
+    """Unpack successful scenario results into parallel arrays in a single pass
+    
+    Returns (names, costs, fairness, p2p_mask, grid_mask). grid_mask only marks
+    results that explicitly ran without P2P; ~p2p_mask also covers untagged ones.
+    """
+    count = len(successful)
+    names = np.empty(count, dtype=object)
+    costs = np.empty(count)
+    fairness = np.empty(count)
+    p2p_mask = np.empty(count, dtype=bool)
+    grid_mask = np.empty(count, dtype=bool)
+    for i, (name, result) in enumerate(successful.items()):
+        names[i] = name
+        costs[i] = result['total_cost']
+        fairness[i] = result['fairness']
+        p2p_mask[i] = bool(result.get('with_p2p', False))
+        grid_mask[i] = not result.get('with_p2p', True)
+    return names, costs, fairness, p2p_mask, grid_mask
+
+
+def _truncate_names(names, width):
+    """Names longer than width characters cut to width plus '...'"""
+    names = names.astype(str)
+    return np.where(np.char.str_len(names) > width, np.char.add(names.astype(f'<U{width}'), '...'), names)
+
+
+def _performance_scores(costs, fairness):
+    """Min-max normalized 0.7 cost / 0.3 fairness score per scenario, higher is better"""
+    norm_cost = (costs - costs.min()) / (np.ptp(costs) + 1e-6)
+    norm_fair = (fairness - fairness.min()) / (np.ptp(fairness) + 1e-6)
+    return 1 - (0.7 * norm_cost + 0.3 * norm_fair)
+
+
+def _p2p_groups(p2p_mask):
+    """(label, mask) for the non-empty P2P / grid-only groups, in first-appearance order"""
+    groups = [('P2P Trading', p2p_mask), ('Grid Only', ~p2p_mask)]
+    if p2p_mask.size and not p2p_mask[0]:
+        groups.reverse()
+    return [(label, mask) for label, mask in groups if mask.any()]
+
+
+def _vline(x, dash, text):
+    """(shape, annotation) of a labelled full-height line, as add_vline would draw it"""
+    return (dict(type="line", x0=x, x1=x, xref="x", y0=0, y1=1, yref="y domain", line_dash=dash),
+            dict(text=text, showarrow=False, x=x, xref="x", xanchor="left", y=1, yref="y domain", yanchor="top"))
+
+
+def _hline(y, dash, text):
+    """(shape, annotation) of a labelled full-width line, as add_hline would draw it"""
+    return (dict(type="line", x0=0, x1=1, xref="x domain", y0=y, y1=y, yref="y", line_dash=dash),
+            dict(text=text, showarrow=False, x=1, xref="x domain", xanchor="right", y=y, yref="y", yanchor="bottom"))
+
+
+def _p2p_histogram(values, p2p_mask, title, x_title, height, lines=()):
+    """10-bin histogram of values, stacked by P2P / grid-only group, with _vline markers"""
+    shapes, annotations = zip(*lines) if lines else ((), ())
+    return go.Figure(
+        [
+            go.Histogram(x=values[mask], name=label, legendgroup=label, nbinsx=10,
+                         marker_color=_P2P_COLOR_MAP[label])
+            for label, mask in _p2p_groups(p2p_mask)
+        ],
+        go.Layout(title=title, xaxis_title=x_title, yaxis_title="Number of Scenarios",
+                  legend_title_text="Type", barmode="relative", height=height,
+                  shapes=shapes, annotations=annotations)
+    )
+
+
+def _mean_std(values):
+    """(mean, std) of a 1-D array; the spread reuses the computed mean"""
+    mean = values.mean()
+    return mean, np.sqrt(np.square(values - mean).mean())
+
+
+def _describe(values):
+    """(mean, median, std) of a 1-D array"""
+    mean, std = _mean_std(values)
+    return mean, np.median(values), std
+
+
+def _pareto_mask(costs, fairness):
+    """Mask of scenarios not dominated by a strictly cheaper, at-least-as-fair one"""
+    order = np.argsort(costs, kind='stable')
+    sorted_costs = costs[order]
+    sorted_fairness = fairness[order]
+    # Best fairness among all strictly cheaper scenarios (ties in cost never dominate)
+    best_before = np.concatenate(([np.inf], np.minimum.accumulate(sorted_fairness)[:-1]))
+    first_of_tie = np.searchsorted(sorted_costs, sorted_costs, side='left')
+    mask = np.empty(len(costs), dtype=bool)
+    mask[order] = sorted_fairness < best_before[first_of_tie]
+    return mask
+
+
+@memoize_results(maxsize=SIM_CACHE.maxsize)
+def successful_scenarios(simulation_data):
+    """The run's successful scenario results, filtered once and shared by all views"""
+    return {k: v for k, v in simulation_data['scenario_results'].items() if v.get('status') == 'success'}
+
+
+@memoize_results(maxsize=SIM_CACHE.maxsize)
+def scenario_arrays(simulation_data):
+    """_results_to_soa() of the run's successful scenarios, read-only since it is shared"""
+    arrays = _results_to_soa(successful_scenarios(simulation_data))
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+# One slot: the KPIs only ever describe the current run
+@memoize_results(maxsize=1)
+def compute_kpis(simulation_data):
+    """Summary card values (scenarios, avg cost, avg fairness, P2P savings)"""
+    successful = successful_scenarios(simulation_data)
     
     if not successful:
         return "0", "€0.00", "0.000", "0%"
     
+    _, costs, fairness, p2p_mask, grid_mask = scenario_arrays(simulation_data)
     total_scenarios = len(successful)
-    avg_cost = np.mean([v['total_cost'] for v in successful.values()])
-    avg_fairness = np.mean([v['fairness'] for v in successful.values()])
+    avg_cost = costs.mean()
+    avg_fairness = fairness.mean()
     
     # Calculate P2P savings
-    p2p_scenarios = {k: v for k, v in successful.items() if v.get('with_p2p', False)}
-    no_p2p_scenarios = {k: v for k, v in successful.items() if not v.get('with_p2p', True)}
-    
-    if p2p_scenarios and no_p2p_scenarios:
-        p2p_avg = np.mean([v['total_cost'] for v in p2p_scenarios.values()])
-        no_p2p_avg = np.mean([v['total_cost'] for v in no_p2p_scenarios.values()])
+    if p2p_mask.any() and grid_mask.any():
+        p2p_avg = costs[p2p_mask].mean()
+        no_p2p_avg = costs[grid_mask].mean()
         savings_pct = ((no_p2p_avg - p2p_avg) / no_p2p_avg) * 100 if no_p2p_avg > 0 else 0
     else:
         savings_pct = 0
@@ -1857,163 +2151,164 @@ def update_summary_cards(simulation_data):
             f"{savings_pct:.1f}%")
 
 
+# Placeholders are static, so they are built once and reused on every render
+_EMPTY_ANALYTICS = html.Div([
+    dbc.Card([
+        dbc.CardBody([
+            html.Div([
+                fa_icon("chart-line", "fa-4x text-muted mb-3"),
+                html.H4("No Analytics Data Available", className="text-muted mb-3"),
+                html.P("Run a simulation to generate analytics and visualizations", className="text-muted mb-4"),
+                dbc.Button([
+                    fa_icon("play", "me-2"),
+                    "Start Your First Simulation"
+                ], color="primary", size="lg", outline=True, className="mb-3"),
+                html.Hr(),
+                html.H6("What you'll see here:", className="text-muted mb-2"),
+                dbc.Row([
+                    dbc.Col([
+                        html.Div([
+                            fa_icon("chart-pie", "me-2 text-primary"),
+                            "Cost vs Fairness Analysis"
+                        ], className="small text-muted mb-1")
+                    ], width=6),
+                    dbc.Col([
+                        html.Div([
+                            fa_icon("handshake", "me-2 text-success"),
+                            "P2P Trading Benefits"
+                        ], className="small text-muted mb-1")
+                    ], width=6),
+                    dbc.Col([
+                        html.Div([
+                            fa_icon("bolt", "me-2 text-warning"),
+                            "Energy Flow Patterns"
+                        ], className="small text-muted mb-1")
+                    ], width=6),
+                    dbc.Col([
+                        html.Div([
+                            fa_icon("trophy", "me-2 text-info"),
+                            "Performance Rankings"
+                        ], className="small text-muted mb-1")
+                    ], width=6)
+                ])
+            ], className="text-center py-5")
+        ])
+    ], className="border-0 bg-light")
+])
+
+_NO_SUCCESSFUL_SCENARIOS = html.Div([
+    dbc.Card([
+        dbc.CardBody([
+            html.Div([
+                fa_icon("exclamation-triangle", "fa-3x text-warning mb-3"),
+                html.H4("No Successful Scenarios", className="text-warning mb-3"),
+                html.P("The simulation completed but no scenarios were successful.", className="text-muted mb-3"),
+                html.P("This might happen due to:", className="text-muted mb-2"),
+                html.Ul([
+                    html.Li("Configuration issues with the optimization parameters", className="text-muted small"),
+                    html.Li("Invalid price ranges or tariff settings", className="text-muted small"),
+                    html.Li("Insufficient time horizon or building count", className="text-muted small")
+                ], className="text-start mb-4"),
+                dbc.Button([
+                    fa_icon("redo", "me-2"),
+                    "Try Different Settings"
+                ], color="warning", outline=True)
+            ], className="text-center py-4")
+        ])
+    ], className="border-warning")
+])
+
+
 @app.callback(
     Output("analytics-content", "children"),
     [Input("analytics-tabs", "active_tab"),
      Input("simulation-data", "data")]
 )
 def render_analytics_tab(active_tab, simulation_data):
+    """Render the active analytics tab for the current run"""
+    simulation_data = resolve_results(simulation_data)
     if not simulation_data or 'scenario_results' not in simulation_data:
-        return html.Div([
-            dbc.Card([
-                dbc.CardBody([
-                    html.Div([
-                        html.I(className="fas fa-chart-line fa-4x text-muted mb-3"),
-                        html.H4("No Analytics Data Available", className="text-muted mb-3"),
-                        html.P("Run a simulation to generate analytics and visualizations", className="text-muted mb-4"),
-                        dbc.Button([
-                            html.I(className="fas fa-play me-2"),
-                            "Start Your First Simulation"
-                        ], color="primary", size="lg", outline=True, className="mb-3"),
-                        html.Hr(),
-                        html.H6("What you'll see here:", className="text-muted mb-2"),
-                        dbc.Row([
-                            dbc.Col([
-                                html.Div([
-                                    html.I(className="fas fa-chart-pie me-2 text-primary"),
-                                    "Cost vs Fairness Analysis"
-                                ], className="small text-muted mb-1")
-                            ], width=6),
-                            dbc.Col([
-                                html.Div([
-                                    html.I(className="fas fa-handshake me-2 text-success"),
-                                    "P2P Trading Benefits"
-                                ], className="small text-muted mb-1")
-                            ], width=6),
-                            dbc.Col([
-                                html.Div([
-                                    html.I(className="fas fa-bolt me-2 text-warning"),
-                                    "Energy Flow Patterns"
-                                ], className="small text-muted mb-1")
-                            ], width=6),
-                            dbc.Col([
-                                html.Div([
-                                    html.I(className="fas fa-trophy me-2 text-info"),
-                                    "Performance Rankings"
-                                ], className="small text-muted mb-1")
-                            ], width=6)
-                        ])
-                    ], className="text-center py-5")
-                ])
-            ], className="border-0 bg-light")
-        ])
-    
-    if active_tab == "overview-tab":
-        return create_overview_analytics(simulation_data)
-    elif active_tab == "cost-tab":
-        return create_cost_analytics(simulation_data)
-    elif active_tab == "fairness-tab":
-        return create_fairness_analytics(simulation_data)
-    elif active_tab == "p2p-tab":
-        return create_p2p_analytics(simulation_data)
-    elif active_tab == "energy-tab":
-        return create_energy_analytics(simulation_data)
-    elif active_tab == "performance-tab":
-        return create_performance_analytics(simulation_data)
-    
-    return html.Div("Select an analytics tab")
+        return _EMPTY_ANALYTICS
+    
+    # Only the active tab is built; builders are memoized per run id, so switching
+    # back to a tab returns the component tree built on its first visit
+    builder = ANALYTICS_TAB_BUILDERS.get(active_tab)
+    if builder is None:
+        return html.Div("Select an analytics tab")
+    return builder(simulation_data)
 
 
+@memoize_results(maxsize=SIM_CACHE.maxsize)
 def create_overview_analytics(simulation_data):
-    scenario_results = simulation_data['scenario_results']
-    successful = {k: v for k, v in scenario_results.items() if v.get('status') == 'success'}
+    successful = successful_scenarios(simulation_data)
     
     if not successful:
-        return html.Div([
-            dbc.Card([
-                dbc.CardBody([
-                    html.Div([
-                        html.I(className="fas fa-exclamation-triangle fa-3x text-warning mb-3"),
-                        html.H4("No Successful Scenarios", className="text-warning mb-3"),
-                        html.P("The simulation completed but no scenarios were successful.", className="text-muted mb-3"),
-                        html.P("This might happen due to:", className="text-muted mb-2"),
-                        html.Ul([
-                            html.Li("Configuration issues with the optimization parameters", className="text-muted small"),
-                            html.Li("Invalid price ranges or tariff settings", className="text-muted small"),
-                            html.Li("Insufficient time horizon or building count", className="text-muted small")
-                        ], className="text-start mb-4"),
-                        dbc.Button([
-                            html.I(className="fas fa-redo me-2"),
-                            "Try Different Settings"
-                        ], color="warning", outline=True)
-                    ], className="text-center py-4")
-                ])
-            ], className="border-warning")
-        ])
+        return _NO_SUCCESSFUL_SCENARIOS
     
-    names = list(successful.keys())
-    costs = [v['total_cost'] for v in successful.values()]
-    fairness = [v['fairness'] for v in successful.values()]
-    p2p_status = ['P2P Trading' if v.get('with_p2p', False) else 'Grid Only' for v in successful.values()]
+    names, costs, fairness, p2p_mask, _ = scenario_arrays(simulation_data)
     
     # Enhanced scatter plot with annotations and trend
-    scatter_fig = px.scatter(
-        x=costs, y=fairness, color=p2p_status, hover_name=names,
+    # Large runs plot the Pareto front plus a sample; the rest only feed the density layer
+    pareto = _pareto_mask(costs, fairness)
+    shown = _scatter_sample(pareto)
+    shown_names, shown_costs, shown_fairness = names[shown], costs[shown], fairness[shown]
+    scatter_traces = [
+        _scatter(shown_costs[mask], shown_fairness[mask], mode='markers', name=label, legendgroup=label,
+                 marker_color=_P2P_COLOR_MAP[label], hovertext=shown_names[mask],
+                 hovertemplate="<b>%{hovertext}</b><br>Cost: €%{x:.2f}<br>Fairness: %{y:.3f}<extra></extra>")
+        for label, mask in _p2p_groups(p2p_mask[shown])
+    ]
+    if shown.size < costs.size:
+        # Draw the density underneath the sampled points
+        scatter_traces.insert(0, go.Histogram2d(
+            x=costs, y=fairness, name='All scenarios', showscale=False, hoverinfo='skip',
+            colorscale=[[0, 'rgba(108, 117, 125, 0)'], [1, 'rgba(108, 117, 125, 0.5)']]
+        ))
+    
+    # One sort serves the ideal zone bounds and the histogram's median line
+    q125, q25, median_cost = np.percentile(costs, [12.5, 25, 50])
+    avg_cost, cost_std = _mean_std(costs)
+    avg_fairness, fairness_std = _mean_std(fairness)
+    
+    # Ideal zone and average lines go into the layout in one pass
+    fairness_line = _hline(avg_fairness, "dash", f"Avg Fairness: {avg_fairness:.3f}")
+    cost_line = _vline(avg_cost, "dash", f"Avg Cost: €{avg_cost:.2f}")
+    scatter_fig = go.Figure(scatter_traces, go.Layout(
         title="🎯 Cost vs Fairness Trade-off Analysis",
-        labels={'x': 'Total Cost (€/building)', 'y': 'Fairness (Coefficient of Variation)'},
-        color_discrete_map={'P2P Trading': '#28a745', 'Grid Only': '#dc3545'}
-    )
-    
-    # Add ideal zone annotation
-    scatter_fig.add_shape(type="rect", x0=min(costs), y0=0, x1=np.percentile(costs, 25), y1=0.2,
-                         fillcolor="lightgreen", opacity=0.1, line_width=0)
-    scatter_fig.add_annotation(x=np.percentile(costs, 12.5), y=0.1, text="Ideal Zone<br>(Low Cost + High Fairness)",
-                              showarrow=False, font=dict(size=10, color="green"))
-    
-    # Add average lines
-    scatter_fig.add_hline(y=np.mean(fairness), line_dash="dash", annotation_text=f"Avg Fairness: {np.mean(fairness):.3f}")
-    scatter_fig.add_vline(x=np.mean(costs), line_dash="dash", annotation_text=f"Avg Cost: €{np.mean(costs):.2f}")
-    scatter_fig.update_layout(height=450)
+        xaxis_title="Total Cost (€/building)",
+        yaxis_title="Fairness (Coefficient of Variation)",
+        legend_title_text="Type",
+        height=450,
+        shapes=[
+            dict(type="rect", x0=costs.min(), y0=0, x1=q25, y1=0.2,
+                 fillcolor="lightgreen", opacity=0.1, line_width=0),
+            fairness_line[0], cost_line[0]
+        ],
+        annotations=[
+            dict(x=q125, y=0.1, text="Ideal Zone<br>(Low Cost + High Fairness)",
+                 showarrow=False, font=dict(size=10, color="green")),
+            fairness_line[1], cost_line[1]
+        ]
+    ))
     
     # Enhanced cost distribution with statistics
-    cost_hist = px.histogram(
-        x=costs, nbins=10, color=p2p_status,
-        title="💰 Cost Distribution with Statistical Insights",
-        labels={'x': 'Total Cost (€/building)', 'y': 'Number of Scenarios'},
-        color_discrete_map={'P2P Trading': '#28a745', 'Grid Only': '#dc3545'}
-    )
-    
-    # Add statistical lines
-    cost_hist.add_vline(x=np.mean(costs), line_dash="dash", annotation_text="Mean")
-    cost_hist.add_vline(x=np.median(costs), line_dash="dot", annotation_text="Median")
-    cost_hist.update_layout(height=350)
+    cost_hist = _p2p_histogram(costs, p2p_mask, "💰 Cost Distribution with Statistical Insights",
+                               "Total Cost (€/building)", 350,
+                               lines=[_vline(avg_cost, "dash", "Mean"), _vline(median_cost, "dot", "Median")])
     
     # Enhanced summary metrics
-    avg_cost = np.mean(costs)
-    avg_fairness = np.mean(fairness)
-    best_scenario = min(successful.items(), key=lambda x: x[1]['total_cost'])
-    most_fair = min(successful.items(), key=lambda x: x[1]['fairness'])
-    cost_std = np.std(costs)
-    fairness_std = np.std(fairness)
+    best_index = int(np.argmin(costs))
+    fairest_index = int(np.argmin(fairness))
     
     # Pareto frontier analysis
-    pareto_scenarios = []
-    for name, result in successful.items():
-        is_pareto = True
-        for other_name, other_result in successful.items():
-            if (other_result['total_cost'] < result['total_cost'] and 
-                other_result['fairness'] <= result['fairness']):
-                is_pareto = False
-                break
-        if is_pareto:
-            pareto_scenarios.append(name)
+    pareto_scenarios = names[pareto].tolist()
     
     return dbc.Row([
         # Explanation Panel
         dbc.Col([
             dbc.Card([
                 dbc.CardHeader([
-                    html.H6([html.I(className="fas fa-info-circle me-2"), "Overview Analysis Explained"], className="mb-0")
+                    html.H6([fa_icon("info-circle", "me-2"), "Overview Analysis Explained"], className="mb-0")
                 ]),
                 dbc.CardBody([
                     html.P([
@@ -2043,11 +2338,11 @@ def create_overview_analytics(simulation_data):
                 dbc.CardHeader("🎯 Key Insights"),
                 dbc.CardBody([
                     html.H6("🏆 Best Performers:", className="text-success mb-2"),
-                    html.P([html.Strong("Lowest Cost: "), f"{best_scenario[0][:25]}..."], className="small mb-1"),
-                    html.P(f"€{best_scenario[1]['total_cost']:.2f}", className="h6 text-success mb-2"),
+                    html.P([html.Strong("Lowest Cost: "), f"{names[best_index][:25]}..."], className="small mb-1"),
+                    html.P(f"€{costs[best_index]:.2f}", className="h6 text-success mb-2"),
                     
-                    html.P([html.Strong("Most Fair: "), f"{most_fair[0][:25]}..."], className="small mb-1"),
-                    html.P(f"{most_fair[1]['fairness']:.3f} CoV", className="h6 text-info mb-3"),
+                    html.P([html.Strong("Most Fair: "), f"{names[fairest_index][:25]}..."], className="small mb-1"),
+                    html.P(f"{fairness[fairest_index]:.3f} CoV", className="h6 text-info mb-3"),
                     
                     html.H6("📊 Statistics:", className="text-primary mb-2"),
                     html.P([html.Strong("Scenarios: "), f"{len(successful)}"], className="small mb-1"),
@@ -2069,38 +2364,49 @@ def create_overview_analytics(simulation_data):
     ])
 
 
+@memoize_results(maxsize=SIM_CACHE.maxsize)
 def create_cost_analytics(simulation_data):
-    scenario_results = simulation_data['scenario_results']
-    successful = {k: v for k, v in scenario_results.items() if v.get('status') == 'success'}
-    
-    names = list(successful.keys())
-    costs = [v['total_cost'] for v in successful.values()]
-    p2p_status = ['P2P Trading' if v.get('with_p2p', False) else 'Grid Only' for v in successful.values()]
+    names, costs, _, p2p_mask, _ = scenario_arrays(simulation_data)
     
     # Enhanced cost comparison with ranking
-    sorted_data = sorted(zip(names, costs, p2p_status), key=lambda x: x[1])
-    sorted_names = [x[0][:15] + "..." if len(x[0]) > 15 else x[0] for x in sorted_data]
-    sorted_costs = [x[1] for x in sorted_data]
-    sorted_p2p = [x[2] for x in sorted_data]
-    
-    bar_fig = px.bar(
-        x=sorted_costs, y=sorted_names, color=sorted_p2p, orientation='h',
+    order = np.argsort(costs, kind='stable')
+    omitted = order.size - 2 * COST_RANKING_EDGE
+    if omitted > 0:
+        order = np.concatenate((order[:COST_RANKING_EDGE], order[-COST_RANKING_EDGE:]))
+    sorted_names = _truncate_names(names[order], 15)
+    sorted_costs = costs[order]
+    
+    bar_fig = go.Figure([
+        go.Bar(x=sorted_costs[mask], y=sorted_names[mask], orientation='h', name=label, legendgroup=label,
+               marker_color=_P2P_COLOR_MAP[label])
+        for label, mask in _p2p_groups(p2p_mask[order])
+    ])
+    bar_fig.update_layout(
         title="💰 Cost Ranking - Best to Worst Performance",
-        labels={'x': 'Total Cost (€/building)', 'y': 'Scenario'},
-        color_discrete_map={'P2P Trading': '#28a745', 'Grid Only': '#dc3545'}
+        xaxis_title="Total Cost (€/building)",
+        yaxis_title="Scenario",
+        legend_title_text="Type",
+        barmode="relative",
+        height=max(400, len(sorted_names) * 20)
     )
-    bar_fig.update_layout(height=max(400, len(sorted_names) * 20))
+    if omitted > 0:
+        bar_fig.add_annotation(
+            text=f"Showing the {COST_RANKING_EDGE} cheapest and {COST_RANKING_EDGE} most expensive; "
+                 f"{omitted} mid-ranked scenarios omitted",
+            xref="paper", yref="paper", x=1, y=1, xanchor="right", yanchor="bottom",
+            showarrow=False, font=dict(size=10, color="gray")
+        )
     
     # Enhanced box plot with violin overlay
     box_fig = go.Figure()
     
-    p2p_costs = [cost for cost, p2p in zip(costs, p2p_status) if p2p == 'P2P Trading']
-    grid_costs = [cost for cost, p2p in zip(costs, p2p_status) if p2p == 'Grid Only']
+    p2p_costs = costs[p2p_mask]
+    grid_costs = costs[~p2p_mask]
     
-    if p2p_costs:
+    if p2p_costs.size:
         box_fig.add_trace(go.Violin(y=p2p_costs, name='P2P Trading', fillcolor='rgba(40, 167, 69, 0.3)',
                                    line_color='#28a745', box_visible=True, meanline_visible=True))
-    if grid_costs:
+    if grid_costs.size:
         box_fig.add_trace(go.Violin(y=grid_costs, name='Grid Only', fillcolor='rgba(220, 53, 69, 0.3)',
                                    line_color='#dc3545', box_visible=True, meanline_visible=True))
     
@@ -2111,43 +2417,37 @@ def create_cost_analytics(simulation_data):
     )
     
     # Calculate detailed statistics
-    if p2p_costs and grid_costs:
-        avg_p2p = np.mean(p2p_costs)
-        avg_grid = np.mean(grid_costs)
+    if p2p_costs.size and grid_costs.size:
+        avg_p2p, median_p2p, std_p2p = _describe(p2p_costs)
+        avg_grid, median_grid, std_grid = _describe(grid_costs)
         savings = ((avg_grid - avg_p2p) / avg_grid) * 100
-        median_p2p = np.median(p2p_costs)
-        median_grid = np.median(grid_costs)
-        std_p2p = np.std(p2p_costs)
-        std_grid = np.std(grid_costs)
     else:
         savings = 0
         avg_p2p = avg_grid = median_p2p = median_grid = std_p2p = std_grid = 0
     
     # Cost breakdown analysis
+    q25, q75 = np.percentile(costs, [25, 75])
+    low_count = int((costs <= q25).sum())
+    high_count = int((costs > q75).sum())
     cost_ranges = {
-        'Low Cost (Bottom 25%)': len([c for c in costs if c <= np.percentile(costs, 25)]),
-        'Medium Cost (25-75%)': len([c for c in costs if np.percentile(costs, 25) < c <= np.percentile(costs, 75)]),
-        'High Cost (Top 25%)': len([c for c in costs if c > np.percentile(costs, 75)])
+        'Low Cost (Bottom 25%)': low_count,
+        'Medium Cost (25-75%)': costs.size - low_count - high_count,
+        'High Cost (Top 25%)': high_count
     }
     
-    pie_fig = px.pie(
+    pie_fig = go.Figure(go.Pie(
         values=list(cost_ranges.values()),
-        names=list(cost_ranges.keys()),
-        title="🥧 Cost Range Distribution",
-        color_discrete_map={
-            'Low Cost (Bottom 25%)': '#28a745',
-            'Medium Cost (25-75%)': '#ffc107',
-            'High Cost (Top 25%)': '#dc3545'
-        }
-    )
-    pie_fig.update_layout(height=300)
+        labels=list(cost_ranges.keys()),
+        marker_colors=['#28a745', '#ffc107', '#dc3545']
+    ))
+    pie_fig.update_layout(title="🥧 Cost Range Distribution", height=300)
     
     return dbc.Row([
         # Explanation Panel
         dbc.Col([
             dbc.Card([
                 dbc.CardHeader([
-                    html.H6([html.I(className="fas fa-euro-sign me-2"), "Cost Analysis Explained"], className="mb-0")
+                    html.H6([fa_icon("euro-sign", "me-2"), "Cost Analysis Explained"], className="mb-0")
                 ]),
                 dbc.CardBody([
                     html.P([
@@ -2190,53 +2490,59 @@ def create_cost_analytics(simulation_data):
                     html.P("Average P2P Savings", className="text-muted mb-3"),
                     
                     html.H6("📊 P2P Trading:", className="text-success mb-2"),
-                    html.P([html.Strong("Average: "), f"€{avg_p2p:.2f}" if p2p_costs else "N/A"], className="small mb-1"),
-                    html.P([html.Strong("Median: "), f"€{median_p2p:.2f}" if p2p_costs else "N/A"], className="small mb-1"),
-                    html.P([html.Strong("Std Dev: "), f"±€{std_p2p:.2f}" if p2p_costs else "N/A"], className="small mb-3"),
+                    html.P([html.Strong("Average: "), f"€{avg_p2p:.2f}" if p2p_costs.size else "N/A"], className="small mb-1"),
+                    html.P([html.Strong("Median: "), f"€{median_p2p:.2f}" if p2p_costs.size else "N/A"], className="small mb-1"),
+                    html.P([html.Strong("Std Dev: "), f"±€{std_p2p:.2f}" if p2p_costs.size else "N/A"], className="small mb-3"),
                     
                     html.H6("🏢 Grid Only:", className="text-danger mb-2"),
-                    html.P([html.Strong("Average: "), f"€{avg_grid:.2f}" if grid_costs else "N/A"], className="small mb-1"),
-                    html.P([html.Strong("Median: "), f"€{median_grid:.2f}" if grid_costs else "N/A"], className="small mb-1"),
-                    html.P([html.Strong("Std Dev: "), f"±€{std_grid:.2f}" if grid_costs else "N/A"], className="small mb-3"),
+                    html.P([html.Strong("Average: "), f"€{avg_grid:.2f}" if grid_costs.size else "N/A"], className="small mb-1"),
+                    html.P([html.Strong("Median: "), f"€{median_grid:.2f}" if grid_costs.size else "N/A"], className="small mb-1"),
+                    html.P([html.Strong("Std Dev: "), f"±€{std_grid:.2f}" if grid_costs.size else "N/A"], className="small mb-3"),
                     
                     html.H6("🎯 Key Findings:", className="text-primary mb-2"),
-                    html.P([html.Strong("Best: "), f"€{min(costs):.2f}"], className="small mb-1"),
-                    html.P([html.Strong("Worst: "), f"€{max(costs):.2f}"], className="small mb-1"),
-                    html.P([html.Strong("Range: "), f"€{max(costs) - min(costs):.2f}"], className="small")
+                    html.P([html.Strong("Best: "), f"€{costs.min():.2f}"], className="small mb-1"),
+                    html.P([html.Strong("Worst: "), f"€{costs.max():.2f}"], className="small mb-1"),
+                    html.P([html.Strong("Range: "), f"€{np.ptp(costs):.2f}"], className="small")
                 ])
             ])
         ], width=4)
     ])
 
 
+@memoize_results(maxsize=SIM_CACHE.maxsize)
 def create_fairness_analytics(simulation_data):
-    scenario_results = simulation_data['scenario_results']
-    successful = {k: v for k, v in scenario_results.items() if v.get('status') == 'success'}
-    
-    names = list(successful.keys())
-    fairness = [v['fairness'] for v in successful.values()]
-    costs = [v['total_cost'] for v in successful.values()]
-    p2p_status = ['P2P Trading' if v.get('with_p2p', False) else 'Grid Only' for v in successful.values()]
+    names, costs, fairness, p2p_mask, _ = scenario_arrays(simulation_data)
+    avg_fairness = fairness.mean()
     
     # Fairness histogram
-    hist_fig = px.histogram(
-        x=fairness, nbins=10, color=p2p_status,
-        title="⚖️ Fairness Distribution (Coefficient of Variation)",
-        labels={'x': 'Fairness (CoV) - Lower is More Fair', 'y': 'Number of Scenarios'},
-        color_discrete_map={'P2P Trading': '#28a745', 'Grid Only': '#dc3545'}
-    )
-    hist_fig.add_vline(x=np.mean(fairness), line_dash="dash", annotation_text="Average")
-    hist_fig.update_layout(height=400)
-    
-    # Fairness vs Cost scatter with trend
-    trend_fig = px.scatter(
-        x=fairness, y=costs, color=p2p_status, hover_name=names,
+    hist_fig = _p2p_histogram(fairness, p2p_mask, "⚖️ Fairness Distribution (Coefficient of Variation)",
+                              "Fairness (CoV) - Lower is More Fair", 400,
+                              lines=[_vline(avg_fairness, "dash", "Average")])
+    
+    # Fairness vs Cost scatter, with a least-squares trend line per group
+    trend_traces, trend_lines = [], []
+    for label, mask in _p2p_groups(p2p_mask):
+        group_fairness, group_costs = fairness[mask], costs[mask]
+        trend_traces.append(_scatter(
+            group_fairness, group_costs, mode='markers', name=label, legendgroup=label,
+            marker_color=_P2P_COLOR_MAP[label], hovertext=names[mask],
+            hovertemplate="<b>%{hovertext}</b><br>Fairness: %{x:.3f}<br>Cost: €%{y:.2f}<extra></extra>"
+        ))
+        if np.ptp(group_fairness) > 0:
+            slope, intercept = np.polyfit(group_fairness, group_costs, 1)
+            ends = np.array([group_fairness.min(), group_fairness.max()])
+            trend_lines.append(go.Scatter(
+                x=ends, y=slope * ends + intercept, mode='lines', name=label, legendgroup=label,
+                showlegend=False, line_color=_P2P_COLOR_MAP[label],
+                hovertemplate=f"<b>OLS trendline</b><br>Cost = {slope:.2f} * Fairness + {intercept:.2f}<extra></extra>"
+            ))
+    trend_fig = go.Figure(trend_traces + trend_lines, go.Layout(
         title="📈 Fairness vs Cost Relationship",
-        labels={'x': 'Fairness (CoV)', 'y': 'Total Cost (€)'},
-        color_discrete_map={'P2P Trading': '#28a745', 'Grid Only': '#dc3545'},
-        trendline="ols"
-    )
-    trend_fig.update_layout(height=400)
+        xaxis_title="Fairness (CoV)",
+        yaxis_title="Total Cost (€)",
+        legend_title_text="Type",
+        height=400
+    ))
     
     return dbc.Row([
         dbc.Col([
@@ -2249,9 +2555,9 @@ def create_fairness_analytics(simulation_data):
             dbc.Card([
                 dbc.CardHeader("📊 Fairness Metrics"),
                 dbc.CardBody([
-                    html.P([html.Strong("Most Fair: "), f"{min(fairness):.3f} CoV"], className="text-success mb-2"),
-                    html.P([html.Strong("Least Fair: "), f"{max(fairness):.3f} CoV"], className="text-danger mb-2"),
-                    html.P([html.Strong("Average: "), f"{np.mean(fairness):.3f} CoV"], className="mb-2"),
+                    html.P([html.Strong("Most Fair: "), f"{fairness.min():.3f} CoV"], className="text-success mb-2"),
+                    html.P([html.Strong("Least Fair: "), f"{fairness.max():.3f} CoV"], className="text-danger mb-2"),
+                    html.P([html.Strong("Average: "), f"{avg_fairness:.3f} CoV"], className="mb-2"),
                     html.Hr(),
                     html.H6("Interpretation:", className="text-primary"),
                     html.Ul([
@@ -2265,42 +2571,36 @@ def create_fairness_analytics(simulation_data):
     ])
 
 
+@memoize_results(maxsize=SIM_CACHE.maxsize)
 def create_p2p_analytics(simulation_data):
-    scenario_results = simulation_data['scenario_results']
-    successful = {k: v for k, v in scenario_results.items() if v.get('status') == 'success'}
-    
     # Separate P2P and Grid scenarios
-    p2p_scenarios = {k: v for k, v in successful.items() if v.get('with_p2p', False)}
-    grid_scenarios = {k: v for k, v in successful.items() if not v.get('with_p2p', True)}
+    _, costs, _, p2p_mask, grid_mask = scenario_arrays(simulation_data)
+    p2p_costs = costs[p2p_mask]
+    grid_costs = costs[grid_mask]
     
-    if not p2p_scenarios:
+    if not p2p_costs.size:
         return dbc.Alert("No P2P trading scenarios found", color="info")
     
-    # P2P Impact Analysis
-    p2p_costs = [v['total_cost'] for v in p2p_scenarios.values()]
-    grid_costs = [v['total_cost'] for v in grid_scenarios.values()] if grid_scenarios else []
-    
-    # Create comparison chart
-    comparison_data = []
-    if grid_costs:
-        comparison_data.extend([{'Type': 'Grid Only', 'Cost': cost} for cost in grid_costs])
-    comparison_data.extend([{'Type': 'P2P Trading', 'Cost': cost} for cost in p2p_costs])
-    
-    df_comparison = pd.DataFrame(comparison_data)
-    
-    violin_fig = px.violin(
-        df_comparison, x='Type', y='Cost',
+    # Create comparison chart straight from the cost arrays
+    violin_fig = go.Figure()
+    for label, group_costs in (('Grid Only', grid_costs), ('P2P Trading', p2p_costs)):
+        if group_costs.size:
+            violin_fig.add_trace(go.Violin(x=np.full(group_costs.size, label), y=group_costs,
+                                           name=label, legendgroup=label, scalegroup='cost',
+                                           marker_color=_P2P_COLOR_MAP[label]))
+    violin_fig.update_layout(
         title="🔄 P2P Trading Impact on Costs",
-        labels={'Cost': 'Total Cost (€)'},
-        color='Type',
-        color_discrete_map={'P2P Trading': '#28a745', 'Grid Only': '#dc3545'}
+        xaxis_title="Type",
+        yaxis_title="Total Cost (€)",
+        legend_title_text="Type",
+        height=400
     )
-    violin_fig.update_layout(height=400)
     
     # P2P Benefits breakdown
-    if grid_costs and p2p_costs:
-        avg_savings = ((np.mean(grid_costs) - np.mean(p2p_costs)) / np.mean(grid_costs)) * 100
-        min_savings = ((max(grid_costs) - min(p2p_costs)) / max(grid_costs)) * 100
+    if grid_costs.size and p2p_costs.size:
+        avg_grid = grid_costs.mean()
+        avg_savings = ((avg_grid - p2p_costs.mean()) / avg_grid) * 100
+        min_savings = ((grid_costs.max() - p2p_costs.min()) / grid_costs.max()) * 100
     else:
         avg_savings = 0
         min_savings = 0
@@ -2320,8 +2620,8 @@ def create_p2p_analytics(simulation_data):
                     html.P("Maximum Potential Savings", className="text-muted mb-3"),
                     
                     html.Hr(),
-                    html.P([html.Strong("P2P Scenarios: "), f"{len(p2p_scenarios)}"], className="mb-1"),
-                    html.P([html.Strong("Grid Scenarios: "), f"{len(grid_scenarios)}"], className="mb-1"),
+                    html.P([html.Strong("P2P Scenarios: "), f"{p2p_costs.size}"], className="mb-1"),
+                    html.P([html.Strong("Grid Scenarios: "), f"{grid_costs.size}"], className="mb-1"),
                     
                     html.Hr(),
                     html.H6("Key Benefits:", className="text-primary"),
@@ -2337,56 +2637,70 @@ def create_p2p_analytics(simulation_data):
     ])
 
 
+# Representative daily energy profile for the energy tab. It does not depend on
+# the simulation results, so the arrays and the tab itself are built only once
+_HOUR_LABELS = [f"{h:02d}:00" for h in range(24)]
+
+# Realistic residential demand profile (kWh per building average)
+_BUILDING_DEMAND = np.array([
+    1.2, 1.0, 0.9, 0.8, 0.8, 1.0, 1.5, 2.5, 3.2, 2.8, 2.5, 2.3,
+    2.1, 2.0, 2.2, 2.8, 3.8, 5.2, 4.8, 4.2, 3.5, 2.8, 2.2, 1.6
+])
+
+# Realistic PV generation profile (kWh per building with solar)
+_PV_GENERATION = np.array([
+    0, 0, 0, 0, 0, 0.1, 0.8, 2.2, 4.1, 6.2, 7.8, 8.5,
+    8.9, 8.3, 7.1, 5.4, 3.2, 1.5, 0.3, 0, 0, 0, 0, 0
+])
+
+# P2P trading: excess PV shared within community
+_P2P_EXPORT = np.maximum(0, _PV_GENERATION - _BUILDING_DEMAND) * 0.85
+_P2P_IMPORT = np.maximum(0, _BUILDING_DEMAND - _PV_GENERATION) * 0.3
+_NET_P2P = np.where(_P2P_EXPORT > 0, _P2P_EXPORT, -_P2P_IMPORT)
+_P2P_VOLUME = np.abs(_NET_P2P)
+
+# Grid interaction after P2P trading
+_GRID_IMPORT = np.maximum(0, _BUILDING_DEMAND - _PV_GENERATION - _P2P_IMPORT)
+_GRID_EXPORT = np.maximum(0, _PV_GENERATION - _BUILDING_DEMAND - _P2P_EXPORT)
+
+
 def create_energy_analytics(simulation_data):
-    # Enhanced energy flow data based on realistic prosumer community patterns
-    hours = list(range(24))
-    hour_labels = [f"{h:02d}:00" for h in hours]
-    
-    # Realistic residential demand profile (kWh per building average)
-    building_demand = [
-        1.2, 1.0, 0.9, 0.8, 0.8, 1.0, 1.5, 2.5, 3.2, 2.8, 2.5, 2.3,
-        2.1, 2.0, 2.2, 2.8, 3.8, 5.2, 4.8, 4.2, 3.5, 2.8, 2.2, 1.6
-    ]
-    
-    # Realistic PV generation profile (kWh per building with solar)
-    pv_generation = [
-        0, 0, 0, 0, 0, 0.1, 0.8, 2.2, 4.1, 6.2, 7.8, 8.5,
-        8.9, 8.3, 7.1, 5.4, 3.2, 1.5, 0.3, 0, 0, 0, 0, 0
-    ]
-    
-    # P2P trading: excess PV shared within community
-    p2p_export = [max(0, gen - dem) * 0.85 for gen, dem in zip(pv_generation, building_demand)]
-    p2p_import = [max(0, dem - gen) * 0.3 for dem, gen in zip(building_demand, pv_generation)]
-    net_p2p = [exp if exp > 0 else -imp for exp, imp in zip(p2p_export, p2p_import)]
-    
-    # Grid interaction after P2P trading
-    grid_import = [max(0, dem - gen - imp) for dem, gen, imp in zip(building_demand, pv_generation, p2p_import)]
-    grid_export = [max(0, gen - dem - exp) for gen, dem, exp in zip(pv_generation, building_demand, p2p_export)]
+    return _energy_analytics_tab()
+
+
+@lru_cache(maxsize=1)
+def _energy_analytics_tab():
+    """Build the energy tab once; its content is independent of the run"""
+    hour_labels = _HOUR_LABELS
+    building_demand = _BUILDING_DEMAND
+    pv_generation = _PV_GENERATION
+    p2p_export = _P2P_EXPORT
+    p2p_import = _P2P_IMPORT
     
     # Enhanced energy flow visualization
     energy_fig = go.Figure()
     
     # Add demand
-    energy_fig.add_trace(go.Scatter(
+    energy_fig.add_trace(_scatter(
         x=hour_labels, y=building_demand, name='Total Demand',
         line=dict(color='#dc3545', width=3), mode='lines+markers'
     ))
     
     # Add PV generation
-    energy_fig.add_trace(go.Scatter(
+    energy_fig.add_trace(_scatter(
         x=hour_labels, y=pv_generation, name='PV Generation',
         line=dict(color='#ffa500', width=3), mode='lines+markers',
         fill='tonexty', fillcolor='rgba(255, 165, 0, 0.1)'
     ))
     
     # Add P2P trading flow
-    energy_fig.add_trace(go.Scatter(
-        x=hour_labels, y=[abs(p) for p in net_p2p], name='P2P Trading Volume',
+    energy_fig.add_trace(_scatter(
+        x=hour_labels, y=_P2P_VOLUME, name='P2P Trading Volume',
         line=dict(color='#28a745', width=2, dash='dot'), mode='lines+markers'
     ))
     
     # Add peak demand threshold
-    peak_threshold = max(building_demand) * 0.8
+    peak_threshold = building_demand.max() * 0.8
     energy_fig.add_hline(y=peak_threshold, line_dash="dash", line_color="red",
                         annotation_text=f"Peak Threshold: {peak_threshold:.1f} kWh")
     
@@ -2399,24 +2713,18 @@ def create_energy_analytics(simulation_data):
     )
     
     # Enhanced energy balance with multiple scenarios
-    total_demand = sum(building_demand)
-    total_pv = sum(pv_generation)
-    total_p2p_vol = sum(abs(p) for p in net_p2p)
-    total_grid_import = sum(grid_import)
-    total_grid_export = sum(grid_export)
+    total_demand = building_demand.sum()
+    total_pv = pv_generation.sum()
+    total_p2p_vol = _P2P_VOLUME.sum()
+    total_grid_import = _GRID_IMPORT.sum()
+    total_grid_export = _GRID_EXPORT.sum()
     
     # Energy sources pie chart
-    balance_fig = px.pie(
+    balance_fig = go.Figure(go.Pie(
         values=[total_pv - total_grid_export, total_grid_import, total_p2p_vol],
-        names=['Local PV (Self-Consumed)', 'Grid Import', 'P2P Trading'],
-        title="📊 Energy Source Mix",
-        color_discrete_map={
-            'Local PV (Self-Consumed)': '#ffa500',
-            'Grid Import': '#dc3545',
-            'P2P Trading': '#28a745'
-        }
-    )
-    balance_fig.update_layout(height=350)
+        labels=['Local PV (Self-Consumed)', 'Grid Import', 'P2P Trading'],
+        marker_colors=['#ffa500', '#dc3545', '#28a745']
+    ), go.Layout(title="📊 Energy Source Mix", height=350))
     
     # P2P trading pattern
     p2p_pattern_fig = go.Figure()
@@ -2425,7 +2733,7 @@ def create_energy_analytics(simulation_data):
         marker_color='#28a745', opacity=0.7
     ))
     p2p_pattern_fig.add_trace(go.Bar(
-        x=hour_labels, y=[-x for x in p2p_import], name='P2P Import',
+        x=hour_labels, y=-p2p_import, name='P2P Import',
         marker_color='#17a2b8', opacity=0.7
     ))
     
@@ -2448,7 +2756,7 @@ def create_energy_analytics(simulation_data):
         dbc.Col([
             dbc.Card([
                 dbc.CardHeader([
-                    html.H6([html.I(className="fas fa-bolt me-2"), "Energy Flow Analysis Explained"], className="mb-0")
+                    html.H6([fa_icon("bolt", "me-2"), "Energy Flow Analysis Explained"], className="mb-0")
                 ]),
                 dbc.CardBody([
                     html.P([
@@ -2508,69 +2816,57 @@ def create_energy_analytics(simulation_data):
     ])
 
 
+# Static parts of the performance tab's figures, built once instead of per render
+# (a fixed uirevision keeps zoom/legend state when the tab is re-rendered)
+_PERFORMANCE_RANK_LAYOUT = MappingProxyType({
+    'title': "📈 Top 10 Performance Rankings",
+    'xaxis_title': "Performance Score (0-1)",
+    'legend_title_text': "Type",
+    'barmode': "relative",
+    'height': 500,
+    'uirevision': 'performance-ranking'
+})
+_PERFORMANCE_MATRIX_X = tuple(f'Fair {i+1}' for i in range(4))
+_PERFORMANCE_MATRIX_Y = tuple(f'Cost {i+1}' for i in range(4))
+_PERFORMANCE_MATRIX_LAYOUT = MappingProxyType({
+    'title': "🎯 Performance Distribution Matrix",
+    'height': 350,
+    'uirevision': 'performance-matrix'
+})
+
+
+@memoize_results(maxsize=SIM_CACHE.maxsize)
 def create_performance_analytics(simulation_data):
-    scenario_results = simulation_data['scenario_results']
-    successful = {k: v for k, v in scenario_results.items() if v.get('status') == 'success'}
+    names, costs, fairness, p2p_mask, _ = scenario_arrays(simulation_data)
     
-    names = list(successful.keys())
-    costs = [v['total_cost'] for v in successful.values()]
-    fairness = [v['fairness'] for v in successful.values()]
-    p2p_status = ['P2P Trading' if v.get('with_p2p', False) else 'Grid Only' for v in successful.values()]
+    scores = _performance_scores(costs, fairness)
     
-    # Calculate performance scores
-    min_cost, max_cost = min(costs), max(costs)
-    min_fair, max_fair = min(fairness), max(fairness)
-    
-    scores = []
-    for cost, fair in zip(costs, fairness):
-        norm_cost = (cost - min_cost) / (max_cost - min_cost + 1e-6)
-        norm_fair = (fair - min_fair) / (max_fair - min_fair + 1e-6)
-        score = 1 - (0.7 * norm_cost + 0.3 * norm_fair)  # Higher is better
-        scores.append(score)
+    # Only the top ten are charted, so pick them in O(N) before building the frame
+    top = np.argpartition(-scores, min(10, scores.size) - 1)[:10]
+    top = top[np.argsort(-scores[top], kind='stable')]
     
     # Performance ranking chart
-    df_performance = pd.DataFrame({
-        'Scenario': [name[:20] + '...' if len(name) > 20 else name for name in names],
-        'Score': scores,
-        'Type': p2p_status,
-        'Cost': costs,
-        'Fairness': fairness
-    }).sort_values('Score', ascending=False)
-    
-    rank_fig = px.bar(
-        df_performance.head(10), x='Score', y='Scenario', color='Type',
-        orientation='h',
-        title="📈 Top 10 Performance Rankings",
-        labels={'Score': 'Performance Score (0-1)', 'Scenario': ''},
-        color_discrete_map={'P2P Trading': '#28a745', 'Grid Only': '#dc3545'}
+    top_names, top_scores = _truncate_names(names[top], 20), scores[top]
+    rank_fig = go.Figure(
+        [
+            go.Bar(x=top_scores[mask], y=top_names[mask], orientation='h', name=label, legendgroup=label,
+                   marker_color=_P2P_COLOR_MAP[label], marker_line_width=0,
+                   hovertemplate="%{y}<br>Score: %{x:.3f}<extra></extra>")
+            for label, mask in _p2p_groups(p2p_mask[top])
+        ],
+        go.Layout(**_PERFORMANCE_RANK_LAYOUT)
     )
-    rank_fig.update_layout(height=500)
-    
-    # Performance matrix heatmap
-    import plotly.graph_objects as go
-    
-    # Create performance matrix
-    performance_matrix = []
-    cost_bins = np.linspace(min(costs), max(costs), 5)
-    fair_bins = np.linspace(min(fairness), max(fairness), 5)
     
-    for i in range(4):
-        row = []
-        for j in range(4):
-            # Count scenarios in this bin
-            count = sum(1 for c, f in zip(costs, fairness) 
-                       if cost_bins[i] <= c < cost_bins[i+1] and fair_bins[j] <= f < fair_bins[j+1])
-            row.append(count)
-        performance_matrix.append(row)
+    # Performance matrix heatmap: scenario counts on a 4x4 cost x fairness grid, in one pass
+    performance_matrix, _, _ = np.histogram2d(costs, fairness, bins=4)
     
     heatmap_fig = go.Figure(data=go.Heatmap(
-        z=performance_matrix,
-        x=[f'Fair {i+1}' for i in range(4)],
-        y=[f'Cost {i+1}' for i in range(4)],
-        colorscale='RdYlGn',
-        title="🎯 Performance Distribution Matrix"
+        z=performance_matrix.astype(np.int32),
+        x=_PERFORMANCE_MATRIX_X,
+        y=_PERFORMANCE_MATRIX_Y,
+        colorscale='RdYlGn'
     ))
-    heatmap_fig.update_layout(height=350)
+    heatmap_fig.update_layout(**_PERFORMANCE_MATRIX_LAYOUT)
     
     return dbc.Row([
         dbc.Col([
@@ -2584,140 +2880,186 @@ def create_performance_analytics(simulation_data):
                 dbc.CardHeader("🏆 Performance Summary"),
                 dbc.CardBody([
                     html.H6("Top Performer:", className="text-success"),
-                    html.P(f"{df_performance.iloc[0]['Scenario']}", className="small mb-1"),
-                    html.P(f"Score: {df_performance.iloc[0]['Score']:.3f}", className="mb-3"),
+                    html.P(f"{top_names[0]}", className="small mb-1"),
+                    html.P(f"Score: {top_scores[0]:.3f}", className="mb-3"),
                     
                     html.H6("Performance Metrics:", className="text-primary"),
                     html.P([html.Strong("Cost Weight: "), "70%"], className="small mb-1"),
                     html.P([html.Strong("Fairness Weight: "), "30%"], className="small mb-1"),
-                    html.P([html.Strong("Best Score: "), f"{max(scores):.3f}"], className="small mb-1"),
-                    html.P([html.Strong("Average Score: "), f"{np.mean(scores):.3f}"], className="small")
+                    html.P([html.Strong("Best Score: "), f"{scores.max():.3f}"], className="small mb-1"),
+                    html.P([html.Strong("Average Score: "), f"{scores.mean():.3f}"], className="small")
                 ])
             ])
         ], width=12, className="mt-3")
     ])
 
 
+# Tab id -> content builder
+ANALYTICS_TAB_BUILDERS = {
+    "overview-tab": create_overview_analytics,
+    "cost-tab": create_cost_analytics,
+    "fairness-tab": create_fairness_analytics,
+    "p2p-tab": create_p2p_analytics,
+    "energy-tab": create_energy_analytics,
+    "performance-tab": create_performance_analytics
+}
+
+
+_FILTER_OPERATORS = [['ge ', '>='], ['le ', '<='], ['lt ', '<'], ['gt ', '>'],
+                     ['ne ', '!='], ['eq ', '='], ['contains '], ['datestartswith ']]
+
+
+def _split_filter_part(filter_part):
+    """Split one DataTable filter expression into (column, operator, value)"""
+    for operator_type in _FILTER_OPERATORS:
+        for operator in operator_type:
+            if operator in filter_part:
+                name_part, value_part = filter_part.split(operator, 1)
+                name = name_part[name_part.find('{') + 1: name_part.rfind('}')]
+                value_part = value_part.strip()
+                quote = value_part[:1]
+                if quote and quote == value_part[-1] and quote in ("'", '"', '`'):
+                    value = value_part[1:-1].replace('\\' + quote, quote)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+                return name, operator_type[0].strip(), value
+    return None, None, None
+
+
+def _filter_results_frame(df, filter_query):
+    """Apply a DataTable filter_query to the results DataFrame"""
+    for filter_part in filter_query.split(' && '):
+        col_name, operator, value = _split_filter_part(filter_part)
+        if col_name not in df.columns:
+            continue
+        try:
+            if operator in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+                df = df.loc[getattr(df[col_name], operator)(value)]
+            elif operator == 'contains':
+                df = df.loc[df[col_name].astype(str).str.contains(str(value), regex=False)]
+            elif operator == 'datestartswith':
+                df = df.loc[df[col_name].astype(str).str.startswith(str(value))]
+        except TypeError:
+            # e.g. an ordering comparison between text and a number
+            continue
+    return df
+
+
+def _results_table_source(simulation_data):
+    """Results shown in the table: the current run, else the loaded results"""
+    data_source = resolve_results(simulation_data) or SIM_CACHE.get(simulation_run_id)
+    if data_source and 'scenario_results' in data_source:
+        return data_source
+    return None
+
+
+@memoize_results(maxsize=16)
+def build_results_frame(data_source, filter_value):
+    """Ranked table rows for the successful scenarios matching filter_value"""
+    import pandas as pd
+    
+    names, costs, fairness_vals, with_p2p, _ = scenario_arrays(data_source)
+    
+    # Apply filtering based on user selection (as row indices into the run's arrays)
+    if filter_value == "p2p_only":
+        selected = np.flatnonzero(with_p2p)
+    elif filter_value == "no_p2p":
+        selected = np.flatnonzero(~with_p2p)
+    elif filter_value == "comparison" and names.size:
+        # Group by base name and only show pairs where both P2P and non-P2P exist
+        base_names = np.char.replace(np.char.replace(names.astype(str), '_with_p2p', ''), '_without_p2p', '')
+        _, group, group_sizes = np.unique(base_names, return_inverse=True, return_counts=True)
+        selected = np.flatnonzero(group_sizes[group] == 2)
+    else:
+        # filter_value == "all" shows everything (no filtering)
+        selected = np.arange(names.size)
+    
+    if not selected.size:
+        return pd.DataFrame()
+    
+    # Columnar scoring: one array per metric instead of a dict per row
+    names = names[selected]
+    costs = costs[selected]
+    fairness_vals = fairness_vals[selected]
+    with_p2p = with_p2p[selected]
+    count = selected.size
+    
+    scores = _performance_scores(costs, fairness_vals)
+    
+    # Savings percentage against the highest cost as baseline
+    baseline_cost = costs.max()
+    if baseline_cost > 0:
+        savings = ((baseline_cost - costs) / baseline_cost) * 100
+    else:
+        savings = np.zeros(count)
+    
+    # Sort by score (best first) once, before any per-row column is built
+    order = np.argsort(-scores, kind='stable')
+    names, costs, fairness_vals = names[order], costs[order], fairness_vals[order]
+    with_p2p, savings, scores = with_p2p[order], savings[order], scores[order]
+    
+    # Performance stars based on score
+    star_counts = np.clip((scores * 5 + 0.5).astype(int), 1, 5)
+    
+    return pd.DataFrame({
+        'scenario': _truncate_names(names, 30),
+        'cost': costs,
+        'fairness': fairness_vals,
+        'p2p': np.where(with_p2p, '✅ Yes', '❌ No'),
+        'savings': savings,
+        'performance': np.char.add(_STAR_GLYPHS[star_counts], np.char.mod(' (%.2f)', scores)),
+        'score': scores,  # Keep score for sorting
+        'rank': np.arange(1, count + 1)
+    })
+
+
+app.clientside_callback(
+    ClientsideFunction(namespace="clientside", function_name="debounce_filter"),
+    Output("results-filter-debounced", "data"),
+    [Input("results-filter", "value")],
+    prevent_initial_call=True
+)
+
+
 @app.callback(
-    [Output("results-table", "data"),
-     Output("results-table-container", "children")],
+    Output("results-table-container", "children"),
     [Input("simulation-data", "data"),
-     Input("refresh-results-btn", "n_clicks"),
-     Input("results-filter", "value")]
+     Input("refresh-results-btn", "n_clicks")]
 )
-def update_results_table(simulation_data, n_clicks, filter_value):
-    # Create the default table component
-    default_table = dash_table.DataTable(
-        id="results-table",
-        columns=[
-            {"name": "🏆 Rank", "id": "rank", "type": "numeric"},
-            {"name": "📋 Scenario", "id": "scenario"},
-            {"name": "💰 Total Cost (€)", "id": "cost", "type": "numeric", "format": {"specifier": ".2f"}},
-            {"name": "⚖️ Fairness", "id": "fairness", "type": "numeric", "format": {"specifier": ".3f"}},
-            {"name": "🔄 P2P Trading", "id": "p2p"},
-            {"name": "📈 Savings (%)", "id": "savings", "type": "numeric", "format": {"specifier": ".1f"}},
-            {"name": "⭐ Performance", "id": "performance"}
-        ],
-        data=[],
-        sort_action="native",
-        filter_action="native",
-        style_cell={
-            'textAlign': 'left', 
-            'fontSize': '14px',
-            'padding': '12px',
-            'whiteSpace': 'normal',
-            'height': 'auto',
-            'fontFamily': 'system-ui, -apple-system, sans-serif'
-        },
-        style_header={
-            'backgroundColor': '#f8f9fa',
-            'fontWeight': 'bold',
-            'fontSize': '14px',
-            'color': '#495057',
-            'border': '1px solid #dee2e6',
-            'textAlign': 'center'
-        },
-        style_data={
-            'border': '1px solid #dee2e6',
-            'backgroundColor': '#ffffff'
-        },
-        style_data_conditional=[
-            {
-                'if': {'filter_query': '{p2p} = ✅ Yes'},
-                'backgroundColor': '#e8f5e8',
-                'border': '1px solid #28a745'
-            },
-            {
-                'if': {'column_id': 'rank', 'filter_query': '{rank} = 1'},
-                'backgroundColor': '#ffd700',
-                'fontWeight': 'bold',
-                'color': '#8B4513'
-            },
-            {
-                'if': {'column_id': 'rank', 'filter_query': '{rank} = 2'},
-                'backgroundColor': '#C0C0C0',
-                'fontWeight': 'bold',
-                'color': '#444444'
-            },
-            {
-                'if': {'column_id': 'rank', 'filter_query': '{rank} = 3'},
-                'backgroundColor': '#CD7F32',
-                'fontWeight': 'bold',
-                'color': '#ffffff'
-            }
-        ],
-        style_cell_conditional=[
-            {'if': {'column_id': 'rank'}, 'width': '80px', 'textAlign': 'center'},
-            {'if': {'column_id': 'scenario'}, 'width': '220px', 'textAlign': 'left'},
-            {'if': {'column_id': 'cost'}, 'width': '140px', 'textAlign': 'right'},
-            {'if': {'column_id': 'fairness'}, 'width': '120px', 'textAlign': 'right'},
-            {'if': {'column_id': 'p2p'}, 'width': '120px', 'textAlign': 'center'},
-            {'if': {'column_id': 'savings'}, 'width': '120px', 'textAlign': 'right'},
-            {'if': {'column_id': 'performance'}, 'width': '150px', 'textAlign': 'center'}
-        ],
-        page_size=15,
-        style_table={
-            'overflowX': 'auto',
-            'border': '1px solid #dee2e6',
-            'borderRadius': '0.375rem',
-            'boxShadow': '0 2px 4px rgba(0,0,0,0.1)'
-        }
-    )
-    
-    # Use either fresh simulation data or loaded results
-    global simulation_results
+def update_results_table(simulation_data, n_clicks):
+    global simulation_results, simulation_run_id
     
     # Reload existing results if refresh button was clicked
     if n_clicks:
         fresh_results = load_existing_results()
         if fresh_results:
             simulation_results.update(fresh_results)
+            simulation_run_id = SIM_CACHE.put(simulation_results)
     
-    # Determine which data source to use
-    data_source = None
-    if simulation_data and 'scenario_results' in simulation_data:
-        data_source = simulation_data  # Use fresh simulation data
-    elif simulation_results and 'scenario_results' in simulation_results:
-        data_source = simulation_results  # Use loaded results
+    # Use either fresh simulation data or loaded results
+    data_source = _results_table_source(simulation_data)
     
     if not data_source:
         empty_state = html.Div([
             dbc.Card([
                 dbc.CardBody([
                     html.Div([
-                        html.I(className="fas fa-table fa-3x text-muted mb-3"),
+                        fa_icon("table", "fa-3x text-muted mb-3"),
                         html.H5("No Results Available", className="text-muted mb-3"),
                         html.P("Run a simulation to see scenario results and rankings here.", className="text-muted mb-3"),
                         dbc.Row([
                             dbc.Col([
                                 dbc.Button([
-                                    html.I(className="fas fa-play me-2"),
+                                    fa_icon("play", "me-2"),
                                     "Start Simulation"
                                 ], color="primary", outline=True, href="#configuration")
                             ], width="auto"),
                             dbc.Col([
                                 dbc.Button([
-                                    html.I(className="fas fa-refresh me-2"),
+                                    fa_icon("refresh", "me-2"),
                                     "Load Existing Results"
                                 ], id="refresh-results-btn", color="info", outline=True)
                             ], width="auto")
@@ -2726,116 +3068,86 @@ def update_results_table(simulation_data, n_clicks, filter_value):
                 ])
             ], className="border-0 bg-light")
         ])
-        return [], empty_state
-    
-    scenario_results = data_source['scenario_results']
-    successful = {k: v for k, v in scenario_results.items() if v.get('status') == 'success'}
-    
-    # Apply filtering based on user selection
-    if filter_value == "p2p_only":
-        successful = {k: v for k, v in successful.items() if v.get('with_p2p', False)}
-    elif filter_value == "no_p2p":
-        successful = {k: v for k, v in successful.items() if not v.get('with_p2p', False)}
-    elif filter_value == "comparison":
-        # Group by base name and only show pairs where both P2P and non-P2P exist
-        from collections import defaultdict
-        base_groups = defaultdict(list)
-        for name, result in successful.items():
-            base_name = name.replace('_with_p2p', '').replace('_without_p2p', '')
-            base_groups[base_name].append((name, result))
-        
-        # Only keep complete pairs (both P2P and non-P2P)
-        filtered_successful = {}
-        for base_name, scenarios in base_groups.items():
-            if len(scenarios) == 2:  # Both P2P and non-P2P exist
-                for name, result in scenarios:
-                    filtered_successful[name] = result
-        successful = filtered_successful
-    # filter_value == "all" shows everything (no filtering)
+        return empty_state
     
-    if not successful:
+    if not successful_scenarios(data_source):
         no_data_state = html.Div([
             dbc.Card([
                 dbc.CardBody([
                     html.Div([
-                        html.I(className="fas fa-exclamation-triangle fa-3x text-warning mb-3"),
+                        fa_icon("exclamation-triangle", "fa-3x text-warning mb-3"),
                         html.H5("No Successful Scenarios", className="text-warning mb-3"),
                         html.P("The simulation completed but no scenarios were successful. Please check your configuration and try again.", className="text-muted mb-3"),
                         dbc.Button([
-                            html.I(className="fas fa-cog me-2"),
+                            fa_icon("cog", "me-2"),
                             "Adjust Settings"
                         ], color="warning", outline=True)
                     ], className="text-center py-4")
                 ])
             ], className="border-warning")
         ])
-        return [], no_data_state
-    
-    # Calculate scores and baseline for savings
-    costs = [v['total_cost'] for v in successful.values()]
-    fairness_vals = [v['fairness'] for v in successful.values()]
-    
-    min_cost, max_cost = min(costs), max(costs)
-    min_fair, max_fair = min(fairness_vals), max(fairness_vals)
-    
-    # Use highest cost as baseline for savings calculation
-    baseline_cost = max_cost
-    
-    table_data = []
-    for name, result in successful.items():
-        # Normalize and combine metrics (0-1 scale, lower is better)
-        norm_cost = (result['total_cost'] - min_cost) / (max_cost - min_cost + 1e-6)
-        norm_fair = (result['fairness'] - min_fair) / (max_fair - min_fair + 1e-6)
-        score = 1 - (0.7 * norm_cost + 0.3 * norm_fair)  # Higher score is better
-        
-        # Calculate savings percentage compared to baseline
-        savings = ((baseline_cost - result['total_cost']) / baseline_cost) * 100 if baseline_cost > 0 else 0
-        
-        # Create performance stars based on score
-        stars = "★" * min(5, max(1, int(score * 5 + 0.5)))
-        performance = f"{stars} ({score:.2f})"
-        
-        table_data.append({
-            'scenario': name[:30] + "..." if len(name) > 30 else name,
-            'cost': result['total_cost'],
-            'fairness': result['fairness'],
-            'p2p': '✅ Yes' if result.get('with_p2p', False) else '❌ No',
-            'savings': savings,
-            'performance': performance,
-            'score': score  # Keep score for sorting
-        })
-    
-    # Sort by score (best first)
-    table_data.sort(key=lambda x: x['score'], reverse=True)
+        return no_data_state
     
-    # Add rank column
-    for i, row in enumerate(table_data):
-        row['rank'] = i + 1
-    
-    # Update the table data and return the populated table
-    default_table.data = table_data
-    
-    return table_data, default_table
+    # Rows are filled in page by page by page_results_table, which also applies the filter
+    return _RESULTS_VIEW
 
 
 @app.callback(
-    Output("download-btn", "href"),
-    [Input("simulation-data", "data")]
+    [Output("results-table", "data"),
+     Output("results-table", "page_count"),
+     Output("results-table", "page_current"),
+     Output("results-table-empty", "children")],
+    [Input("results-table", "page_current"),
+     Input("results-table", "page_size"),
+     Input("results-table", "sort_by"),
+     Input("results-table", "filter_query"),
+     Input("results-filter-debounced", "data")],
+    [State("simulation-data", "data")]
 )
-def update_download_link(simulation_data):
-    if not simulation_data:
-        return ""
+def page_results_table(page_current, page_size, sort_by, filter_query, filter_value, simulation_data):
+    """Serve only the visible page of the (filtered, sorted) results table"""
+    # A new scenario filter only swaps the rows, starting again from the first page
+    if callback_context.triggered_id == "results-filter-debounced":
+        page_current = 0
     
-    # Create download data
-    import json
-    from urllib.parse import quote
-    
-    # Convert to JSON string and create data URL
-    json_str = json.dumps(simulation_data, indent=2, default=str)
-    data_url = f"data:application/json;charset=utf-8,{quote(json_str)}"
+    data_source = _results_table_source(simulation_data)
+    if not data_source:
+        return [], 1, 0, None
+    
+    df = build_results_frame(data_source, filter_value or "all")
+    if filter_query:
+        df = _filter_results_frame(df, filter_query)
+    sort_by = [col for col in (sort_by or []) if col['column_id'] in df.columns]
+    if sort_by:
+        df = df.sort_values(
+            [_RESULTS_SORT_COLUMNS.get(col['column_id'], col['column_id']) for col in sort_by],
+            ascending=[col['direction'] == 'asc' for col in sort_by]
+        )
     
-    return data_url
+    page_size = page_size or RESULTS_PAGE_SIZE
+    page_current = page_current or 0
+    page_count = max(1, -(-len(df) // page_size))
+    start = page_current * page_size
+    empty_state = _RESULTS_NO_MATCH if df.empty else None
+    return df.iloc[start:start + page_size].to_dict('records'), page_count, page_current, empty_state
+
+
+@app.callback(
+    Output("results-download", "data"),
+    [Input("download-btn", "n_clicks")],
+    [State("simulation-data", "data")],
+    prevent_initial_call=True
+)
+def download_results(n_clicks, simulation_data):
+    simulation_data = resolve_results(simulation_data)
+    if not n_clicks or not simulation_data:
+        return dash.no_update
+    
+    # Serialized only when asked for, as compact JSON sent through the download component
+    payload = orjson.dumps(simulation_data, default=str,
+                           option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return dcc.send_bytes(payload, "benchmark_results.json")
 
 
 if __name__ == '__main__':
-    app.run_server(debug=True, host='0.0.0.0', port=8050)
\ No newline at end of file
+    app.run_server(debug=True, host='0.0.0.0', port=8050)